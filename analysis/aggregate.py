@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import math
+import statistics
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from ingest import Table
+
+try:
+    import numpy as np
+except ImportError:  # optional: the pure-Python kernel gives bit-identical results
+    np = None
+
+
+REDUCTIONS = ("count", "sum", "mean", "weighted_mean", "share")
+
+# A group key is a column name, or (column name, label function) for string
+# columns whose values should be collapsed first (e.g. ``("pos", primary_position)``).
+KeySpec = Union[str, Tuple[str, Callable[[str], str]]]
+
+
+class Agg:
+    """One output column: ``how`` applied to ``column`` within each group.
+
+    ``weighted_mean`` takes a ``weight`` column (``fga_per_game``, ``mp``...);
+    ``share`` is the group's sum over the sum of its parent group (the same
+    keys minus the last one, or every row when grouping by a single key).
+    Blank values are skipped; a group with nothing to reduce gets None.
+    """
+
+    def __init__(self, column: str, how: str = "mean", weight: Optional[str] = None) -> None:
+        if how not in REDUCTIONS:
+            raise ValueError(f"unknown reduction {how!r}; expected one of {', '.join(REDUCTIONS)}")
+        if (how == "weighted_mean") != (weight is not None):
+            raise ValueError("a weight column goes with (and only with) weighted_mean")
+        self.column = column
+        self.how = how
+        self.weight = weight
+
+    def __repr__(self) -> str:
+        weight = f", weight={self.weight!r}" if self.weight else ""
+        return f"Agg({self.column!r}, {self.how!r}{weight})"
+
+
+class Grouped:
+    """Result of ``group_by``: sorted group keys plus one value list per aggregate."""
+
+    def __init__(self, keys: Sequence[str], groups: List[tuple], columns: Dict[str, List[Optional[float]]]) -> None:
+        self.keys = list(keys)
+        self.groups = groups
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def __getitem__(self, name: str) -> List[Optional[float]]:
+        return self.columns[name]
+
+    def records(self, dropna: bool = True) -> List[dict]:
+        """One dict per group; with ``dropna`` groups whose aggregates are all None are left out."""
+        names = list(self.columns)
+        records = []
+        for index, group in enumerate(self.groups):
+            values = [self.columns[name][index] for name in names]
+            if dropna and all(value is None for value in values):
+                continue
+            records.append({**dict(zip(self.keys, group)), **dict(zip(names, values))})
+        return records
+
+
+def _key_column(
+    table: Table, spec: KeySpec
+) -> Tuple[str, Sequence[int], Optional[List[int]], Optional[List[str]]]:
+    """Integer codes per row for one key, plus (for a string column) the remap and labels.
+
+    String columns keep their dictionary codes per row; ``remap`` takes a
+    dictionary code to its label's rank, so integer order is label order.
+    Both kernels apply it to distinct codes only, and a label function is
+    applied once per dictionary entry, never once per row.
+    """
+    name, label = (spec, None) if isinstance(spec, str) else spec
+    column = table[name]
+    if column.kind == "int":
+        if label is not None:
+            raise ValueError(f"key {name!r} is numeric; label functions apply to string columns")
+        return name, column.values, None, None
+    if column.kind != "str":
+        raise ValueError(f"cannot group by float column {name!r}")
+    labels = [label(value) if label else value for value in column.dictionary]
+    ordered = sorted(set(labels))
+    rank = {value: code for code, value in enumerate(ordered)}
+    remap = [rank[value] for value in labels]
+    return name, column.codes, remap, ordered
+
+
+def _group_ids(
+    keys: List[Sequence[int]], remaps: List[Optional[List[int]]], rows: Sequence[int]
+) -> Tuple[List[int], List[tuple]]:
+    """Group number per selected row and the sorted key-code tuples, in pure Python.
+
+    Rows are grouped on their raw codes first; only the distinct code tuples
+    go through ``remaps``, which may merge several of them into one group.
+    """
+    first_seen: Dict[tuple, int] = {}
+    if len(keys) == 1:
+        codes = keys[0]
+        ids = [first_seen.setdefault(codes[row], len(first_seen)) for row in rows]
+        first_seen = {(code,): gid for code, gid in first_seen.items()}
+    else:
+        ids = [first_seen.setdefault(tuple(key[row] for key in keys), len(first_seen)) for row in rows]
+    mapped = {
+        raw: tuple(code if remap is None else remap[code] for code, remap in zip(raw, remaps)) for raw in first_seen
+    }
+    ordered = sorted(set(mapped.values()))
+    position = {group: index for index, group in enumerate(ordered)}
+    renumber = [0] * len(first_seen)
+    for raw, gid in first_seen.items():
+        renumber[gid] = position[mapped[raw]]
+    return [renumber[gid] for gid in ids], ordered
+
+
+def _factorize(codes: "np.ndarray", remap: Optional[List[int]]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Sorted distinct (remapped) codes and each row's index into them."""
+    values, inverse = np.unique(codes, return_inverse=True)
+    if remap is None:
+        return values, inverse.reshape(-1)
+    values, merged = np.unique(np.asarray(remap, dtype=np.int64)[values], return_inverse=True)
+    return values, merged.reshape(-1)[inverse.reshape(-1)]
+
+
+def _group_ids_numpy(
+    keys: List["np.ndarray"], remaps: List[Optional[List[int]]]
+) -> Tuple["np.ndarray", List[tuple]]:
+    """``_group_ids`` vectorized: each key is factorized with a 1-D ``np.unique``
+    and several keys are combined into one integer with ``ravel_multi_index``,
+    whose order is the tuples' sort order."""
+    factors = [_factorize(codes, remap) for codes, remap in zip(keys, remaps)]
+    if len(factors) == 1:
+        values, ids = factors[0]
+        return ids, [(value,) for value in values.tolist()]
+    dims = tuple(len(values) for values, _ in factors)
+    combined = np.ravel_multi_index(tuple(inverse for _, inverse in factors), dims)
+    present, ids = np.unique(combined, return_inverse=True)
+    positions = np.unravel_index(present, dims)
+    columns = [values[position].tolist() for (values, _), position in zip(factors, positions)]
+    return ids.reshape(-1), list(zip(*columns))
+
+
+def _parents(groups: List[tuple]) -> Tuple[List[int], int]:
+    """Parent group number for every group (its keys minus the last)."""
+    numbers: Dict[tuple, int] = {}
+    parents = [numbers.setdefault(group[:-1], len(numbers)) for group in groups]
+    return parents, len(numbers)
+
+
+def _reduce_python(
+    agg: Agg, table: Table, rows: Sequence[int], ids: List[int], size: int, parents: List[int], parent_count: int
+) -> List[Optional[float]]:
+    column = table[agg.column]
+    values = [column.values[row] for row in rows]
+    weights = [table[agg.weight].values[row] for row in rows] if agg.weight else None
+    if agg.how == "mean":
+        members: List[List[float]] = [[] for _ in range(size)]
+        for value, gid in zip(values, ids):
+            if not math.isnan(value):
+                members[gid].append(value)
+        return [statistics.mean(group) if group else None for group in members]
+
+    counts = [0] * size
+    # Integer columns have no blanks and sum exactly as ints.
+    sums = [0 if column.kind == "int" and weights is None else 0.0] * size
+    totals = [0.0] * size
+    # Plain += in row order, which is exactly what np.bincount does.
+    for index, (value, gid) in enumerate(zip(values, ids)):
+        if math.isnan(value):
+            continue
+        if weights is not None:
+            weight = weights[index]
+            if math.isnan(weight):
+                continue
+            sums[gid] += value * weight
+            totals[gid] += weight
+        else:
+            sums[gid] += value
+        counts[gid] += 1
+
+    if agg.how == "count":
+        return counts
+    if agg.how == "sum":
+        return [total if count else None for total, count in zip(sums, counts)]
+    if agg.how == "weighted_mean":
+        return [total / weight if weight else None for total, weight in zip(sums, totals)]
+    parent_sums = [0 if column.kind == "int" else 0.0] * parent_count
+    for value, gid in zip(values, ids):
+        if not math.isnan(value):
+            parent_sums[parents[gid]] += value
+    return [
+        total / parent_sums[parent] if count and parent_sums[parent] else None
+        for total, count, parent in zip(sums, counts, parents)
+    ]
+
+
+def _int_bincount(ids: "np.ndarray", values: "np.ndarray", size: int) -> "np.ndarray":
+    """``np.bincount`` with integer weights summed in int64 rather than float64."""
+    sums = np.zeros(size, dtype=np.int64)
+    np.add.at(sums, ids, values)
+    return sums
+
+
+def _reduce_numpy(
+    agg: Agg, table: Table, rows, ids, size: int, parents, parent_count: int
+) -> List[Optional[float]]:
+    column = table[agg.column]
+    values = np.asarray(column.values)[rows]
+    valid = ~np.isnan(values)
+    if agg.how == "mean":
+        # The same exactly rounded statistics.mean as the pure-Python kernel, so
+        # artifacts do not depend on NumPy: one stable argsort groups the rows
+        # and each group is reduced from its slice.
+        group_ids = ids[valid]
+        ordered = values[valid][np.argsort(group_ids, kind="stable")].tolist()
+        ends = np.cumsum(np.bincount(group_ids, minlength=size)).tolist()
+        return [statistics.mean(ordered[start:end]) if end > start else None for start, end in zip([0] + ends[:-1], ends)]
+
+    if agg.weight:
+        weights = np.asarray(table[agg.weight].values)[rows]
+        valid &= ~np.isnan(weights)
+        totals = np.bincount(ids[valid], weights=weights[valid], minlength=size)
+        sums = np.bincount(ids[valid], weights=values[valid] * weights[valid], minlength=size)
+    elif column.kind == "int":
+        sums = _int_bincount(ids, values, size)
+    else:
+        sums = np.bincount(ids[valid], weights=values[valid], minlength=size)
+    counts = np.bincount(ids[valid], minlength=size)
+
+    if agg.how == "count":
+        return counts.tolist()
+    if agg.how == "sum":
+        return [total if count else None for total, count in zip(sums.tolist(), counts.tolist())]
+    if agg.how == "weighted_mean":
+        return [total / weight if weight else None for total, weight in zip(sums.tolist(), totals.tolist())]
+    if column.kind == "int":
+        parent_sums = _int_bincount(parents[ids], values, parent_count).tolist()
+    else:
+        parent_sums = np.bincount(parents[ids[valid]], weights=values[valid], minlength=parent_count).tolist()
+    return [
+        total / parent_sums[parent] if count and parent_sums[parent] else None
+        for total, count, parent in zip(sums.tolist(), counts.tolist(), parents.tolist())
+    ]
+
+
+def group_by(
+    table: Table,
+    keys: Union[KeySpec, Sequence[KeySpec]],
+    aggs: Dict[str, Agg],
+    rows: Optional[Sequence[int]] = None,
+) -> Grouped:
+    """Group ``rows`` (default: all) of ``table`` by ``keys`` and reduce each of ``aggs``.
+
+    Groups come out sorted by key (labels for string keys). Keys are integer
+    codes throughout. With NumPy the grouping and every sum is one vectorized
+    pass; without it the same reductions run as plain loops. Sums accumulate
+    in row order (as ints for integer columns) and means are exactly rounded (``statistics.mean``) either
+    way, so both kernels return the same floats (``bench.py`` checks this).
+    """
+    if isinstance(keys, str) or (
+        isinstance(keys, tuple) and len(keys) == 2 and isinstance(keys[0], str) and callable(keys[1])
+    ):
+        keys = [keys]
+    resolved = [_key_column(table, spec) for spec in keys]
+    names = [name for name, _, _, _ in resolved]
+    remaps = [remap for _, _, remap, _ in resolved]
+    for agg in aggs.values():
+        for column in filter(None, (agg.column, agg.weight)):
+            if table[column].kind == "str":
+                raise ValueError(f"cannot aggregate string column {column!r}")
+    if rows is None:
+        rows = range(len(table))
+    if not len(rows):
+        return Grouped(names, [], {name: [] for name in aggs})
+
+    if np is not None:
+        selected = np.asarray(rows, dtype=np.int64)
+        keys = [np.asarray(codes, dtype=np.int64)[selected] for _, codes, _, _ in resolved]
+        ids, groups = _group_ids_numpy(keys, remaps)
+        parents, parent_count = _parents(groups)
+        parents = np.asarray(parents, dtype=np.int64)
+        columns = {
+            name: _reduce_numpy(agg, table, selected, ids, len(groups), parents, parent_count)
+            for name, agg in aggs.items()
+        }
+    else:
+        ids, groups = _group_ids([codes for _, codes, _, _ in resolved], remaps, rows)
+        parents, parent_count = _parents(groups)
+        columns = {
+            name: _reduce_python(agg, table, rows, ids, len(groups), parents, parent_count)
+            for name, agg in aggs.items()
+        }
+
+    decoded = [
+        tuple(code if labels is None else labels[code] for code, (_, _, _, labels) in zip(group, resolved))
+        for group in groups
+    ]
+    return Grouped(names, decoded, columns)
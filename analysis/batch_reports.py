@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from build_pdf import PDFPage, PDFStreamWriter
+from categories import TeamDirectory
+from ingest import Table, is_missing, load_table
+from pipeline import preferred_rows
+from text_layout import layout_paragraph, string_width
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+REPORT_DIR = BASE_DIR / "reports"
+
+Job = Tuple[str, str]  # (kind, key) where kind is "player" or "team"
+Line = Tuple[str, List[Optional[float]], Tuple[float, float, float]]
+
+
+def group_rows(table: Table, key: str, rows: Iterable[int]) -> Dict[str, List[int]]:
+    """Row indexes per key value, ordered by season."""
+    groups: Dict[str, List[int]] = defaultdict(list)
+    column = table[key]
+    for index in rows:
+        groups[column[index]].append(index)
+    seasons = table["season"]
+    for indexes in groups.values():
+        indexes.sort(key=lambda i: seasons[i])
+    return groups
+
+
+class ReportData:
+    """Tables and per-player/per-team row indexes, loaded once per worker."""
+
+    def __init__(self) -> None:
+        self.career = load_table("Player Career Info.csv")
+        self.per100 = load_table("Per 100 Poss.csv")
+        self.shooting = load_table("Player Shooting.csv")
+        self.teams = load_table("Team Summaries.csv")
+        self.directory = TeamDirectory(load_table("Team Abbrev.csv"))
+        self.career_rows = {player_id: i for i, player_id in enumerate(self.career["player_id"])}
+        self.per100_rows = group_rows(self.per100, "player_id", preferred_rows(self.per100))
+        self.shooting_rows = group_rows(self.shooting, "player_id", preferred_rows(self.shooting))
+        self.team_rows = franchise_rows(self.teams, self.directory)
+
+
+def franchise_rows(table: Table, directory: TeamDirectory) -> Dict[str, List[int]]:
+    """Row indexes per franchise (keyed by its current abbreviation), ordered by season.
+
+    Relocated and renamed teams (Seattle SuperSonics, Vancouver Grizzlies...)
+    join their franchise; rows that are not a team (League Average) are dropped.
+    """
+    groups: Dict[str, List[int]] = defaultdict(list)
+    for index, (season, team) in enumerate(zip(table["season"], table["team"])):
+        franchise = directory.franchise(season, team)
+        if franchise:
+            groups[franchise].append(index)
+    seasons = table["season"]
+    for indexes in groups.values():
+        indexes.sort(key=lambda i: seasons[i])
+    return groups
+
+
+def values(table: Table, field: str, rows: Sequence[int], scale: float = 1.0) -> List[Optional[float]]:
+    column = table[field]
+    return [None if is_missing(column[i]) else column[i] * scale for i in rows]
+
+
+def draw_season_chart(
+    page: PDFPage,
+    left: float,
+    bottom: float,
+    width: float,
+    height: float,
+    title: str,
+    seasons: List[int],
+    lines: List[Line],
+    value_format: str = "{:.0f}",
+) -> None:
+    """Line chart over seasons; ``None`` values break the line."""
+    page.set_stroke_rgb(0, 0, 0)
+    page.draw_text(left, bottom + height + 14, title, size=12)
+    present = [value for _, series, _ in lines for value in series if value is not None]
+    if not seasons or not present:
+        page.draw_rect(left, bottom, width, height, width=1.0)
+        page.draw_text(left + 10, bottom + height / 2, "No data recorded for this view.", size=10)
+        return
+
+    low = min(0.0, min(present))
+    high = max(present) * 1.1 if max(present) > 0 else 1.0
+    first, last = seasons[0], seasons[-1]
+    span = max(1, last - first)
+
+    def scale_x(season: int) -> float:
+        return left + (season - first) / span * width
+
+    def scale_y(value: float) -> float:
+        return bottom + (value - low) / (high - low) * height
+
+    page.set_stroke_rgb(0.6, 0.6, 0.6)
+    page.draw_rect(left, bottom, width, height, width=1.0)
+    for i in range(6):
+        value = low + (high - low) * i / 5
+        y = scale_y(value)
+        if 0 < i < 5:
+            page.draw_line(left, y, left + width, y, width=0.5)
+        page.draw_text(left - 34, y - 4, value_format.format(value), size=9)
+
+    step = max(1, len(seasons) // 8)
+    for idx, season in enumerate(seasons):
+        if idx % step != 0 and season != last:
+            continue
+        x = scale_x(season)
+        page.draw_line(x, bottom, x, bottom - 5, width=1.0)
+        page.draw_text(x - 12, bottom - 18, str(season), size=9)
+
+    legend_x = left
+    for label, series, color in lines:
+        page.set_stroke_rgb(*color)
+        page.set_fill_rgb(*color)
+        run: List[Tuple[float, float]] = []
+        for season, value in zip(seasons, series + [None]):
+            if value is not None:
+                run.append((scale_x(season), scale_y(value)))
+            elif len(run) == 1:
+                page.draw_point(*run[0], size=4.0)  # an isolated season has no segment to stroke
+                run = []
+            elif run:
+                page.draw_polyline(run, width=2.0)
+                run = []
+        page.draw_line(legend_x, bottom - 34, legend_x + 18, bottom - 34, width=2.5)
+        page.set_stroke_rgb(0, 0, 0)
+        page.set_fill_rgb(0, 0, 0)
+        page.draw_text(legend_x + 24, bottom - 38, label, size=9)
+        legend_x += 24 + string_width(label, 9) + 12
+
+
+def player_page(data: ReportData, player_id: str) -> PDFPage:
+    career = data.career
+    row = data.career_rows[player_id]
+    page = PDFPage()
+    page.draw_text(72, 720, career["player"][row], size=22)
+    colleges = career["colleges"][row]
+    summary = f"Position: {career['pos'][row]}   Seasons: {career['from'][row]}-{career['to'][row]}"
+    if colleges not in ("", "NA"):
+        summary += f"   College: {colleges}"
+    if career["hof"][row] == "TRUE":
+        summary += "   Hall of Fame"
+    page.draw_text(72, 698, summary, size=11)
+
+    rows = data.per100_rows.get(player_id, [])
+    seasons = [data.per100["season"][i] for i in rows]
+    draw_season_chart(
+        page,
+        110,
+        420,
+        430,
+        220,
+        "Three-point volume and accuracy",
+        seasons,
+        [
+            ("3PA per 100 poss.", values(data.per100, "x3pa_per_100_poss", rows), (0.12, 0.47, 0.71)),
+            ("3P% x 10", values(data.per100, "x3p_percent", rows, scale=10.0), (0.84, 0.15, 0.16)),
+        ],
+        value_format="{:.1f}",
+    )
+
+    rows = data.shooting_rows.get(player_id, [])
+    seasons = [data.shooting["season"][i] for i in rows]
+    draw_season_chart(
+        page,
+        110,
+        110,
+        430,
+        220,
+        "Shot profile (share of FGA, %)",
+        seasons,
+        [
+            ("From three", values(data.shooting, "percent_fga_from_x3p_range", rows, 100.0), (0.12, 0.47, 0.71)),
+            ("Long midrange", values(data.shooting, "percent_fga_from_x16_3p_range", rows, 100.0), (0.58, 0.40, 0.74)),
+            ("At the rim (0-3 ft)", values(data.shooting, "percent_fga_from_x0_3_range", rows, 100.0), (0.20, 0.63, 0.17)),
+        ],
+    )
+    return page
+
+
+def team_page(data: ReportData, franchise: str) -> PDFPage:
+    rows = data.team_rows[franchise]
+    teams = data.teams
+    seasons = [teams["season"][i] for i in rows]
+    name = data.directory.franchise_name(franchise)
+    page = PDFPage()
+    page.draw_text(72, 720, name, size=22)
+    page.draw_text(72, 698, f"Seasons: {seasons[0]}-{seasons[-1]}   League: {teams['lg'][rows[-1]]}", size=11)
+    former = [team for team in dict.fromkeys(teams["team"][i] for i in reversed(rows)) if team != name]
+    if former:
+        for offset, line in enumerate(layout_paragraph("Formerly: " + ", ".join(former), 470, size=10)):
+            page.draw_text(72, 684 - 12 * offset, line, size=10)
+    draw_season_chart(
+        page,
+        110,
+        420,
+        430,
+        220,
+        "Three-point attempt rate (% of FGA)",
+        seasons,
+        [("3PA rate", values(teams, "x3p_ar", rows, 100.0), (0.12, 0.47, 0.71))],
+    )
+    draw_season_chart(
+        page,
+        110,
+        110,
+        430,
+        220,
+        "Net rating and wins",
+        seasons,
+        [
+            ("Net rating", values(teams, "n_rtg", rows), (0.20, 0.63, 0.17)),
+            ("Wins", values(teams, "w", rows), (1.0, 0.49, 0.0)),
+        ],
+    )
+    return page
+
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+_DATA: Optional[ReportData] = None
+
+
+def init_worker() -> None:
+    global _DATA
+    _DATA = ReportData()
+
+
+def report_path(job: Job, output_dir: Path, directory: TeamDirectory) -> Path:
+    """Output file for a job: players by player_id, franchises by abbreviation plus name
+    (``DEN`` and ``DNN`` were both the Denver Nuggets)."""
+    kind, key = job
+    if kind == "player":
+        return output_dir / "players" / f"{key}.pdf"
+    return output_dir / "teams" / f"{key.lower()}-{slugify(directory.franchise_name(key))}.pdf"
+
+
+def check_unique_paths(jobs: List[Job], output_dir: Path, directory: TeamDirectory) -> None:
+    """Raise if two jobs would write the same file, which would silently drop a report."""
+    owners: Dict[Path, List[str]] = defaultdict(list)
+    for job in jobs:
+        owners[report_path(job, output_dir, directory)].append(job[1])
+    clashes = {path: keys for path, keys in owners.items() if len(keys) > 1}
+    if clashes:
+        detail = "; ".join(f"{path.name}: {', '.join(keys)}" for path, keys in sorted(clashes.items()))
+        raise ValueError(f"reports would overwrite each other: {detail}")
+
+
+def render_report(job: Job, output_dir: Path, compress: bool = False) -> int:
+    """Render one report PDF with the worker's shared data; returns pages written."""
+    kind, key = job
+    path = report_path(job, output_dir, _DATA.directory)
+    page = player_page(_DATA, key) if kind == "player" else team_page(_DATA, key)
+    with PDFStreamWriter(path, compress=compress) as writer:
+        writer.add_page(page)
+    return writer.page_count
+
+
+def list_jobs(kind: str) -> List[Job]:
+    jobs: List[Job] = []
+    if kind in ("players", "all"):
+        jobs += [("player", player_id) for player_id in dict.fromkeys(load_table("Player Career Info.csv")["player_id"])]
+    if kind in ("teams", "all"):
+        franchises = franchise_rows(load_table("Team Summaries.csv"), TeamDirectory(load_table("Team Abbrev.csv")))
+        jobs += [("team", franchise) for franchise in franchises]
+    return jobs
+
+
+def run_batch(
+    jobs: List[Job], output_dir: Path, workers: int = 1, compress: bool = False
+) -> Tuple[int, float]:
+    """Render every job, across a process pool when workers > 1. Returns (pages, seconds)."""
+    check_unique_paths(jobs, output_dir, TeamDirectory(load_table("Team Abbrev.csv")))
+    for sub in ("players", "teams"):
+        (output_dir / sub).mkdir(parents=True, exist_ok=True)
+    render = partial(render_report, output_dir=output_dir, compress=compress)
+    start = time.perf_counter()
+    if workers <= 1:
+        init_worker()
+        pages = sum(map(render, jobs))
+    else:
+        chunksize = max(1, len(jobs) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            pages = sum(pool.map(render, jobs, chunksize=chunksize))
+    return pages, time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Render a chart report for every player and franchise.")
+    parser.add_argument("--kind", choices=["players", "teams", "all"], default="all")
+    parser.add_argument("--jobs", "-j", type=int, default=0, help="worker processes (0 = one per CPU)")
+    parser.add_argument("--limit", type=int, default=None, help="only render the first N reports")
+    parser.add_argument("--output", type=Path, default=REPORT_DIR, help="output directory")
+    parser.add_argument("--compress", action="store_true", help="write compressed PDF 1.5 files")
+    args = parser.parse_args(argv)
+
+    jobs = list_jobs(args.kind)[: args.limit]
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    pages, elapsed = run_batch(jobs, args.output, workers=workers, compress=args.compress)
+    rate = pages / elapsed if elapsed else float("inf")
+    print(f"Wrote {len(jobs)} reports ({pages} pages) to {args.output} in {elapsed:.2f}s")
+    print(f"Throughput: {rate:.1f} pages/sec with {workers} worker(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+ANALYSIS_DIR = BASE_DIR / "analysis"
+
+IMPORT_BUDGET_MS = 100.0
+
+SCALES = (1, 10, 100)
+BASELINE_PATH = ANALYSIS_DIR / "bench_baseline.json"
+RESULTS_PATH = ANALYSIS_DIR / ".cache" / "bench_results.json"
+REGRESSION_THRESHOLD = 0.5
+# Stages this close to their baseline never fail, whatever the ratio; timer
+# noise on sub-millisecond stages would otherwise dominate.
+REGRESSION_SLACK_MS = 5.0
+
+CSV_INPUT = "Team Stats Per Game.csv"
+SEASON_SERIES_INPUTS = (
+    "league_3pa_trend.json",
+    "position_3pa_shares.json",
+    "shot_profile_trends.json",
+    "team_adoption_threshold.json",
+)
+
+_IMPORT_PROBE = """
+import json, sys, time
+sys.path.insert(0, {path!r})
+start = time.perf_counter()
+import build_pdf
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "json_loaded": build_pdf.load_json.cache_info().currsize}}))
+"""
+
+
+def measure_import(repeat: int = 5) -> dict:
+    """Import build_pdf in fresh interpreters; report the best wall time and any eager JSON loads."""
+    results = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE.format(path=str(ANALYSIS_DIR))],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results.append(json.loads(out.stdout))
+    return {
+        "ms": min(result["ms"] for result in results),
+        "json_loaded": max(result["json_loaded"] for result in results),
+    }
+
+
+def check_import_budget(budget_ms: float = IMPORT_BUDGET_MS) -> List[str]:
+    """Return failure messages if importing build_pdf is slow or touches the data files."""
+    result = measure_import()
+    print(f"import build_pdf: {result['ms']:.1f} ms (budget {budget_ms:.0f} ms)")
+    failures = []
+    if result["json_loaded"]:
+        failures.append(f"import build_pdf parsed {result['json_loaded']} JSON file(s)")
+    if result["ms"] > budget_ms:
+        failures.append(f"import build_pdf took {result['ms']:.1f} ms > {budget_ms:.0f} ms")
+    return failures
+
+
+def check_kernels() -> List[str]:
+    """Return failure messages where the NumPy and pure-Python group-by kernels disagree.
+
+    Every pipeline target whose inputs are present (``season_means`` and the
+    other group-by summaries) is built with each kernel and the serialized
+    records are compared byte for byte. Skipped when NumPy is not installed.
+    """
+    import aggregate
+    from ingest import load_table
+    from pipeline import TARGETS, resolve_source
+
+    if aggregate.np is None:
+        print("group-by kernels: NumPy not installed, skipped")
+        return []
+    numpy_module = aggregate.np
+    failures = []
+    checked = 0
+    for name, spec in TARGETS.items():
+        if not all(resolve_source(src).exists() for src in spec.inputs):
+            continue
+        tables = {src: load_table(src) for src in spec.inputs}
+        outputs = []
+        for backend in (numpy_module, None):
+            aggregate.np = backend
+            try:
+                outputs.append(json.dumps(spec.builder(tables), sort_keys=True))
+            finally:
+                aggregate.np = numpy_module
+        checked += 1
+        if outputs[0] != outputs[1]:
+            failures.append(f"{name}: NumPy and pure-Python group-by kernels give different output")
+    print(f"group-by kernels: {checked} target(s) compared")
+    return failures
+
+
+def _legacy_points(n: int) -> int:
+    """Reference: the original per-call f-string + join + encode content path."""
+    commands: List[str] = []
+    for i in range(n):
+        x, y = float(i % 500), float(i % 700)
+        commands.append(f"{x - 2.0:.2f} {y - 2.0:.2f} {4.0:.2f} {4.0:.2f} re f")
+    return len("\n".join(commands).encode("utf-8"))
+
+
+def bench_content_stream(n: int = 1_000_000) -> Dict[str, float]:
+    """Primitives per second for the PDF content-stream builders."""
+    from build_pdf import PDFPage
+
+    xs = [float(i % 500) for i in range(n)]
+    ys = [float(i % 700) for i in range(n)]
+    points = list(zip(xs, ys))
+
+    def per_call_points() -> int:
+        page = PDFPage()
+        for x, y in points:
+            page.draw_point(x, y)
+        return len(page.content())
+
+    def batched_points() -> int:
+        page = PDFPage()
+        page.draw_points(xs, ys)
+        return len(page.content())
+
+    def per_call_lines() -> int:
+        page = PDFPage()
+        for (x1, y1), (x2, y2) in zip(points, points[1:]):
+            page.draw_line(x1, y1, x2, y2, width=2.0)
+        return len(page.content())
+
+    def batched_polyline() -> int:
+        page = PDFPage()
+        page.draw_polyline(points, width=2.0)
+        return len(page.content())
+
+    cases = {
+        "legacy f-string points": lambda: _legacy_points(n),
+        "draw_point per call": per_call_points,
+        "draw_points batched": batched_points,
+        "draw_line per call": per_call_lines,
+        "draw_polyline batched": batched_polyline,
+    }
+    rates = {}
+    for name, case in cases.items():
+        start = time.perf_counter()
+        size = case()
+        elapsed = time.perf_counter() - start
+        rates[name] = n / elapsed
+        print(f"{name:<24} {rates[name]:>12,.0f} ops/sec  ({size / 1e6:.1f} MB stream)")
+    return rates
+
+
+def extend_seasons(records: List[dict], factor: int) -> List[dict]:
+    """Append ``factor - 1`` copies of a season series, each shifted past the previous one."""
+    if factor <= 1 or not records:
+        return list(records)
+    seasons = [rec["season"] for rec in records]
+    span = max(seasons) - min(seasons) + 1
+    return [{**rec, "season": rec["season"] + copy * span} for copy in range(factor) for rec in records]
+
+
+def write_synthetic_inputs(directory: Path, factor: int) -> None:
+    """Write the chart JSON inputs and the league CSV at ``factor`` times their real size."""
+    for name in SEASON_SERIES_INPUTS:
+        records = json.loads((ANALYSIS_DIR / name).read_text())
+        (directory / name).write_text(json.dumps(extend_seasons(records, factor)))
+
+    curry = json.loads((ANALYSIS_DIR / "curry_vs_league.json").read_text())
+    curry = {key: extend_seasons(records, factor) for key, records in curry.items()}
+    (directory / "curry_vs_league.json").write_text(json.dumps(curry))
+
+    volume = json.loads((ANALYSIS_DIR / "volume_vs_efficiency.json").read_text())
+    for panel in volume["snapshots"].values():
+        for field, values in panel.items():
+            panel[field] = values * factor
+    (directory / "volume_vs_efficiency.json").write_text(json.dumps(volume))
+
+    with (BASE_DIR / CSV_INPUT).open(newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        header = next(reader)
+        rows = list(reader)
+    season = header.index("season")
+    span = max(int(row[season]) for row in rows) - min(int(row[season]) for row in rows) + 1
+    with (directory / CSV_INPUT).open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(header)
+        for copy in range(factor):
+            for row in rows:
+                shifted = list(row)
+                shifted[season] = str(int(row[season]) + copy * span)
+                writer.writerow(shifted)
+
+
+@contextmanager
+def synthetic_data(factor: int) -> Iterator[Path]:
+    """Point chart_spec and make_charts at a scratch directory of scaled inputs."""
+    import chart_spec
+    import make_charts
+
+    saved = chart_spec.ANALYSIS_DIR, make_charts.FIGURE_DIR
+    with tempfile.TemporaryDirectory(prefix=f"bench-{factor}x-") as tmp:
+        directory = Path(tmp)
+        write_synthetic_inputs(directory, factor)
+        chart_spec.ANALYSIS_DIR = make_charts.FIGURE_DIR = directory
+        chart_spec.clear_caches()
+        try:
+            yield directory
+        finally:
+            chart_spec.ANALYSIS_DIR, make_charts.FIGURE_DIR = saved
+            chart_spec.clear_caches()
+
+
+def time_stage(run: Callable[[], object], setup: Optional[Callable[[], None]] = None, repeat: int = 5) -> dict:
+    """Best and median wall time of ``run`` over ``repeat`` calls, with ``setup`` untimed before each.
+
+    The collector is paused while timing, as ``timeit`` does.
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            gc.enable()
+    return {"best_ms": round(min(samples), 3), "median_ms": round(statistics.median(samples), 3)}
+
+
+def bench_stages(factor: int, repeat: int = 5) -> Dict[str, dict]:
+    """Time every stage of the figure and PDF build on inputs ``factor`` times the real size."""
+    import chart_spec
+    from build_pdf import build_document
+    from ingest import parse_csv
+    from make_charts import CHART_BUILDERS
+    from pipeline import season_means
+
+    def load_json_inputs() -> None:
+        chart_spec.clear_caches()
+        chart_spec.load_inputs()
+
+    def fresh_specs() -> None:
+        chart_spec.clear_caches(keep_json=True)
+
+    stages: Dict[str, dict] = {}
+    with synthetic_data(factor) as directory:
+        csv_path = directory / CSV_INPUT
+        table = parse_csv(csv_path)
+        stages["load_csv"] = time_stage(lambda: parse_csv(csv_path), repeat=repeat)
+        stages["aggregate_season_means"] = time_stage(
+            lambda: season_means(table, ["x3pa_per_game", "x3p_percent"]), repeat=repeat
+        )
+        stages["load_json"] = time_stage(load_json_inputs, repeat=repeat)
+        # The chart stages keep the cached changepoints, so time the PELT search on its own.
+        stages["changepoints"] = time_stage(
+            chart_spec.league_trend_breaks, setup=chart_spec.league_trend_breaks.cache_clear, repeat=repeat
+        )
+        for name, build in CHART_BUILDERS.items():
+            stages[f"chart_{name}"] = time_stage(build, setup=fresh_specs, repeat=repeat)
+        stages["build_document"] = time_stage(build_document, setup=fresh_specs, repeat=repeat)
+        doc = build_document()
+        pdf_path = directory / "bench.pdf"
+        stages["pdf_save"] = time_stage(lambda: doc.save(pdf_path), repeat=repeat)
+        stages["pdf_save_compressed"] = time_stage(lambda: doc.save(pdf_path, compress=True), repeat=repeat)
+    return stages
+
+
+def calibration_loop(n: int = 20_000) -> float:
+    """A fixed slice of interpreter work (float maths, dict and list churn, formatting)."""
+    counts: Dict[int, float] = {}
+    labels = []
+    total = 0.0
+    for i in range(n):
+        value = (i % 97) * 1.5 + total * 1e-9
+        counts[i % 1024] = counts.get(i % 1024, 0.0) + value
+        if i % 64 == 0:
+            labels.append(f"{value:.3f}")
+        total += value
+    return total + len(labels)
+
+
+def calibrate(repeat: int = 50) -> float:
+    """Best time of ``calibration_loop`` in ms: the machine-speed unit suite timings are compared in.
+
+    The loop is short and repeated many times so that, like the stages'
+    best-of-N timings, it reflects the machine when it is not being interrupted.
+    """
+    return time_stage(calibration_loop, repeat=repeat)["best_ms"]
+
+
+def run_suite(scales: List[int], repeat: int = 5) -> dict:
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "scales": {},
+    }
+    # Sampled around every scale, keeping the best, so one slow phase does not skew it.
+    calibration = [calibrate()]
+    for factor in scales:
+        print(f"-- {factor}x")
+        stages = bench_stages(factor, repeat=repeat)
+        for stage, stats in stages.items():
+            print(f"  {stage:<30} {stats['best_ms']:>10.1f} ms best  {stats['median_ms']:>10.1f} ms median")
+        results["scales"][f"{factor}x"] = stages
+        calibration.append(calibrate())
+    results["calibration_ms"] = min(calibration)
+    print(f"calibration loop {results['calibration_ms']:.2f} ms")
+    return results
+
+
+def compare_to_baseline(
+    results: dict,
+    baseline: dict,
+    threshold: float = REGRESSION_THRESHOLD,
+    slack_ms: float = REGRESSION_SLACK_MS,
+) -> List[str]:
+    """Failure messages for stages whose best time exceeds the baseline by more than ``threshold``.
+
+    Baseline times are first rescaled by the ratio of the two runs'
+    calibration loops, so a baseline recorded on a faster or slower machine
+    still compares like for like.
+    """
+    speed = 1.0
+    if results.get("calibration_ms") and baseline.get("calibration_ms"):
+        speed = results["calibration_ms"] / baseline["calibration_ms"]
+        print(f"baseline timings scaled by {speed:.2f} (calibration loop ratio)")
+    failures = []
+    for scale, stages in results["scales"].items():
+        reference = baseline.get("scales", {}).get(scale, {})
+        for stage, stats in stages.items():
+            if stage not in reference:
+                continue
+            before, after = reference[stage]["best_ms"] * speed, stats["best_ms"]
+            if after > before * (1 + threshold) and after - before > slack_ms:
+                failures.append(f"{scale} {stage}: {after:.1f} ms vs baseline {before:.1f} ms (+{after / before - 1:.0%})")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Performance checks for the analysis scripts.")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS, help="ms allowed for import build_pdf")
+    parser.add_argument(
+        "--primitives",
+        type=int,
+        nargs="?",
+        const=1_000_000,
+        default=None,
+        help="also run the PDF content-stream microbenchmark over N primitives (default 1M)",
+    )
+    parser.add_argument(
+        "--suite",
+        action="store_true",
+        help="time loading, aggregation, every chart, build_document and PDF save at each --scales factor",
+    )
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="synthetic data multipliers")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage (best and median are kept)")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH, help="where to write the suite results JSON")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="stored results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help="allowed slowdown per stage as a fraction of the baseline",
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    if args.primitives:
+        bench_content_stream(args.primitives)
+    failures = check_import_budget(args.import_budget)
+    failures += check_kernels()
+    if args.suite:
+        results = run_suite(args.scales, repeat=args.repeat)
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Wrote {args.output}")
+        if args.update_baseline:
+            args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+            print(f"Updated baseline {args.baseline}")
+        elif args.baseline.exists():
+            failures += compare_to_baseline(results, json.loads(args.baseline.read_text()), args.threshold)
+        else:
+            print(f"No baseline at {args.baseline}; run with --update-baseline to store one")
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
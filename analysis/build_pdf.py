@@ -1,9 +1,27 @@
 from __future__ import annotations
 
-import json
+import argparse
 import math
+import zlib
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import BinaryIO, Iterable, List, Optional, Set, Tuple
+
+from chart_spec import (
+    ChartSpec,
+    Panel,
+    curry_vs_league_spec,
+    CHART_SPECS,
+    hex_rgb,
+    league_trend_spec,
+    load_inputs,
+    load_json,
+    position_share_spec,
+    shot_profile_spec,
+    team_adoption_spec,
+    volume_efficiency_spec,
+)
+from profiling import PROFILER, profile_path, stage
+from text_layout import encode_standard, layout_paragraph, string_width
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -31,47 +49,160 @@ def wrap_text(text: str, max_chars: int) -> List[str]:
     return lines
 
 
+def escape_text(text: str) -> bytes:
+    """``text`` as an escaped PDF string body in the font's StandardEncoding."""
+    return encode_standard(text).replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+class ContentStream:
+    """Append-only PDF content stream built directly as bytes.
+
+    Operators are written with bytes %-formatting into one bytearray (one
+    operation per line). Stroke/fill colour and line width are tracked so
+    repeated state operators are dropped.
+    """
+
+    __slots__ = ("buffer", "ops", "_stroke", "_fill", "_line_width", "_dash")
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.ops = 0
+        self._stroke: Optional[Tuple[float, float, float]] = None
+        self._fill: Optional[Tuple[float, float, float]] = None
+        self._line_width: Optional[float] = None
+        self._dash: Optional[str] = None
+
+    def append(self, op: bytes) -> None:
+        self.buffer += op
+        self.buffer += b"\n"
+        self.ops += 1
+
+    def getvalue(self) -> bytes:
+        return bytes(self.buffer[:-1])
+
+    def set_stroke_rgb(self, r: float, g: float, b: float) -> None:
+        if self._stroke != (r, g, b):
+            self._stroke = (r, g, b)
+            self.append(b"%.3f %.3f %.3f RG" % (r, g, b))
+
+    def set_fill_rgb(self, r: float, g: float, b: float) -> None:
+        if self._fill != (r, g, b):
+            self._fill = (r, g, b)
+            self.append(b"%.3f %.3f %.3f rg" % (r, g, b))
+
+    def set_dash(self, dash: Optional[str]) -> None:
+        """Dash pattern in SVG dasharray syntax ("6 4"); ``None`` is solid."""
+        if self._dash != dash:
+            self._dash = dash
+            self.append(b"[%s] 0 d" % (dash or "").encode("ascii"))
+
+    def width_prefix(self, width: float) -> bytes:
+        """``w`` operator for a stroke, or nothing if the width is already current."""
+        if self._line_width == width:
+            return b""
+        self._line_width = width
+        return b"%.2f w " % width
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, width: float) -> None:
+        if self._line_width != width:
+            self.buffer += self.width_prefix(width)
+        self.buffer += b"%.2f %.2f m %.2f %.2f l S\n" % (x1, y1, x2, y2)
+        self.ops += 1
+
+    def polyline(self, points: Iterable[Tuple[float, float]], width: float) -> None:
+        segments = [b"%.2f %.2f l" % point for point in points]
+        if len(segments) < 2:
+            return
+        segments[0] = segments[0][:-1] + b"m"
+        self.append(self.width_prefix(width) + b" ".join(segments) + b" S")
+
+    def rect(self, x: float, y: float, w: float, h: float, width: float) -> None:
+        self.append(self.width_prefix(width) + b"%.2f %.2f %.2f %.2f re S" % (x, y, w, h))
+
+    def square(self, x: float, y: float, size: float) -> None:
+        half = size / 2
+        self.buffer += b"%.2f %.2f %.2f %.2f re f\n" % (x - half, y - half, size, size)
+        self.ops += 1
+
+    def squares(self, points: Iterable[Tuple[float, float]], size: float) -> None:
+        """Fill a square per point with a single ``f`` for the whole batch."""
+        half = size / 2
+        rects = [b"%.2f %.2f %.2f %.2f re" % (x - half, y - half, size, size) for x, y in points]
+        if rects:
+            self.append(b"\n".join(rects) + b" f")
+            self.ops += len(rects) - 1
+
+    def text(self, x: float, y: float, text: str, size: float, angle: float = 0.0) -> None:
+        encoded = escape_text(text)
+        if not angle:
+            self.append(b"BT /F1 %.1f Tf %.2f %.2f Td (%s) Tj ET" % (size, x, y, encoded))
+            return
+        cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+        self.append(
+            b"BT /F1 %.1f Tf %.4f %.4f %.4f %.4f %.2f %.2f Tm (%s) Tj ET" % (size, cos, sin, -sin, cos, x, y, encoded)
+        )
+
+
 class PDFPage:
     def __init__(self, width: float = 612, height: float = 792) -> None:
         self.width = width
         self.height = height
-        self.commands: List[str] = []
+        self.stream = ContentStream()
+
+    def content(self) -> bytes:
+        return self.stream.getvalue()
 
     def set_stroke_rgb(self, r: float, g: float, b: float) -> None:
-        self.commands.append(f"{r:.3f} {g:.3f} {b:.3f} RG")
+        self.stream.set_stroke_rgb(r, g, b)
 
     def set_fill_rgb(self, r: float, g: float, b: float) -> None:
-        self.commands.append(f"{r:.3f} {g:.3f} {b:.3f} rg")
+        self.stream.set_fill_rgb(r, g, b)
 
     def draw_line(self, x1: float, y1: float, x2: float, y2: float, width: float = 1.0) -> None:
-        self.commands.append(f"{width:.2f} w {x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S")
+        self.stream.line(x1, y1, x2, y2, width)
+
+    def draw_polyline(self, points: Iterable[Tuple[float, float]], width: float = 1.0) -> None:
+        """Stroke connected segments through ``points`` as one path."""
+        self.stream.polyline(points, width)
 
     def draw_rect(self, x: float, y: float, w: float, h: float, width: float = 1.0) -> None:
-        self.commands.append(f"{width:.2f} w {x:.2f} {y:.2f} {w:.2f} {h:.2f} re S")
+        self.stream.rect(x, y, w, h, width)
 
     def draw_point(self, x: float, y: float, size: float = 4.0) -> None:
-        half = size / 2
-        self.commands.append(f"{x - half:.2f} {y - half:.2f} {size:.2f} {size:.2f} re f")
+        self.stream.square(x, y, size)
 
-    def draw_text(self, x: float, y: float, text: str, size: float = 12) -> None:
-        safe = (
-            text.replace("\\", "\\\\")
-            .replace("(", "\\(")
-            .replace(")", "\\)")
-        )
-        self.commands.append(f"BT /F1 {size:.1f} Tf {x:.2f} {y:.2f} Td ({safe}) Tj ET")
+    def draw_points(self, xs: Iterable[float], ys: Iterable[float], size: float = 4.0) -> None:
+        """Batched draw_point over coordinate arrays."""
+        self.stream.squares(zip(xs, ys), size)
+
+    def set_dash(self, dash: Optional[str] = None) -> None:
+        self.stream.set_dash(dash)
+
+    def draw_text(self, x: float, y: float, text: str, size: float = 12, angle: float = 0.0) -> None:
+        """Draw ``text`` with its baseline starting at (x, y), rotated ``angle`` degrees counter-clockwise."""
+        self.stream.text(x, y, text, size, angle)
 
     def draw_paragraph(
         self,
         x: float,
         y_start: float,
         text: str,
-        max_chars: int = 90,
+        max_chars: Optional[int] = None,
         line_height: float = 16,
         size: float = 12,
+        max_width: Optional[float] = None,
     ) -> float:
+        """Wrap ``text`` to ``max_width`` points (default: mirror the left margin).
+
+        ``max_chars`` keeps the old character-count wrapping for callers that
+        still ask for it.
+        """
+        if max_chars is not None:
+            lines = wrap_text(text, max_chars)
+        else:
+            lines = layout_paragraph(text, max_width or self.width - 2 * x, size)
         y = y_start
-        for line in wrap_text(text, max_chars):
+        for line in lines:
             self.draw_text(x, y, line, size=size)
             y -= line_height
         return y
@@ -84,8 +215,25 @@ class PDFDocument:
     def add_page(self, page: PDFPage) -> None:
         self.pages.append(page)
 
-    def save(self, path: Path) -> None:
+    def save(self, path: Path, compress: bool = False) -> None:
+        """Write the document.
+
+        With ``compress`` the page content streams are Flate-encoded, all other
+        objects are packed into a compressed object stream and the classic xref
+        table is replaced by a cross-reference stream (PDF 1.5).
+        """
+        with stage("serialize"):
+            objects, stream_objects, catalog_obj = self._serialize(compress)
+        with stage("write"), path.open("wb") as fh:
+            if compress:
+                write_compressed_body(fh, objects, stream_objects, catalog_obj)
+            else:
+                write_classic_body(fh, objects, catalog_obj)
+
+    def _serialize(self, compress: bool) -> Tuple[List[bytes], Set[int], int]:
+        """Encode every object body; returns (objects, stream object numbers, catalog number)."""
         objects: List[bytes] = [b""]  # index 0 unused for convenience
+        stream_objects = set()
 
         def add_object(content: bytes) -> int:
             objects.append(content)
@@ -95,13 +243,9 @@ class PDFDocument:
 
         page_entries: List[Tuple[int, PDFPage, int]] = []
         for page in self.pages:
-            stream_data = "\n".join(page.commands).encode("utf-8")
-            content = (
-                f"<< /Length {len(stream_data)} >>\nstream\n".encode("utf-8")
-                + stream_data
-                + b"\nendstream"
-            )
-            content_obj = add_object(content)
+            stream_data = page.content()
+            content_obj = add_object(encode_stream(stream_data, compress=compress))
+            stream_objects.add(content_obj)
             page_obj = add_object(b"")  # placeholder
             page_entries.append((page_obj, page, content_obj))
 
@@ -119,387 +263,321 @@ class PDFDocument:
             objects[page_obj] = page_dict
 
         catalog_obj = add_object(f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode("utf-8"))
+        return objects, stream_objects, catalog_obj
+
+
+def encode_stream(data: bytes, compress: bool = False, extra: str = "") -> bytes:
+    """Wrap raw bytes as a PDF stream object body, optionally Flate-encoded."""
+    if compress:
+        data = zlib.compress(data, 6)
+        extra += " /Filter /FlateDecode"
+    return f"<< /Length {len(data)}{extra} >>\nstream\n".encode("utf-8") + data + b"\nendstream"
+
+
+def write_indirect(fh: BinaryIO, num: int, body: bytes) -> int:
+    """Write ``num 0 obj ... endobj`` and return the object's byte offset."""
+    offset = fh.tell()
+    fh.write(f"{num} 0 obj\n".encode("utf-8"))
+    fh.write(body)
+    fh.write(b"\nendobj\n")
+    return offset
+
+
+def encode_object_stream(members: List[Tuple[int, bytes]]) -> bytes:
+    """Pack non-stream objects into one compressed /ObjStm body."""
+    index_parts: List[str] = []
+    offset = 0
+    for num, body in members:
+        index_parts.append(f"{num} {offset}")
+        offset += len(body) + 1
+    index = (" ".join(index_parts) + "\n").encode("utf-8")
+    data = index + b"\n".join(body for _, body in members)
+    return encode_stream(data, compress=True, extra=f" /Type /ObjStm /N {len(members)} /First {len(index)}")
+
+
+def write_xref_table(fh: BinaryIO, offsets: List[int], catalog_obj: int) -> None:
+    """Classic xref table; ``offsets[i]`` belongs to object ``i + 1``."""
+    xref_start = fh.tell()
+    fh.write(f"xref\n0 {len(offsets) + 1}\n".encode("utf-8"))
+    fh.write(b"0000000000 65535 f \n")
+    for off in offsets:
+        fh.write(f"{off:010d} 00000 n \n".encode("utf-8"))
+    fh.write(b"trailer\n")
+    fh.write(f"<< /Size {len(offsets) + 1} /Root {catalog_obj} 0 R >>\n".encode("utf-8"))
+    fh.write(b"startxref\n")
+    fh.write(f"{xref_start}\n".encode("utf-8"))
+    fh.write(b"%%EOF")
+
+
+def write_xref_stream(fh: BinaryIO, entries: List[Tuple[int, int, int]], catalog_obj: int) -> None:
+    """Compressed cross-reference stream (PDF 1.5, section 3.4.7).
+
+    ``entries`` holds one (type, field2, field3) triple per object number; the
+    xref stream's own entry is appended here.
+    """
+    xref_num = len(entries)
+    xref_start = fh.tell()
+    entries = entries + [(1, xref_start, 0)]
+    offset_width = max(1, (max(entry[1] for entry in entries).bit_length() + 7) // 8)
+    index_width = max(1, (max(entry[2] for entry in entries).bit_length() + 7) // 8)
+    rows = b"".join(
+        kind.to_bytes(1, "big") + field2.to_bytes(offset_width, "big") + field3.to_bytes(index_width, "big")
+        for kind, field2, field3 in entries
+    )
+    xref_dict = (
+        f" /Type /XRef /Size {len(entries)} /W [1 {offset_width} {index_width}]"
+        f" /Root {catalog_obj} 0 R"
+    )
+    write_indirect(fh, xref_num, encode_stream(rows, compress=True, extra=xref_dict))
+    fh.write(b"startxref\n")
+    fh.write(f"{xref_start}\n".encode("utf-8"))
+    fh.write(b"%%EOF")
+
+
+PDF_14_HEADER = b"%PDF-1.4\n"
+PDF_15_HEADER = b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n"
+
+
+def write_classic_body(fh: BinaryIO, objects: List[bytes], catalog_obj: int) -> None:
+    fh.write(PDF_14_HEADER)
+    offsets = [write_indirect(fh, idx, obj) for idx, obj in enumerate(objects[1:], start=1)]
+    write_xref_table(fh, offsets, catalog_obj)
+
+
+def write_compressed_body(
+    fh: BinaryIO, objects: List[bytes], stream_objects: Set[int], catalog_obj: int
+) -> None:
+    """PDF 1.5 layout: streams stay top-level, everything else goes in one object stream."""
+    fh.write(PDF_15_HEADER)
+    entries: List[Tuple[int, int, int]] = [(0, 0, 65535)] + [(0, 0, 0)] * (len(objects) - 1)
+    for idx in sorted(stream_objects):
+        entries[idx] = (1, write_indirect(fh, idx, objects[idx]), 0)
+
+    objstm_num = len(objects)
+    packed = [(idx, objects[idx]) for idx in range(1, len(objects)) if idx not in stream_objects]
+    for position, (idx, _) in enumerate(packed):
+        entries[idx] = (2, objstm_num, position)
+    entries.append((1, write_indirect(fh, objstm_num, encode_object_stream(packed)), 0))
+    write_xref_stream(fh, entries, catalog_obj)
+
+
+class PDFStreamWriter:
+    """Page-at-a-time PDF writer with the same ``add_page`` interface as PDFDocument.
+
+    Each page's content stream and page dictionary hit the file as soon as the
+    page is added; only object offsets and page numbers are kept in memory. The
+    page tree, catalog and cross-reference section are written by ``close()``.
+    With ``compress`` the small dictionaries are batched into object streams of
+    ``objstm_batch`` members and the file ends with an xref stream.
+    """
+
+    def __init__(self, path: Path, compress: bool = False, objstm_batch: int = 100) -> None:
+        self.path = path
+        self.compress = compress
+        self.objstm_batch = objstm_batch
+        self.page_count = 0
+        self._fh: Optional[BinaryIO] = path.open("wb")
+        self._fh.write(PDF_15_HEADER if compress else PDF_14_HEADER)
+        self._entries: List[Tuple[int, int, int]] = [(0, 0, 65535)]
+        self._pending: List[Tuple[int, bytes]] = []
+        self._kids: List[int] = []
+        self._font_obj = self._write_object(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        self._pages_obj = self._reserve()
+
+    def __enter__(self) -> "PDFStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _reserve(self) -> int:
+        self._entries.append((0, 0, 0))
+        return len(self._entries) - 1
+
+    def _write_stream(self, body: bytes) -> int:
+        num = self._reserve()
+        self._entries[num] = (1, write_indirect(self._fh, num, body), 0)
+        return num
+
+    def _write_object(self, body: bytes, num: Optional[int] = None) -> int:
+        if num is None:
+            num = self._reserve()
+        if not self.compress:
+            self._entries[num] = (1, write_indirect(self._fh, num, body), 0)
+            return num
+        self._pending.append((num, body))
+        if len(self._pending) >= self.objstm_batch:
+            self._flush_pending()
+        return num
+
+    def _flush_pending(self) -> None:
+        if not self._pending:
+            return
+        objstm_num = self._reserve()
+        for position, (num, _) in enumerate(self._pending):
+            self._entries[num] = (2, objstm_num, position)
+        offset = write_indirect(self._fh, objstm_num, encode_object_stream(self._pending))
+        self._entries[objstm_num] = (1, offset, 0)
+        self._pending = []
 
-        with path.open("wb") as fh:
-            fh.write(b"%PDF-1.4\n")
-            offsets: List[int] = []
-            for idx, obj in enumerate(objects[1:], start=1):
-                offsets.append(fh.tell())
-                fh.write(f"{idx} 0 obj\n".encode("utf-8"))
-                fh.write(obj)
-                fh.write(b"\nendobj\n")
-
-            xref_start = fh.tell()
-            fh.write(f"xref\n0 {len(objects)}\n".encode("utf-8"))
-            fh.write(b"0000000000 65535 f \n")
-            for off in offsets:
-                fh.write(f"{off:010d} 00000 n \n".encode("utf-8"))
-            fh.write(b"trailer\n")
-            fh.write(f"<< /Size {len(objects)} /Root {catalog_obj} 0 R >>\n".encode("utf-8"))
-            fh.write(b"startxref\n")
-            fh.write(f"{xref_start}\n".encode("utf-8"))
-            fh.write(b"%%EOF")
-
-
-def load_json(name: str):
-    return json.loads((ANALYSIS_DIR / name).read_text())
-
-
-LEAGUE_TREND = load_json("league_3pa_trend.json")
-for rec in LEAGUE_TREND:
-    rec["avg_3p_percent"] *= 100.0
-
-CURRY_DATA = load_json("curry_vs_league.json")
-POSITION_SHARES = load_json("position_3pa_shares.json")
-SHOT_PROFILE = load_json("shot_profile_trends.json")
-VOLUME_EFFICIENCY = load_json("volume_vs_efficiency.json")
-TEAM_ADOPTION = load_json("team_adoption_threshold.json")
+    def add_page(self, page: PDFPage) -> None:
+        if self._fh is None:
+            raise ValueError("PDFStreamWriter is closed")
+        stream_data = page.content()
+        content_obj = self._write_stream(encode_stream(stream_data, compress=self.compress))
+        page_dict = (
+            f"<< /Type /Page /Parent {self._pages_obj} 0 R /MediaBox [0 0 {page.width:.0f} {page.height:.0f}] "
+            f"/Resources << /Font << /F1 {self._font_obj} 0 R >> >> /Contents {content_obj} 0 R >>"
+        ).encode("utf-8")
+        self._kids.append(self._write_object(page_dict))
+        self.page_count += 1
+
+    def close(self) -> None:
+        if self._fh is None:
+            return
+        with stage("write"):
+            self._finish()
+
+    def _finish(self) -> None:
+        kids = " ".join(f"{num} 0 R" for num in self._kids)
+        self._write_object(
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self._kids)} >>".encode("utf-8"),
+            num=self._pages_obj,
+        )
+        catalog_obj = self._write_object(f"<< /Type /Catalog /Pages {self._pages_obj} 0 R >>".encode("utf-8"))
+        if self.compress:
+            self._flush_pending()
+            write_xref_stream(self._fh, self._entries, catalog_obj)
+        else:
+            write_xref_table(self._fh, [entry[1] for entry in self._entries[1:]], catalog_obj)
+        self._fh.close()
+        self._fh = None
 
 
-def draw_league_trend(page: PDFPage, left: float, bottom: float, width: float, height: float) -> None:
-    filtered = [rec for rec in LEAGUE_TREND if rec["season"] >= 1979]
-    seasons = [rec["season"] for rec in filtered]
-    data_left = [rec["avg_3pa_per_game"] for rec in filtered]
-    data_right = [rec["avg_3p_percent"] for rec in filtered]
-    left_domain = (0.0, max(data_left) * 1.05)
-    right_domain = (20.0, max(data_right) * 1.05)
+def draw_panel(
+    page: PDFPage,
+    panel: Panel,
+    left: float,
+    bottom: float,
+    width: float,
+    height: float,
+    y_labels: bool = True,
+) -> None:
+    """Map one unit-square panel onto the plot box with its lower-left corner at (left, bottom)."""
 
-    def scale_x(season: int) -> float:
-        return left + (season - seasons[0]) / (seasons[-1] - seasons[0]) * width
+    def px(fx: float) -> float:
+        return left + fx * width
 
-    def scale_y(value: float, domain: Tuple[float, float]) -> float:
-        low, high = domain
-        return bottom + (value - low) / (high - low) * height
+    def py(fy: float) -> float:
+        return bottom + fy * height
 
+    right = left + width
     page.set_stroke_rgb(0.6, 0.6, 0.6)
     page.draw_rect(left, bottom, width, height, width=1.0)
-    for i in range(1, 5):
-        y = bottom + height * i / 5
-        page.draw_line(left, y, left + width, y, width=0.5)
+    if panel.y_axis.grid:
+        for fy, _ in panel.y_axis.ticks:
+            if 0 < fy < 1:
+                page.draw_line(left, py(fy), right, py(fy), width=0.5)
 
-    # Left axis labels
     page.set_stroke_rgb(0, 0, 0)
-    page.draw_text(left - 50, bottom + height + 10, "League 3PA per game", size=10)
-    for i in range(6):
-        value = left_domain[0] + (left_domain[1] - left_domain[0]) * i / 5
-        y = scale_y(value, left_domain)
-        page.draw_line(left - 5, y, left, y, width=1.0)
-        page.draw_text(left - 45, y - 4, f"{value:.0f}", size=10)
-
-    page.draw_text(left + width + 10, bottom + height + 10, "League 3P%", size=10)
-    for i in range(6):
-        value = right_domain[0] + (right_domain[1] - right_domain[0]) * i / 5
-        y = scale_y(value, right_domain)
-        page.draw_line(left + width, y, left + width + 5, y, width=1.0)
-        page.draw_text(left + width + 8, y - 4, f"{value:.0f}", size=10)
-
-    # X axis labels
-    unique_steps = max(1, len(seasons) // 8)
-    for idx, season in enumerate(seasons):
-        if idx % unique_steps != 0 and season != seasons[-1]:
-            continue
-        x = scale_x(season)
-        page.draw_line(x, bottom, x, bottom - 5, width=1.0)
-        page.draw_text(x - 12, bottom - 18, str(season), size=10)
-
-    # Left series
-    page.set_stroke_rgb(0.12, 0.47, 0.71)
-    prev = None
-    for rec in filtered:
-        x = scale_x(rec["season"])
-        y = scale_y(rec["avg_3pa_per_game"], left_domain)
-        if prev:
-            page.draw_line(prev[0], prev[1], x, y, width=2.0)
-        prev = (x, y)
-
-    # Right series
-    page.set_stroke_rgb(0.84, 0.15, 0.16)
-    prev = None
-    for rec in filtered:
-        x = scale_x(rec["season"])
-        y = scale_y(rec["avg_3p_percent"], right_domain)
-        if prev:
-            page.draw_line(prev[0], prev[1], x, y, width=2.0)
-        prev = (x, y)
+    if panel.title:
+        page.draw_text(left + (width - string_width(panel.title, 9)) / 2, bottom + height + 6, panel.title, size=9)
+    for fy, label in panel.y_axis.ticks:
+        page.draw_line(left - 4, py(fy), left, py(fy), width=1.0)
+        if y_labels:
+            page.draw_text(left - 6 - string_width(label, 9), py(fy) - 3, label, size=9)
+    if y_labels and panel.y_axis.label:
+        label = panel.y_axis.label
+        page.draw_text(left - 38, bottom + (height - string_width(label, 9)) / 2, label, size=9, angle=90)
+    if panel.y2_axis is not None:
+        for fy, label in panel.y2_axis.ticks:
+            page.draw_line(right, py(fy), right + 4, py(fy), width=1.0)
+            page.draw_text(right + 6, py(fy) - 3, label, size=9)
+        label = panel.y2_axis.label
+        page.draw_text(right + 38, bottom + (height + string_width(label, 9)) / 2, label, size=9, angle=-90)
+    for fx, label in panel.x_axis.ticks:
+        page.draw_line(px(fx), bottom, px(fx), bottom - 4, width=1.0)
+        page.draw_text(px(fx) - string_width(label, 9) / 2, bottom - 14, label, size=9)
+
+    for note in panel.annotations:
+        x = px(note.x)
+        page.set_stroke_rgb(*hex_rgb(note.color))
+        page.set_fill_rgb(*hex_rgb(note.color))
+        page.set_dash("2 3")
+        page.draw_line(x, bottom, x, bottom + height, width=0.75)
+        label_x = x + 3 if note.align == "start" else x - 3 - string_width(note.label, 7)
+        page.draw_text(label_x, bottom + height - 9 - 9 * note.row, note.label, size=7)
+    page.set_dash(None)
+    page.set_fill_rgb(0, 0, 0)
 
+    for mark in panel.marks:
+        if mark.kind == "line":
+            page.set_stroke_rgb(*hex_rgb(mark.color))
+            page.set_dash(mark.dash)
+            page.draw_polyline([(px(fx), py(fy)) for fx, fy in mark.points], width=mark.width)
+        else:
+            page.set_fill_rgb(*hex_rgb(mark.color))
+            page.draw_points([px(fx) for fx, _ in mark.points], [py(fy) for _, fy in mark.points], size=mark.width)
+    page.set_dash(None)
     page.set_stroke_rgb(0, 0, 0)
-    page.draw_text(left, bottom + height + 30, "League Three-Point Attempts & Accuracy", size=14)
-    page.draw_text(left, bottom + height + 15, "Blue: Attempts per game, Red: 3P%", size=10)
-
-
-def draw_volume_efficiency(page: PDFPage, left: float, bottom: float, panel_width: float, height: float) -> None:
-    seasons = [2000, 2010, 2020, 2025]
-    points_by_season = [(year, VOLUME_EFFICIENCY[str(year)]) for year in seasons if str(year) in VOLUME_EFFICIENCY]
-    if not points_by_season:
-        return
-
-    max_x = max(pt["x3pa_per_game"] for _, pts in points_by_season for pt in pts) * 1.1
-    min_y = min(pt["x3p_percent"] for _, pts in points_by_season for pt in pts) * 0.95
-    max_y = max(pt["x3p_percent"] for _, pts in points_by_season for pt in pts) * 1.05
-
-    def scale_x(val: float) -> float:
-        return val / max_x * (panel_width - 40)
-
-    def scale_y(val: float) -> float:
-        return (val - min_y) / (max_y - min_y) * (height - 40)
-
-    for index, (season, points) in enumerate(points_by_season):
-        panel_left = left + index * panel_width
-        panel_bottom = bottom
-        page.draw_rect(panel_left, panel_bottom, panel_width - 20, height - 20, width=1.0)
-        page.draw_text(panel_left + 20, panel_bottom + height - 10, f"Season {season}", size=12)
-
-        # Axes ticks
-        for i in range(5):
-            value = max_x * i / 4
-            x = panel_left + 20 + scale_x(value)
-            page.draw_line(x, panel_bottom + 20, x, panel_bottom + 16, width=1.0)
-            page.draw_text(x - 10, panel_bottom + 4, f"{value:.0f}", size=9)
-        for i in range(5):
-            value = min_y + (max_y - min_y) * i / 4
-            y = panel_bottom + 20 + scale_y(value)
-            page.draw_line(panel_left + 20, y, panel_left + 16, y, width=1.0)
-            page.draw_text(panel_left + 2, y - 4, f"{value:.3f}", size=9)
-
-        page.set_fill_rgb(0.12, 0.47, 0.71)
-        for pt in points:
-            x = panel_left + 20 + scale_x(pt["x3pa_per_game"])
-            y = panel_bottom + 20 + scale_y(pt["x3p_percent"])
-            page.draw_point(x, y, size=4.0)
-        page.set_fill_rgb(0, 0, 0)
-
-    page.draw_text(left, bottom + height, "3PA Volume vs. Efficiency Snapshots", size=14)
-    page.draw_text(left, bottom + height - 16, "Panels: 2000, 2010, 2020, 2025 (dark squares show teams).", size=10)
-
+    page.set_fill_rgb(0, 0, 0)
 
-def draw_curry_comparison(page: PDFPage, left: float, bottom: float, width: float, height: float) -> None:
-    league_lookup = {rec["season"]: rec["avg_player_3pa_per_game"] for rec in CURRY_DATA["league_avg_player_3pa_per_game"]}
-    curry = [rec for rec in CURRY_DATA["curry"] if rec["season"] >= 2010]
-    seasons = [rec["season"] for rec in curry]
-    league_vals = [league_lookup.get(season) for season in seasons]
 
-    if not seasons:
-        return
+def draw_chart(page: PDFPage, spec: ChartSpec, left: float, bottom: float, width: float, height: float) -> None:
+    """Render a ChartSpec into the box (left, bottom, width, height); title and legend sit above it."""
+    gap = 10 if spec.shared_y else 80
+    count = len(spec.panels)
+    panel_width = (width - gap * (count - 1)) / count
+    for index, panel in enumerate(spec.panels):
+        panel_left = left + index * (panel_width + gap)
+        draw_panel(page, panel, panel_left, bottom, panel_width, height, y_labels=index == 0 or not spec.shared_y)
+
+    page.draw_text(left, bottom + height + 34, spec.title, size=14)
+    legend_x, legend_y = left, bottom + height + 16
+    for mark in spec.legend:
+        page.set_stroke_rgb(*hex_rgb(mark.color))
+        page.set_dash(mark.dash)
+        page.draw_line(legend_x, legend_y + 3, legend_x + 18, legend_y + 3, width=2.5)
+        page.set_dash(None)
+        page.set_stroke_rgb(0, 0, 0)
+        page.draw_text(legend_x + 22, legend_y, mark.label, size=9)
+        legend_x += 22 + string_width(mark.label, 9) + 14
+    if spec.x_label:
+        page.draw_text(left + (width - string_width(spec.x_label, 10)) / 2, bottom - 32, spec.x_label, size=10)
 
-    left_domain = (0.0, max(rec["x3pa_per_game"] for rec in curry) * 1.1)
-    right_domain = (0.0, max(val for val in league_vals if val is not None) * 1.5)
 
-    def scale_x(season: int) -> float:
-        return left + (season - seasons[0]) / (seasons[-1] - seasons[0]) * width
+def draw_league_trend(page: PDFPage, left: float, bottom: float, width: float, height: float) -> None:
+    draw_chart(page, league_trend_spec(), left, bottom, width, height)
 
-    def scale_y(val: float, domain: Tuple[float, float]) -> float:
-        low, high = domain
-        return bottom + (val - low) / (high - low) * height
 
-    page.draw_rect(left, bottom, width, height, width=1.0)
+def draw_volume_efficiency(page: PDFPage, left: float, bottom: float, width: float, height: float) -> None:
+    draw_chart(page, volume_efficiency_spec(), left, bottom, width, height)
 
-    # X ticks
-    unique_steps = max(1, len(seasons) // 8)
-    for idx, season in enumerate(seasons):
-        if idx % unique_steps != 0 and season != seasons[-1]:
-            continue
-        x = scale_x(season)
-        page.draw_line(x, bottom, x, bottom - 5, width=1.0)
-        page.draw_text(x - 12, bottom - 18, str(season), size=10)
-
-    # Left axis (Curry)
-    page.draw_text(left, bottom + height + 12, "Curry 3PA per game", size=10)
-    for i in range(6):
-        value = left_domain[0] + (left_domain[1] - left_domain[0]) * i / 5
-        y = scale_y(value, left_domain)
-        page.draw_line(left - 5, y, left, y, width=1.0)
-        page.draw_text(left - 45, y - 4, f"{value:.0f}", size=10)
-
-    # League axis (right)
-    page.draw_text(left + width + 8, bottom + height + 12, "League avg player 3PA", size=10)
-    for i in range(6):
-        value = right_domain[0] + (right_domain[1] - right_domain[0]) * i / 5
-        y = scale_y(value, right_domain)
-        page.draw_line(left + width, y, left + width + 5, y, width=1.0)
-        page.draw_text(left + width + 8, y - 4, f"{value:.1f}", size=10)
-
-    # Curry series
-    page.set_stroke_rgb(1.0, 0.49, 0.0)
-    prev = None
-    for rec in curry:
-        x = scale_x(rec["season"])
-        y = scale_y(rec["x3pa_per_game"], left_domain)
-        if prev:
-            page.draw_line(prev[0], prev[1], x, y, width=2.5)
-        prev = (x, y)
-
-    # League series
-    page.set_stroke_rgb(0.12, 0.47, 0.71)
-    prev = None
-    for season in seasons:
-        league_val = league_lookup.get(season)
-        if league_val is None:
-            continue
-        x = scale_x(season)
-        y = scale_y(league_val, right_domain)
-        if prev:
-            page.draw_line(prev[0], prev[1], x, y, width=2.0)
-        prev = (x, y)
 
-    page.set_stroke_rgb(0, 0, 0)
-    page.draw_text(left, bottom + height + 28, "Stephen Curry vs. League Average 3PA", size=14)
-    page.draw_text(left, bottom + height + 14, "Orange: Curry, Blue: league average per player.", size=10)
+def draw_curry_comparison(page: PDFPage, left: float, bottom: float, width: float, height: float) -> None:
+    draw_chart(page, curry_vs_league_spec(), left, bottom, width, height)
 
 
 def draw_shot_profile(page: PDFPage, left: float, bottom: float, width: float, height: float) -> None:
-    data = [rec for rec in SHOT_PROFILE if rec["season"] >= 1997]
-    for rec in data:
-        rec["three"] = rec.get("percent_fga_from_x3p_range", 0) * 100
-        rec["mid"] = rec.get("percent_fga_from_x10_16_range", 0) * 100
-        rec["long_mid"] = rec.get("percent_fga_from_x16_3p_range", 0) * 100
-
-    seasons = [rec["season"] for rec in data]
-    max_val = max(rec["three"] for rec in data) * 1.05
-
-    def scale_x(season: int) -> float:
-        return left + (season - seasons[0]) / (seasons[-1] - seasons[0]) * width
-
-    def scale_y(val: float) -> float:
-        return bottom + val / max_val * height
-
-    page.draw_rect(left, bottom, width, height, width=1.0)
-    for i in range(1, 5):
-        y = bottom + height * i / 5
-        page.draw_line(left, y, left + width, y, width=0.5)
-
-    for i in range(6):
-        value = max_val * i / 5
-        y = scale_y(value)
-        page.draw_line(left - 5, y, left, y, width=1.0)
-        page.draw_text(left - 40, y - 4, f"{value:.0f}%", size=10)
-
-    step = max(1, len(seasons) // 8)
-    for idx, season in enumerate(seasons):
-        if idx % step != 0 and season != seasons[-1]:
-            continue
-        x = scale_x(season)
-        page.draw_line(x, bottom, x, bottom - 5, width=1.0)
-        page.draw_text(x - 12, bottom - 18, str(season), size=10)
-
-    def draw_series(field: str, color: Tuple[float, float, float], width_line: float = 2.0) -> None:
-        page.set_stroke_rgb(*color)
-        prev = None
-        for rec in data:
-            value = rec[field]
-            x = scale_x(rec["season"])
-            y = scale_y(value)
-            if prev:
-                page.draw_line(prev[0], prev[1], x, y, width=width_line)
-            prev = (x, y)
-
-    draw_series("three", (0.12, 0.47, 0.71), 2.5)
-    draw_series("mid", (0.84, 0.15, 0.16), 2.0)
-    draw_series("long_mid", (0.58, 0.40, 0.74), 2.0)
-    page.set_stroke_rgb(0, 0, 0)
-    page.draw_text(left, bottom + height + 28, "Shot Selection Migration", size=14)
-    page.draw_text(left, bottom + height + 14, "Blue: 3PA share, Red: midrange (10-16ft), Purple: long midrange.", size=10)
+    draw_chart(page, shot_profile_spec(), left, bottom, width, height)
 
 
 def draw_position_share(page: PDFPage, left: float, bottom: float, width: float, height: float) -> None:
-    data = [rec for rec in POSITION_SHARES if rec["season"] >= 1997]
-    seasons = [rec["season"] for rec in data]
-    positions = ["PG", "SG", "SF", "PF", "C"]
-
-    def scale_x(season: int) -> float:
-        return left + (season - seasons[0]) / (seasons[-1] - seasons[0]) * width
-
-    def scale_y(val: float) -> float:
-        return bottom + val * height
-
-    page.draw_rect(left, bottom, width, height, width=1.0)
-    for i in range(1, 5):
-        y = bottom + height * i / 5
-        page.draw_line(left, y, left + width, y, width=0.5)
-        page.draw_text(left - 45, y - 4, f"{i*20}%", size=10)
-
-    step = max(1, len(seasons) // 8)
-    for idx, season in enumerate(seasons):
-        if idx % step != 0 and season != seasons[-1]:
-            continue
-        x = scale_x(season)
-        page.draw_line(x, bottom, x, bottom - 5, width=1.0)
-        page.draw_text(x - 12, bottom - 18, str(season), size=10)
-
-    palette = {
-        "PG": (0.12, 0.47, 0.71),
-        "SG": (0.84, 0.15, 0.16),
-        "SF": (0.20, 0.63, 0.17),
-        "PF": (0.58, 0.40, 0.74),
-        "C": (0.55, 0.34, 0.29),
-    }
-
-    for pos in positions:
-        page.set_stroke_rgb(*palette[pos])
-        prev = None
-        for rec in data:
-            value = rec.get(f"share_{pos}")
-            if value is None:
-                continue
-            x = scale_x(rec["season"])
-            y = scale_y(value)
-            if prev:
-                page.draw_line(prev[0], prev[1], x, y, width=2.0)
-            prev = (x, y)
-
-    page.set_stroke_rgb(0, 0, 0)
-    page.draw_text(left, bottom + height + 28, "Share of League 3PA by Position", size=14)
-    legend_x = left + width - 140
-    legend_y = bottom + height - 14
-    for pos in positions:
-        page.set_stroke_rgb(*palette[pos])
-        page.draw_line(legend_x, legend_y, legend_x + 20, legend_y, width=2.5)
-        page.set_stroke_rgb(0, 0, 0)
-        page.draw_text(legend_x + 30, legend_y - 4, pos, size=10)
-        legend_y -= 16
+    draw_chart(page, position_share_spec(), left, bottom, width, height)
 
 
 def draw_team_adoption(page: PDFPage, left: float, bottom: float, width: float, height: float) -> None:
-    data = TEAM_ADOPTION
-    seasons = [rec["season"] for rec in data]
-    net_vals = [rec["net_rating"] for rec in data if rec["net_rating"] is not None]
-    xs_domain = (min(seasons) - 1, max(seasons) + 1)
-    ys_domain = (min(net_vals) - 2, max(net_vals) + 2)
-
-    def scale_x(season: float) -> float:
-        return left + (season - xs_domain[0]) / (xs_domain[1] - xs_domain[0]) * width
-
-    def scale_y(val: float) -> float:
-        return bottom + (val - ys_domain[0]) / (ys_domain[1] - ys_domain[0]) * height
-
-    page.draw_rect(left, bottom, width, height, width=1.0)
-
-    step = max(1, (xs_domain[1] - xs_domain[0]) // 8)
-    for season in range(int(xs_domain[0]), int(xs_domain[1]) + 1, step):
-        x = scale_x(season)
-        page.draw_line(x, bottom, x, bottom - 5, width=1.0)
-        page.draw_text(x - 12, bottom - 18, str(season), size=10)
-
-    for i in range(1, 6):
-        value = ys_domain[0] + (ys_domain[1] - ys_domain[0]) * i / 5
-        y = scale_y(value)
-        page.draw_line(left, y, left + width, y, width=0.5)
-        page.draw_text(left - 40, y - 4, f"{value:.0f}", size=10)
-
-    page.set_fill_rgb(0.20, 0.63, 0.17)
-    for rec in data:
-        if rec["net_rating"] is None:
-            continue
-        x = scale_x(rec["season"])
-        y = scale_y(rec["net_rating"])
-        page.draw_point(x, y, size=5.0)
-    page.set_fill_rgb(0, 0, 0)
-
-    page.draw_text(left, bottom + height + 28, "Team Adoption of ≥40% 3PA Rate", size=14)
-    page.draw_text(left, bottom + height + 14, "Green squares mark season net rating vs. adoption year.", size=10)
+    draw_chart(page, team_adoption_spec(), left, bottom, width, height)
 
 
-def build_document() -> PDFDocument:
-    doc = PDFDocument()
+def build_document(doc: Optional[PDFDocument] = None) -> PDFDocument:
+    """Lay out the design doc into ``doc`` (a PDFDocument or PDFStreamWriter)."""
+    if doc is None:
+        doc = PDFDocument()
 
     # Page 1: Cover
     page1 = PDFPage()
@@ -513,7 +591,7 @@ def build_document() -> PDFDocument:
         "of team-wide adoption. The project delivers a presentation-grade scrollytelling "
         "experience supported by analytical tooling."
     )
-    page1.draw_paragraph(80, 580, intro, max_chars=95, size=12)
+    page1.draw_paragraph(80, 580, intro, size=12)
     doc.add_page(page1)
 
     # Page 2: Problem & Audience
@@ -524,7 +602,7 @@ def build_document() -> PDFDocument:
         "offensive weapon. The shift spans decades of gradual experimentation, structural rule "
         "changes, and a singular catalyst in Stephen Curry. Our story rebuilds that arc with data."
     )
-    y = page2.draw_paragraph(80, 690, text_problem, max_chars=95)
+    y = page2.draw_paragraph(80, 690, text_problem)
     y -= 10
     bullets = [
         "Reconstruct inflection points in league-wide three-point volume and accuracy.",
@@ -543,7 +621,7 @@ def build_document() -> PDFDocument:
         "talking points. Tertiary: analysts and coaches who want to benchmark adoption, efficiency, "
         "and positional shifts through light interactivity."
     )
-    page2.draw_paragraph(80, y, audience_text, max_chars=95)
+    page2.draw_paragraph(80, y, audience_text)
     doc.add_page(page2)
 
     # Page 3: Data inventory & key questions
@@ -565,7 +643,7 @@ def build_document() -> PDFDocument:
         "are normalized to primary role for share analysis. Scripts in analysis/ confirm "
         "season coverage from 1979–2025 league-wide and 1997–2025 for shot profiles."
     )
-    y = page3.draw_paragraph(80, y, quality, max_chars=95)
+    y = page3.draw_paragraph(80, y, quality)
     y -= 20
     page3.draw_text(80, y, "4. Core User Questions", size=18)
     y -= 30
@@ -589,7 +667,7 @@ def build_document() -> PDFDocument:
         "accuracy climbed roughly ten percentage points. The chart below grounds Chapter 1 "
         "of our story with annotations for major rule changes and pace shifts."
     )
-    page4.draw_paragraph(80, 690, commentary, max_chars=95)
+    page4.draw_paragraph(80, 690, commentary)
     draw_league_trend(page4, left=80, bottom=320, width=450, height=260)
     doc.add_page(page4)
 
@@ -601,9 +679,9 @@ def build_document() -> PDFDocument:
         "Below, Curry's per-game attempts dwarf the league average, showing how one star "
         "redefined acceptable shot diets."
     )
-    page5.draw_paragraph(80, 690, text5, max_chars=95)
-    draw_volume_efficiency(page5, left=80, bottom=360, panel_width=140, height=220)
-    draw_curry_comparison(page5, left=80, bottom=80, width=450, height=220)
+    page5.draw_paragraph(80, 690, text5)
+    draw_volume_efficiency(page5, left=80, bottom=400, width=450, height=180)
+    draw_curry_comparison(page5, left=80, bottom=70, width=450, height=220)
     doc.add_page(page5)
 
     # Page 6: Positions & shot selection
@@ -613,9 +691,9 @@ def build_document() -> PDFDocument:
         "Frontcourt players now launch a quarter of league threes, confirming the rise of stretch "
         "bigs. Simultaneously, long midrange jumpers nearly disappeared as three-point share doubled."
     )
-    page6.draw_paragraph(80, 690, text6, max_chars=95)
+    page6.draw_paragraph(80, 690, text6)
     draw_position_share(page6, left=80, bottom=360, width=450, height=220)
-    draw_shot_profile(page6, left=80, bottom=80, width=450, height=220)
+    draw_shot_profile(page6, left=80, bottom=70, width=450, height=220)
     doc.add_page(page6)
 
     # Page 7: Adoption timing & next steps
@@ -626,26 +704,77 @@ def build_document() -> PDFDocument:
         "early adopters like the 2017 Rockets and 2019 Bucks pairing high volume with elite "
         "net ratings. We will expand this view with filters and narrative callouts in Chapter 4."
     )
-    y = page7.draw_paragraph(80, 690, text7, max_chars=95)
+    y = page7.draw_paragraph(80, 690, text7)
     draw_team_adoption(page7, left=80, bottom=320, width=450, height=260)
-    y = 290
+    y = 260
     roadmap = (
         "Next steps: ingest salary data to tie compensation to shooting gravity, build interactive "
         "prototype (scrollytelling with pinned annotations), and pre-aggregate shot coordinate "
         "data for court heatmaps. Risks include managing five million shot rows in-browser and "
         "keeping scope disciplined."
     )
-    page7.draw_paragraph(80, y, roadmap, max_chars=95)
+    page7.draw_paragraph(80, y, roadmap)
     doc.add_page(page7)
 
     return doc
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Render the design document PDF.")
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Flate-compress content streams and use object/xref streams (PDF 1.5)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="write each page to disk as soon as it is laid out (PDFStreamWriter)",
+    )
+    parser.add_argument(
+        "--figures",
+        action="store_true",
+        help="also write the SVG figures from the same cached chart specs",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="record per-stage wall/CPU time and tracemalloc peaks (also $VIZ_PROFILE); "
+        "report defaults to reports/profile/build_pdf.json",
+    )
+    args = parser.parse_args(argv)
+
+    report_path = profile_path(args.profile, "build_pdf")
+    if report_path is not None:
+        PROFILER.start()
+        with stage("load"):
+            load_inputs()
+        with stage("aggregate"):
+            for spec in CHART_SPECS.values():
+                spec()
+
     pdf_path = DOCS_DIR / "design_doc.pdf"
-    doc = build_document()
-    doc.save(pdf_path)
+    if args.stream:
+        with PDFStreamWriter(pdf_path, compress=args.compress) as writer:
+            # Pages are written as they are added, so "layout" includes their output.
+            with stage("layout"):
+                build_document(writer)
+    else:
+        with stage("layout"):
+            doc = build_document()
+        doc.save(pdf_path, compress=args.compress)
     print(f"Wrote {pdf_path}")
+    if args.figures:
+        from make_charts import CHART_BUILDERS, FIGURE_DIR
+
+        for build in CHART_BUILDERS.values():
+            build()
+        print(f"Wrote {len(CHART_BUILDERS)} figures to {FIGURE_DIR}")
+    if report_path is not None:
+        PROFILER.finish("build_pdf", report_path)
 
 
 if __name__ == "__main__":
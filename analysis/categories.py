@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple
+
+from ingest import Table
+
+
+class Vocabulary:
+    """Append-only string dictionary; codes are assigned in first-seen order."""
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+# Each abbreviation's successor after a relocation or rename, following
+# Basketball-Reference's franchise histories. Abbreviations not listed here
+# are their own (current or defunct) franchise.
+FRANCHISE_SUCCESSORS: Dict[str, str] = {
+    "PHW": "SFW", "SFW": "GSW",
+    "MNL": "LAL",
+    "FTW": "DET",
+    "ROC": "CIN", "CIN": "KCO", "KCO": "KCK", "KCK": "SAC",
+    "TRI": "MLH", "MLH": "STL", "STL": "ATL",
+    "SYR": "PHI",
+    "CHP": "CHZ", "CHZ": "BAL", "BAL": "CAP", "CAP": "WSB", "WSB": "WAS",
+    "SDR": "HOU",
+    "BUF": "SDC", "SDC": "LAC",
+    "NOJ": "UTA",
+    "SEA": "OKC",
+    "VAN": "MEM",
+    "NJA": "NYA", "NYA": "NYN", "NYN": "NJN", "NJN": "BRK",
+    "CHH": "CHO", "CHA": "CHO",
+    "NOH": "NOP", "NOK": "NOP",
+    "INA": "IND",
+    "DNR": "DNA", "DNA": "DEN",
+    "DLC": "SAA", "TEX": "SAA", "SAA": "SAS",
+    "ANA": "LAS", "LAS": "UTS",
+    "OAK": "WSA", "WSA": "VIR",
+    "HSM": "CAR", "CAR": "SSL",
+    "NOB": "MMP", "MMP": "MMT", "MMT": "MMS",
+    "PTP": "PTC", "MNP": "PTC",
+    "MNM": "MMF", "MMF": "FLO",
+    "SDA": "SDS",
+}
+
+
+class TeamDirectory:
+    """Season-by-season team names and abbreviations from ``Team Abbrev.csv``."""
+
+    def __init__(self, table: Table) -> None:
+        self.abbreviations: Dict[Tuple[int, str], str] = {}
+        self.names: Dict[Tuple[int, str], str] = {}
+        self.latest: Dict[str, Tuple[int, str]] = {}
+        for season, name, abbreviation in zip(table["season"], table["team"], table["abbreviation"]):
+            self.abbreviations[season, name] = abbreviation
+            self.names[season, abbreviation] = name
+            if season >= self.latest.get(abbreviation, (0, ""))[0]:
+                self.latest[abbreviation] = (season, name)
+
+    def identify(self, season: int, team: str) -> Tuple[str, str]:
+        """(abbreviation, name) for a team given by either; rows such as ``League Average`` get no abbreviation."""
+        if (season, team) in self.names:
+            return team, self.names[season, team]
+        return self.abbreviations.get((season, team), ""), team
+
+    def franchise(self, season: int, team: str) -> str:
+        """The franchise's last abbreviation (``SEA`` in 2005 -> ``OKC``); "" for non-team rows."""
+        abbreviation = self.identify(season, team)[0]
+        while abbreviation in FRANCHISE_SUCCESSORS:
+            abbreviation = FRANCHISE_SUCCESSORS[abbreviation]
+        return abbreviation
+
+    def franchise_name(self, franchise: str) -> str:
+        """The name a franchise played under most recently."""
+        return self.latest[franchise][1]
+
+
+class TeamVocabulary:
+    """Shared team codes for emitted artifacts, one per (abbreviation, name) pair.
+
+    A code identifies a team as it was listed in one season, not a
+    franchise: the Seattle SuperSonics and the Oklahoma City Thunder get
+    different codes, and ``to_json`` carries no franchise id. Franchise
+    lineage is ``TeamDirectory.franchise`` (via ``FRANCHISE_SUCCESSORS``).
+    """
+
+    def __init__(self, directory: TeamDirectory) -> None:
+        self.directory = directory
+        self.entries = Vocabulary()
+        self.abbreviation: List[str] = []
+        self.name: List[str] = []
+
+    def code(self, season: int, team: str) -> int:
+        abbreviation, name = self.directory.identify(season, team)
+        code = self.entries.code(f"{abbreviation}\t{name}")
+        if code == len(self.abbreviation):
+            self.abbreviation.append(abbreviation)
+            self.name.append(name)
+        return code
+
+    def to_json(self) -> Dict[str, List[str]]:
+        return {"abbreviation": self.abbreviation, "name": self.name}
@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from series import SeasonSeries
+from trends import Breakpoint, series_changepoints
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+ANALYSIS_DIR = BASE_DIR / "analysis"
+
+Point = Tuple[float, float]
+Tick = Tuple[float, str]  # (position in [0, 1], label)
+
+BLUE = "#1f77b4"
+ORANGE = "#ff7f0e"
+GREEN = "#2ca02c"
+RED = "#d62728"
+PURPLE = "#9467bd"
+BROWN = "#8c564b"
+GRAY = "#7f7f7f"
+
+
+class Scale:
+    """Linear map from a data domain onto the unit interval."""
+
+    __slots__ = ("lo", "hi")
+
+    def __init__(self, lo: float, hi: float) -> None:
+        self.lo = lo
+        self.hi = hi
+
+    def __call__(self, value: float) -> float:
+        if math.isclose(self.hi, self.lo):
+            return 0.0
+        return (value - self.lo) / (self.hi - self.lo)
+
+    def ticks(self, count: int, fmt: str) -> List[Tick]:
+        """``count + 1`` evenly spaced ticks across the domain."""
+        return [
+            (i / count, fmt.format(self.lo + (self.hi - self.lo) * i / count)) for i in range(count + 1)
+        ]
+
+
+def season_ticks(scale: Scale, seasons: Sequence[int], max_ticks: int = 10) -> List[Tick]:
+    """Every n-th season (plus the last) so that at most ~``max_ticks`` are labelled."""
+    step = max(1, len(seasons) // max_ticks)
+    return [
+        (scale(season), str(season))
+        for i, season in enumerate(seasons)
+        if i % step == 0 or season == seasons[-1]
+    ]
+
+
+class Axis:
+    def __init__(self, label: str, ticks: List[Tick], grid: bool = False) -> None:
+        self.label = label
+        self.ticks = ticks
+        self.grid = grid
+
+
+class Mark:
+    """A polyline (``kind="line"``) or dot markers (``kind="dots"``) in unit coordinates.
+
+    ``width`` is the stroke width for lines and the marker diameter for dots;
+    ``dash`` uses SVG dasharray syntax ("6 4"). Marks with a label get a legend entry.
+    """
+
+    __slots__ = ("kind", "points", "color", "label", "width", "dash", "tips")
+
+    def __init__(
+        self,
+        kind: str,
+        points: List[Point],
+        color: str,
+        label: str = "",
+        width: float = 2.0,
+        dash: Optional[str] = None,
+        tips: Optional[List[str]] = None,
+    ) -> None:
+        self.kind = kind
+        self.points = points
+        self.color = color
+        self.label = label
+        self.width = width
+        self.dash = dash
+        self.tips = tips
+
+
+class Annotation:
+    """A labelled vertical rule at unit position ``x`` (e.g. a detected breakpoint).
+
+    ``row`` stacks labels downward from the top of the panel so that nearby
+    rules do not overprint; ``align`` is "start" (label right of the rule) or "end".
+    """
+
+    __slots__ = ("x", "label", "row", "align", "color")
+
+    def __init__(self, x: float, label: str, row: int = 0, align: str = "start", color: str = GRAY) -> None:
+        self.x = x
+        self.label = label
+        self.row = row
+        self.align = align
+        self.color = color
+
+
+def stacked_annotations(labelled: Sequence[Tuple[float, str]], spacing: float = 0.16) -> List[Annotation]:
+    """Annotations for (x, label) pairs, each in the first row where it clears the previous label."""
+    row_ends: List[float] = []
+    annotations = []
+    for x, label in sorted(labelled):
+        row = next((i for i, end in enumerate(row_ends) if x - end >= spacing), len(row_ends))
+        if row == len(row_ends):
+            row_ends.append(x)
+        row_ends[row] = x
+        annotations.append(Annotation(x, label, row, align="end" if x > 0.75 else "start"))
+    return annotations
+
+
+class Panel:
+    """One plot area: x axis, left (and optional right) y axis, its marks and annotations."""
+
+    def __init__(
+        self,
+        x_axis: Axis,
+        y_axis: Axis,
+        marks: List[Mark],
+        y2_axis: Optional[Axis] = None,
+        title: str = "",
+        annotations: Optional[List[Annotation]] = None,
+    ) -> None:
+        self.x_axis = x_axis
+        self.y_axis = y_axis
+        self.marks = marks
+        self.y2_axis = y2_axis
+        self.title = title
+        self.annotations = annotations or []
+
+
+class ChartSpec:
+    """Backend-agnostic chart: every coordinate is a fraction of its panel (y up).
+
+    Backends only map the unit square onto their own plot box, so the SVG
+    figures and the PDF pages share one set of scales, ticks and paths.
+    ``shared_y`` panels label the y axis on the first panel only.
+    """
+
+    def __init__(self, title: str, panels: List[Panel], x_label: str = "", shared_y: bool = False) -> None:
+        self.title = title
+        self.panels = panels
+        self.x_label = x_label
+        self.shared_y = shared_y
+
+    @property
+    def legend(self) -> List[Mark]:
+        seen: Dict[str, Mark] = {}
+        for panel in self.panels:
+            for mark in panel.marks:
+                if mark.label:
+                    seen.setdefault(mark.label, mark)
+        return list(seen.values())
+
+    @property
+    def has_right_axis(self) -> bool:
+        return any(panel.y2_axis is not None for panel in self.panels)
+
+
+@lru_cache(maxsize=None)
+def hex_rgb(color: str) -> Tuple[float, float, float]:
+    """'#rrggbb' as 0-1 floats for PDF colour operators."""
+    return tuple(int(color[i : i + 2], 16) / 255 for i in (1, 3, 5))
+
+
+@lru_cache(maxsize=None)
+def load_json(name: str):
+    """Parse an analysis JSON on first use; callers must treat the result as read-only."""
+    return json.loads((ANALYSIS_DIR / name).read_text())
+
+
+@lru_cache(maxsize=None)
+def league_trend() -> SeasonSeries:
+    return SeasonSeries.from_records(load_json("league_3pa_trend.json")).scaled("avg_3p_percent", 100.0)
+
+
+@lru_cache(maxsize=None)
+def league_trend_breaks() -> Tuple[Breakpoint, ...]:
+    """Changepoints of league 3PA since 1979, found once per loaded JSON rather than per render."""
+    return tuple(series_changepoints(league_trend().since(1979), "avg_3pa_per_game"))
+
+
+@lru_cache(maxsize=None)
+def curry_series() -> Tuple[SeasonSeries, SeasonSeries]:
+    data = load_json("curry_vs_league.json")
+    return (
+        SeasonSeries.from_records(data["curry"]),
+        SeasonSeries.from_records(data["league_avg_player_3pa_per_game"]),
+    )
+
+
+@lru_cache(maxsize=None)
+def position_shares() -> SeasonSeries:
+    return SeasonSeries.from_records(load_json("position_3pa_shares.json"))
+
+
+@lru_cache(maxsize=None)
+def shot_profile() -> SeasonSeries:
+    return SeasonSeries.from_records(load_json("shot_profile_trends.json"))
+
+
+def volume_efficiency() -> dict:
+    """Snapshot season -> team records, decoded from the columnar team-coded JSON."""
+    encoded = load_json("volume_vs_efficiency.json")
+    names = encoded["teams"]["name"]
+    panels = {}
+    for season, panel in encoded["snapshots"].items():
+        panels[season] = [
+            {"team": names[code], "season": int(season), **{field: panel[field][i] for field in panel if field != "team"}}
+            for i, code in enumerate(panel["team"])
+        ]
+    return panels
+
+
+def team_adoption() -> List[dict]:
+    return load_json("team_adoption_threshold.json")
+
+
+def load_inputs() -> None:
+    """Parse every chart input up front (the specs would otherwise load them on first use)."""
+    league_trend()
+    curry_series()
+    position_shares()
+    shot_profile()
+    volume_efficiency()
+    team_adoption()
+
+
+def peak(series: SeasonSeries, field: str) -> float:
+    return max(value for _, value in series.pairs(field))
+
+
+def line_points(series: SeasonSeries, field: str, x: Scale, y: Scale) -> List[Point]:
+    return [(x(season), y(value)) for season, value in series.pairs(field)]
+
+
+@lru_cache(maxsize=None)
+def league_trend_spec() -> ChartSpec:
+    trend = league_trend().since(1979)
+    x = Scale(trend.seasons[0], trend.seasons[-1])
+    attempts = Scale(0.0, peak(trend, "avg_3pa_per_game") * 1.05)
+    accuracy = Scale(20.0, peak(trend, "avg_3p_percent") * 1.05)
+    panel = Panel(
+        Axis("", season_ticks(x, trend.seasons)),
+        Axis("League 3PA per game", attempts.ticks(5, "{:.0f}"), grid=True),
+        [
+            Mark("line", line_points(trend, "avg_3pa_per_game", x, attempts), BLUE, "League 3PA per game", 2.5),
+            Mark("line", line_points(trend, "avg_3p_percent", x, accuracy), RED, "League 3P%", 2.5, dash="6 4"),
+        ],
+        y2_axis=Axis("League 3P%", accuracy.ticks(5, "{:.0f}")),
+        annotations=stacked_annotations(
+            [(x(point.season), point.label) for point in league_trend_breaks()]
+        ),
+    )
+    return ChartSpec("League Three-Point Attempts and Efficiency Over Time", [panel])
+
+
+@lru_cache(maxsize=None)
+def curry_vs_league_spec() -> ChartSpec:
+    curry, league = curry_series()
+    field = "avg_player_3pa_per_game"
+    seasons = [season for season, _ in curry.pairs("x3pa_per_game") if league.get(season, field) is not None]
+    curry = curry.where(seasons.__contains__)
+    league = league.where(seasons.__contains__)
+    x = Scale(seasons[0], seasons[-1])
+    curry_y = Scale(0.0, peak(curry, "x3pa_per_game") * 1.1)
+    league_y = Scale(0.0, peak(league, field) * 1.1)
+    panel = Panel(
+        Axis("", season_ticks(x, seasons)),
+        Axis("Curry 3PA per game", curry_y.ticks(5, "{:.0f}"), grid=True),
+        [
+            Mark("line", line_points(curry, "x3pa_per_game", x, curry_y), ORANGE, "Curry 3PA per game", 2.5),
+            Mark("line", line_points(league, field, x, league_y), BLUE, "League average 3PA per player", 2.5, "6 4"),
+        ],
+        y2_axis=Axis("League average 3PA per player", league_y.ticks(5, "{:.1f}")),
+    )
+    return ChartSpec("Stephen Curry vs. League Three-Point Volume", [panel])
+
+
+POSITION_COLORS = {"PG": BLUE, "SG": RED, "SF": GREEN, "PF": PURPLE, "C": BROWN}
+
+
+@lru_cache(maxsize=None)
+def position_share_spec() -> ChartSpec:
+    shares = position_shares().since(1997)
+    x = Scale(shares.seasons[0], shares.seasons[-1])
+    y = Scale(0.0, 1.0)
+    panel = Panel(
+        Axis("", season_ticks(x, shares.seasons)),
+        Axis("Share of league 3PA", y.ticks(5, "{:.0%}"), grid=True),
+        [
+            Mark("line", line_points(shares, f"share_{pos}", x, y), color, pos)
+            for pos, color in POSITION_COLORS.items()
+        ],
+    )
+    return ChartSpec("Share of League 3PA by Position", [panel])
+
+
+@lru_cache(maxsize=None)
+def shot_profile_spec() -> ChartSpec:
+    profile = (
+        shot_profile()
+        .since(1997)
+        .scaled("percent_fga_from_x3p_range", 100, into="three")
+        .scaled("percent_fga_from_x10_16_range", 100, into="mid")
+        .scaled("percent_fga_from_x16_3p_range", 100, into="long_mid")
+    )
+    x = Scale(profile.seasons[0], profile.seasons[-1])
+    y = Scale(0.0, peak(profile, "three") * 1.05)
+    panel = Panel(
+        Axis("", season_ticks(x, profile.seasons)),
+        Axis("Share of FGA", y.ticks(5, "{:.0f}%"), grid=True),
+        [
+            Mark("line", line_points(profile, "three", x, y), BLUE, "Above-the-arc 3PA share", 2.5),
+            Mark("line", line_points(profile, "long_mid", x, y), PURPLE, "Long midrange (16ft-3pt)", dash="3 3"),
+            Mark("line", line_points(profile, "mid", x, y), RED, "Classic midrange (10-16ft)", dash="6 4"),
+        ],
+    )
+    return ChartSpec("Shot Selection Migration", [panel])
+
+
+@lru_cache(maxsize=None)
+def volume_efficiency_spec() -> ChartSpec:
+    panels_data = sorted(volume_efficiency().items())
+    points = [point for _, season_points in panels_data for point in season_points]
+    x = Scale(0.0, max(point["x3pa_per_game"] for point in points) * 1.1)
+    y = Scale(
+        min(point["x3p_percent"] for point in points) * 0.95,
+        max(point["x3p_percent"] for point in points) * 1.05,
+    )
+    x_ticks = x.ticks(4, "{:.0f}")
+    y_axis = Axis("3P%", y.ticks(4, "{:.3f}"), grid=True)
+    panels = [
+        Panel(
+            Axis("", x_ticks),
+            y_axis,
+            [
+                Mark(
+                    "dots",
+                    [(x(point["x3pa_per_game"]), y(point["x3p_percent"])) for point in season_points],
+                    BLUE,
+                    width=5.0,
+                    tips=[
+                        f"{point['team']}\n3PA: {point['x3pa_per_game']:.1f}\n3P%: {point['x3p_percent']:.3f}"
+                        for point in season_points
+                    ],
+                )
+            ],
+            title=f"Season {season}",
+        )
+        for season, season_points in panels_data
+    ]
+    return ChartSpec("3PA Volume vs Efficiency Snapshots", panels, x_label="3PA per game", shared_y=True)
+
+
+@lru_cache(maxsize=None)
+def team_adoption_spec() -> ChartSpec:
+    rated = [rec for rec in team_adoption() if rec["net_rating"] is not None]
+    seasons = [rec["season"] for rec in rated]
+    nets = [rec["net_rating"] for rec in rated]
+    x = Scale(min(seasons) - 1, max(seasons) + 1)
+    y = Scale(min(nets) - 1, max(nets) + 1)
+    panel = Panel(
+        Axis("", season_ticks(x, list(range(min(seasons), max(seasons) + 1)))),
+        Axis("Net rating that season", y.ticks(5, "{:.1f}"), grid=True),
+        [
+            Mark(
+                "dots",
+                [(x(rec["season"]), y(rec["net_rating"])) for rec in rated],
+                GREEN,
+                width=6.0,
+                tips=[f"{rec['team']}\nSeason: {rec['season']}\nNet Rating: {rec['net_rating']:.1f}" for rec in rated],
+            )
+        ],
+    )
+    return ChartSpec(
+        "When Teams Crossed the 40% 3PA Threshold",
+        [panel],
+        x_label="Season the team first took 40% of its shots from three",
+    )
+
+
+CHART_SPECS: Dict[str, Callable[[], ChartSpec]] = {
+    "league_trend": league_trend_spec,
+    "curry_vs_league": curry_vs_league_spec,
+    "position_share": position_share_spec,
+    "shot_profile": shot_profile_spec,
+    "volume_vs_efficiency": volume_efficiency_spec,
+    "team_adoption": team_adoption_spec,
+}
+
+
+def clear_caches(keep_json: bool = False) -> None:
+    """Forget memoized series and specs, e.g. after ANALYSIS_DIR is pointed at other data."""
+    if not keep_json:
+        load_json.cache_clear()
+        league_trend_breaks.cache_clear()
+    for memoized in (league_trend, curry_series, position_shares, shot_profile, *CHART_SPECS.values()):
+        memoized.cache_clear()
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import math
+import mmap
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+ANALYSIS_DIR = BASE_DIR / "analysis"
+CACHE_DIR = ANALYSIS_DIR / ".cache"
+
+MISSING = frozenset({"", "NA"})
+CACHE_MAGIC = b"VWCOL01\n"
+CACHE_SUFFIX = ".col"
+ALIGNMENT = 8
+
+# Column kind -> array typecode used both in memory and in the cache file.
+TYPECODES = {"int": "q", "float": "d", "str": "i"}
+
+
+class Column:
+    """A typed column: int64, float64 (NaN for blanks) or dictionary-coded strings."""
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        values: Union[array, memoryview],
+        dictionary: Optional[List[str]] = None,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.values = values
+        self.dictionary = dictionary
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int):
+        value = self.values[index]
+        if self.dictionary is not None:
+            return self.dictionary[value]
+        return value
+
+    def __iter__(self) -> Iterator:
+        if self.dictionary is not None:
+            lookup = self.dictionary
+            return (lookup[code] for code in self.values)
+        return iter(self.values)
+
+    @property
+    def codes(self) -> Union[array, memoryview]:
+        """Integer codes of a string column (indexes into ``dictionary``)."""
+        if self.dictionary is None:
+            raise TypeError(f"Column {self.name!r} is not dictionary-coded")
+        return self.values
+
+    def to_list(self) -> list:
+        return list(self)
+
+
+class Table:
+    """Column-oriented view of one CSV file."""
+
+    def __init__(self, name: str, columns: Sequence[Column]) -> None:
+        self.name = name
+        self.columns: Dict[str, Column] = {col.name: col for col in columns}
+        self.num_rows = len(columns[0]) if columns else 0
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def rows(self) -> Iterator[dict]:
+        """Yield decoded rows as dictionaries (slow path, for ad-hoc use)."""
+        names = self.column_names
+        for values in zip(*(self.columns[name] for name in names)):
+            yield dict(zip(names, values))
+
+
+def is_missing(value) -> bool:
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _build_column(name: str, raw: List[str]) -> Column:
+    has_missing = any(value in MISSING for value in raw)
+    if not has_missing:
+        try:
+            return Column(name, "int", array("q", [int(value) for value in raw]))
+        except (ValueError, OverflowError):
+            pass
+    try:
+        return Column(
+            name,
+            "float",
+            array("d", [math.nan if value in MISSING else float(value) for value in raw]),
+        )
+    except ValueError:
+        pass
+
+    dictionary: List[str] = []
+    lookup: Dict[str, int] = {}
+    codes = array("i")
+    for value in raw:
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(dictionary)
+            dictionary.append(value)
+        codes.append(code)
+    return Column(name, "str", codes, dictionary)
+
+
+def parse_csv(path: Path) -> Table:
+    """Tokenize a CSV once and convert every column to its narrowest type."""
+    with path.open(newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        header = next(reader)
+        raw_columns: List[List[str]] = [[] for _ in header]
+        for row in reader:
+            for values, value in zip(raw_columns, row):
+                values.append(value)
+    return Table(path.name, [_build_column(name, raw) for name, raw in zip(header, raw_columns)])
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_stamp(path: Path, digest: Optional[str] = None) -> dict:
+    stat = path.stat()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest if digest is not None else file_digest(path),
+    }
+
+
+def cache_path_for(path: Path) -> Path:
+    return CACHE_DIR / (path.stem + CACHE_SUFFIX)
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_cache(table: Table, stamp: dict, cache_path: Path) -> None:
+    """Persist a table as aligned raw column buffers behind a JSON header."""
+    blobs = [bytes(memoryview(col.values).cast("B")) for col in table.columns.values()]
+    layout = []
+    offset = 0
+    for col, blob in zip(table.columns.values(), blobs):
+        entry = {"name": col.name, "kind": col.kind, "offset": offset, "nbytes": len(blob)}
+        if col.dictionary is not None:
+            entry["dictionary"] = col.dictionary
+        layout.append(entry)
+        offset = _align(offset + len(blob))
+
+    header = json.dumps(
+        {
+            "source": table.name,
+            "rows": table.num_rows,
+            "byteorder": sys.byteorder,
+            "stamp": stamp,
+            "columns": layout,
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+    data_start = _align(len(CACHE_MAGIC) + 8 + len(header))
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    with tmp_path.open("wb") as fh:
+        fh.write(CACHE_MAGIC)
+        fh.write(struct.pack("<Q", len(header)))
+        fh.write(header)
+        for entry, blob in zip(layout, blobs):
+            fh.write(b"\0" * (data_start + entry["offset"] - fh.tell()))
+            fh.write(blob)
+    tmp_path.replace(cache_path)
+
+
+def _read_header(cache_path: Path) -> Optional[dict]:
+    try:
+        with cache_path.open("rb") as fh:
+            if fh.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                return None
+            (length,) = struct.unpack("<Q", fh.read(8))
+            header = json.loads(fh.read(length).decode("utf-8"))
+    except (OSError, ValueError, struct.error):
+        return None
+    header["data_start"] = _align(len(CACHE_MAGIC) + 8 + length)
+    return header
+
+
+def open_cache(cache_path: Path, header: dict) -> Table:
+    """Map a cache file and expose its columns as zero-copy memoryviews."""
+    with cache_path.open("rb") as fh:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapped)
+    start = header["data_start"]
+    columns = []
+    for entry in header["columns"]:
+        begin = start + entry["offset"]
+        values = buffer[begin : begin + entry["nbytes"]].cast(TYPECODES[entry["kind"]])
+        columns.append(Column(entry["name"], entry["kind"], values, entry.get("dictionary")))
+    return Table(header["source"], columns)
+
+
+def resolve_source(source: Union[str, Path]) -> Path:
+    path = Path(source)
+    if not path.is_absolute():
+        path = BASE_DIR / path
+    if path.suffix != ".csv":
+        path = path.with_name(path.name + ".csv")
+    return path
+
+
+_TABLES: Dict[Path, Table] = {}
+
+
+def load_table(source: Union[str, Path], use_cache: bool = True) -> Table:
+    """Load a CSV as a columnar Table, reusing the binary cache when it is fresh.
+
+    The cache is trusted when the CSV's size and mtime match the recorded stamp.
+    If only the mtime moved, the content hash decides whether to reparse.
+    """
+    path = resolve_source(source)
+    if not use_cache:
+        return parse_csv(path)
+    if path in _TABLES:
+        return _TABLES[path]
+
+    cache_path = cache_path_for(path)
+    header = _read_header(cache_path)
+    stat = path.stat()
+    table: Optional[Table] = None
+    if header is not None and header.get("byteorder") == sys.byteorder:
+        stamp = header["stamp"]
+        if stamp["size"] == stat.st_size and stamp["mtime_ns"] == stat.st_mtime_ns:
+            table = open_cache(cache_path, header)
+        elif stamp["size"] == stat.st_size:
+            digest = file_digest(path)
+            if digest == stamp["sha256"]:
+                table = open_cache(cache_path, header)
+                write_cache(table, _source_stamp(path, digest), cache_path)
+
+    if table is None:
+        table = parse_csv(path)
+        write_cache(table, _source_stamp(path), cache_path)
+        table = open_cache(cache_path, _read_header(cache_path))
+
+    _TABLES[path] = table
+    return table
+
+
+def source_csvs() -> List[Path]:
+    return sorted(BASE_DIR.glob("*.csv"))
+
+
+def main() -> None:
+    for path in source_csvs():
+        start = time.perf_counter()
+        table = load_table(path)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{path.name}: {table.num_rows} rows x {len(table.columns)} columns in {elapsed:.1f} ms")
+    print("Column cache ready in", CACHE_DIR)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,505 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import time
+import unicodedata
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from aggregate import Agg, group_by
+from categories import TeamDirectory, TeamVocabulary, Vocabulary
+from ingest import CACHE_DIR, Table, file_digest, is_missing, load_table, resolve_source
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+ANALYSIS_DIR = BASE_DIR / "analysis"
+MANIFEST_PATH = CACHE_DIR / "manifest.json"
+
+Builder = Callable[[Dict[str, Table]], object]
+
+
+class Target:
+    """One derived JSON artifact: its source CSVs, code version and builder.
+
+    A ``sharded`` target's output is a directory; its builder returns a mapping
+    of file name to JSON data. ``compact`` outputs are written without
+    indentation (for columnar artifacts, where one number per line doubles the size).
+    """
+
+    def __init__(
+        self,
+        output: str,
+        inputs: Sequence[str],
+        version: int,
+        builder: Builder,
+        sharded: bool = False,
+        compact: bool = False,
+    ) -> None:
+        self.output = output
+        self.inputs = list(inputs)
+        self.version = version
+        self.builder = builder
+        self.sharded = sharded
+        self.compact = compact
+
+    @property
+    def path(self) -> Path:
+        return ANALYSIS_DIR / self.output
+
+
+TARGETS: Dict[str, Target] = {}
+
+
+def target(
+    output: str, inputs: Sequence[str], version: int = 1, sharded: bool = False, compact: bool = False
+) -> Callable[[Builder], Builder]:
+    """Register a builder; bump ``version`` whenever its aggregation logic changes."""
+
+    def register(builder: Builder) -> Builder:
+        TARGETS[output] = Target(output, inputs, version, builder, sharded, compact)
+        return builder
+
+    return register
+
+
+def write_json(path: Path, data: object, compact: bool = False) -> None:
+    if compact:
+        path.write_text(json.dumps(data, separators=(",", ":")))
+    else:
+        path.write_text(json.dumps(data, indent=2))
+
+
+def write_shards(directory: Path, files: Dict[str, object]) -> None:
+    """Write compact JSON shards into ``directory``, removing shards a previous build left behind."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.json"):
+        if stale.name not in files:
+            stale.unlink()
+    for name, data in files.items():
+        (directory / name).write_text(json.dumps(data, separators=(",", ":")))
+
+
+def optional(value: float) -> Optional[float]:
+    return None if is_missing(value) else value
+
+
+def season_means(table: Table, fields: Sequence[str], min_season: int = 0) -> List[dict]:
+    """Per-season mean of each field, ignoring blanks (seasons with no data dropped).
+
+    ``group_by`` means are exactly rounded, so results do not depend on row order.
+    """
+    seasons = table["season"]
+    rows = [i for i, season in enumerate(seasons) if season >= min_season] if min_season else None
+    return group_by(table, "season", {field: Agg(field) for field in fields}, rows=rows).records()
+
+
+@target("league_3pa_trend.json", ["Team Stats Per Game.csv"])
+def build_league_trend(tables: Dict[str, Table]) -> object:
+    aggs = {"avg_3pa_per_game": Agg("x3pa_per_game"), "avg_3p_percent": Agg("x3p_percent")}
+    return group_by(tables["Team Stats Per Game.csv"], "season", aggs).records()
+
+
+@target("volume_vs_efficiency.json", ["Team Stats Per Game.csv", "Team Abbrev.csv"], version=2)
+def build_volume_efficiency(tables: Dict[str, Table]) -> object:
+    """Team 3PA volume vs accuracy for four snapshot seasons.
+
+    Each snapshot is columnar; its ``team`` column holds codes into the shared
+    ``teams`` dictionary (abbreviation and name, via Team Abbrev.csv).
+    """
+    table = tables["Team Stats Per Game.csv"]
+    teams = TeamVocabulary(TeamDirectory(tables["Team Abbrev.csv"]))
+    snapshots = (2000, 2010, 2020, 2025)
+    fields = ("x3pa_per_game", "x3p_percent", "pts_per_game")
+    panels: Dict[str, Dict[str, list]] = {
+        str(season): {"team": [], **{field: [] for field in fields}} for season in snapshots
+    }
+    columns = [table[name] for name in ("season", "team") + fields]
+    for season, team, *values in zip(*columns):
+        if season in snapshots:
+            panel = panels[str(season)]
+            panel["team"].append(teams.code(season, team))
+            for field, value in zip(fields, values):
+                panel[field].append(optional(value))
+    return {"teams": teams.to_json(), "snapshots": panels}
+
+
+@target("team_adoption_threshold.json", ["Team Summaries.csv"])
+def build_team_adoption(tables: Dict[str, Table], threshold: float = 0.40) -> object:
+    table = tables["Team Summaries.csv"]
+    columns = [table[name] for name in ("season", "team", "x3p_ar", "w", "n_rtg")]
+    first_seasons: Dict[str, dict] = {}
+    for index in sorted(range(len(table)), key=lambda i: columns[0][i]):
+        season, team, rate, wins, net = (column[index] for column in columns)
+        if team in first_seasons or math.isnan(rate) or rate < threshold:
+            continue
+        first_seasons[team] = {
+            "team": team,
+            "season": season,
+            "x3p_ar": rate,
+            "wins": None if is_missing(wins) else int(wins),
+            "net_rating": optional(net),
+        }
+    return sorted(first_seasons.values(), key=lambda rec: rec["season"])
+
+
+@target("shot_profile_trends.json", ["Player Shooting.csv"])
+def build_shot_profile(tables: Dict[str, Table]) -> object:
+    fields = [
+        "percent_fga_from_x2p_range",
+        "percent_fga_from_x0_3_range",
+        "percent_fga_from_x3_10_range",
+        "percent_fga_from_x10_16_range",
+        "percent_fga_from_x16_3p_range",
+        "percent_fga_from_x3p_range",
+        "avg_dist_fga",
+    ]
+    return season_means(tables["Player Shooting.csv"], fields, min_season=1997)
+
+
+def primary_position(pos: str) -> str:
+    """Collapse combo positions (e.g. ``SG-PG``) to the listed primary role."""
+    return pos.split("-")[0] if pos else "NA"
+
+
+def is_multi_team(team: str) -> bool:
+    """True for combined rows of traded players (``TOT`` or ``2TM``/``3TM``/...)."""
+    return team == "TOT" or (team.endswith("TM") and team[:-2].isdigit())
+
+
+def preferred_rows(table: Table) -> List[int]:
+    """Row indexes with one entry per player-season, preferring the combined row for traded players.
+
+    Keys are (season, player_id code) pairs and the multi-team test runs once
+    per distinct team label, not once per row.
+    """
+    chosen: Dict[tuple, int] = {}
+    seasons, player_ids, teams = table["season"], table["player_id"].codes, table["team"]
+    combined = {code for code, team in enumerate(teams.dictionary) if is_multi_team(team)}
+    team_codes = teams.codes
+    for index in range(len(table)):
+        key = (seasons[index], player_ids[index])
+        if key not in chosen or team_codes[index] in combined:
+            chosen[key] = index
+    return sorted(chosen.values())
+
+
+@target("curry_vs_league.json", ["Player Per Game.csv"])
+def build_curry_vs_league(tables: Dict[str, Table]) -> object:
+    table = tables["Player Per Game.csv"]
+    rows = preferred_rows(table)
+    seasons, player_ids, teams = table["season"], table["player_id"], table["team"]
+    attempts, percent = table["x3pa_per_game"], table["x3p_percent"]
+
+    curry = [
+        {
+            "season": seasons[i],
+            "team": teams[i],
+            "x3pa_per_game": optional(attempts[i]),
+            "x3p_percent": optional(percent[i]),
+        }
+        for i in rows
+        if player_ids[i] == "curryst01"
+    ]
+
+    totals: Dict[int, float] = defaultdict(float)
+    counts: Dict[int, int] = defaultdict(int)
+    for i in rows:
+        if not math.isnan(attempts[i]):
+            totals[seasons[i]] += attempts[i]
+            counts[seasons[i]] += 1
+    league = [
+        {"season": season, "avg_player_3pa_per_game": totals[season] / counts[season]}
+        for season in sorted(counts)
+    ]
+    return {"curry": sorted(curry, key=lambda rec: rec["season"]), "league_avg_player_3pa_per_game": league}
+
+
+@target("player_3pa_seasons.json", ["Player Per Game.csv"], compact=True)
+def build_player_3pa_seasons(tables: Dict[str, Table]) -> object:
+    """Columnar per-player 3PA/3P% by season for the Curry comparison picker.
+
+    One row per player-season (the combined row for traded players), only where
+    both values are recorded. Player ``k`` owns rows ``offsets[k]:offsets[k + 1]``
+    of the season/value columns, in season order.
+    """
+    table = tables["Player Per Game.csv"]
+    seasons, player_ids, names = table["season"], table["player_id"], table["player"]
+    attempts, percent = table["x3pa_per_game"], table["x3p_percent"]
+    id_codes = player_ids.codes
+
+    by_player: Dict[int, List[int]] = defaultdict(list)
+    for i in preferred_rows(table):
+        if not (math.isnan(attempts[i]) or math.isnan(percent[i])):
+            by_player[id_codes[i]].append(i)
+
+    columns: Dict[str, list] = {
+        "player_id": [],
+        "player": [],
+        "offsets": [0],
+        "season": [],
+        "x3pa_per_game": [],
+        "x3p_percent": [],
+    }
+    for code in sorted(by_player, key=lambda code: player_ids.dictionary[code]):
+        rows = sorted(by_player[code], key=lambda i: seasons[i])
+        columns["player_id"].append(player_ids.dictionary[code])
+        columns["player"].append(names[rows[0]])
+        columns["season"] += [seasons[i] for i in rows]
+        columns["x3pa_per_game"] += [attempts[i] for i in rows]
+        columns["x3p_percent"] += [percent[i] for i in rows]
+        columns["offsets"].append(len(columns["season"]))
+    return columns
+
+
+def _player_attempts(table: Table):
+    rows = preferred_rows(table)
+    totals = group_by(table, "season", {"x3pa": Agg("x3pa", "sum")}, rows=rows)
+    return rows, {season: total for (season,), total in zip(totals.groups, totals["x3pa"]) if total}
+
+
+@target("position_3pa_shares.json", ["Player Totals.csv"])
+def build_position_shares(tables: Dict[str, Table]) -> object:
+    table = tables["Player Totals.csv"]
+    rows, season_totals = _player_attempts(table)
+    shares = group_by(table, ["season", ("pos", primary_position)], {"share": Agg("x3pa", "share")}, rows=rows)
+    by_season: Dict[int, Dict[str, float]] = defaultdict(dict)
+    for (season, pos), share in zip(shares.groups, shares["share"]):
+        if share is not None:
+            by_season[season][f"share_{pos}"] = share
+    return [{"season": season, "total_3pa": total, **by_season[season]} for season, total in sorted(season_totals.items())]
+
+
+def player_share_records(tables: Dict[str, Table]) -> List[dict]:
+    """Per-player share of league 3PA by season, highest average share first."""
+    table = tables["Player Totals.csv"]
+    rows, season_totals = _player_attempts(table)
+    seasons, player_ids = table["season"], table["player_id"]
+    names, positions, attempts = table["player"], table["pos"], table["x3pa"]
+
+    players: Dict[int, dict] = {}
+    for i in rows:
+        if seasons[i] not in season_totals:
+            continue
+        value = 0.0 if math.isnan(attempts[i]) else attempts[i]
+        entry = players.setdefault(
+            player_ids.codes[i],
+            {
+                "player_id": player_ids[i],
+                "player": names[i],
+                "position": primary_position(positions[i]),
+                "seasons": [],
+            },
+        )
+        entry["seasons"].append({"season": seasons[i], "share": value / season_totals[seasons[i]]})
+
+    records = []
+    for entry in players.values():
+        shares = [rec["share"] for rec in entry["seasons"]]
+        records.append({**entry, "avg_share": sum(shares) / len(shares)})
+    return sorted(records, key=lambda rec: rec["avg_share"], reverse=True)
+
+
+PLAYER_SHARE_BUCKETS = 64
+
+
+def shard_player_share(records: List[dict], buckets: int = PLAYER_SHARE_BUCKETS) -> Dict[str, object]:
+    """Split player_share_records into a columnar index plus hashed bucket files.
+
+    ``index.json`` lists every player by ``player_id`` with display name,
+    position (a code into ``positions``), average share, season span and
+    bucket number, which is all the picker needs. ``NN.json`` maps each
+    player_id hashed into bucket NN to its season/share columns (shares
+    rounded to six decimals), so one overlay costs one small fetch. Names are
+    not unique (two Eddie Johnsons overlap in 1982-87), so nothing keys on them.
+    """
+    positions = Vocabulary()
+    index: Dict[str, list] = {
+        "player_id": [],
+        "player": [],
+        "position": [],
+        "avg_share": [],
+        "first_season": [],
+        "last_season": [],
+        "bucket": [],
+    }
+    shards: Dict[int, Dict[str, dict]] = defaultdict(dict)
+    for rec in records:
+        bucket = zlib.crc32(rec["player_id"].encode("utf-8")) % buckets
+        entries = sorted(rec["seasons"], key=lambda entry: entry["season"])
+        index["player_id"].append(rec["player_id"])
+        index["player"].append(rec["player"])
+        index["position"].append(positions.code(rec["position"]))
+        index["avg_share"].append(round(rec["avg_share"], 6))
+        index["first_season"].append(entries[0]["season"])
+        index["last_season"].append(entries[-1]["season"])
+        index["bucket"].append(bucket)
+        shards[bucket][rec["player_id"]] = {
+            "season": [entry["season"] for entry in entries],
+            "share": [round(entry["share"], 6) for entry in entries],
+        }
+    files: Dict[str, object] = {"index.json": {"buckets": buckets, "positions": positions.values, **index}}
+    files.update({f"{bucket:02d}.json": players for bucket, players in sorted(shards.items())})
+    return files
+
+
+@target("player_share", ["Player Totals.csv"], version=3, sharded=True)
+def build_player_share_shards(tables: Dict[str, Table]) -> object:
+    return shard_player_share(player_share_records(tables))
+
+
+# Letters NFKD leaves alone; keep in step with foldName() in viz/js/charts.js.
+NAME_FOLDS = str.maketrans({"ß": "ss", "ð": "d", "đ": "d", "ı": "i", "ł": "l", "ø": "o", "æ": "ae", "œ": "oe"})
+SEARCH_PREFIX = 3
+
+
+def fold_name(name: str) -> str:
+    """Search key for a name: accents stripped, lower case, ``'`` and ``.`` dropped, other punctuation as spaces."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    plain = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower().translate(NAME_FOLDS)
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", re.sub(r"['.]", "", plain)).split())
+
+
+@target("player_search.json", ["Player Career Info.csv"], compact=True)
+def build_player_search(tables: Dict[str, Table]) -> object:
+    """Autocomplete index over every player in the career table.
+
+    Players are ordered most recent first (last season, then career length),
+    so a posting list read front to back is already ranked. ``postings`` maps
+    the first ``prefix`` characters of each name token to the gaps between the
+    ranks of players holding such a token. A query token is resolved through
+    its bucket (or every bucket it prefixes, if shorter) and matches are then
+    confirmed against the folded name, which the viz derives itself rather
+    than downloading a second copy of every name.
+    """
+    table = tables["Player Career Info.csv"]
+    names, player_ids, first, last = table["player"], table["player_id"], table["from"], table["to"]
+    order = sorted(range(len(table)), key=lambda i: (-last[i], first[i], names[i], player_ids[i]))
+
+    columns: Dict[str, list] = {"player_id": [], "player": [], "from": [], "to": []}
+    buckets: Dict[str, List[int]] = defaultdict(list)
+    for rank, i in enumerate(order):
+        key = fold_name(names[i])
+        columns["player_id"].append(player_ids[i])
+        columns["player"].append(names[i])
+        columns["from"].append(first[i])
+        columns["to"].append(last[i])
+        for prefix in sorted({token[:SEARCH_PREFIX] for token in key.split()}):
+            buckets[prefix].append(rank)
+
+    postings = {
+        prefix: [rank - previous for rank, previous in zip(ranks, [0] + ranks[:-1])]
+        for prefix, ranks in sorted(buckets.items())
+    }
+    return {"prefix": SEARCH_PREFIX, **columns, "postings": postings}
+
+
+def load_manifest() -> dict:
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: dict) -> None:
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+class InputHasher:
+    """Content hashes for source files, skipping the re-hash when size and mtime are unchanged."""
+
+    def __init__(self, previous: dict) -> None:
+        self.previous = previous
+        self.current: Dict[str, dict] = {}
+
+    def stamp(self, name: str) -> dict:
+        if name not in self.current:
+            stat = resolve_source(name).stat()
+            old = self.previous.get(name)
+            if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                digest = old["sha256"]
+            else:
+                digest = file_digest(resolve_source(name))
+            self.current[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        return self.current[name]
+
+
+def output_digest(path: Path) -> Optional[str]:
+    try:
+        if path.is_dir():
+            digest = hashlib.sha256()
+            for shard in sorted(path.glob("*.json")):
+                digest.update(shard.name.encode("utf-8") + b"\0" + shard.read_bytes())
+            return digest.hexdigest()
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def is_stale(spec: Target, entry: Optional[dict], hasher: InputHasher) -> bool:
+    if entry is None or entry.get("version") != spec.version:
+        return True
+    if entry.get("output_sha256") != output_digest(spec.path):
+        return True
+    recorded = entry.get("inputs", {})
+    return any(recorded.get(name) != hasher.stamp(name)["sha256"] for name in spec.inputs)
+
+
+def run(names: Optional[Sequence[str]] = None, force: bool = False) -> Dict[str, str]:
+    """Rebuild the selected targets whose inputs, code version or output changed."""
+    manifest = load_manifest()
+    hasher = InputHasher(manifest.get("__sources__", {}))
+    statuses: Dict[str, str] = {}
+    for name in names or list(TARGETS):
+        spec = TARGETS[name]
+        missing = [src for src in spec.inputs if not resolve_source(src).exists()]
+        if missing:
+            statuses[name] = "skipped (missing " + ", ".join(missing) + ")"
+            continue
+        entry = manifest.get(name)
+        if not force and not is_stale(spec, entry, hasher):
+            statuses[name] = "up to date"
+            continue
+
+        start = time.perf_counter()
+        tables = {src: load_table(src) for src in spec.inputs}
+        result = spec.builder(tables)
+        if spec.sharded:
+            write_shards(spec.path, result)
+        else:
+            write_json(spec.path, result, compact=spec.compact)
+        manifest[name] = {
+            "version": spec.version,
+            "inputs": {src: hasher.stamp(src)["sha256"] for src in spec.inputs},
+            "output_sha256": output_digest(spec.path),
+        }
+        statuses[name] = f"built in {(time.perf_counter() - start) * 1000:.0f} ms"
+
+    manifest["__sources__"] = {**manifest.get("__sources__", {}), **hasher.current}
+    save_manifest(manifest)
+    return statuses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Regenerate the derived JSON summaries in analysis/.")
+    parser.add_argument("targets", nargs="*", help="outputs to refresh (default: all)")
+    parser.add_argument("--force", action="store_true", help="rebuild even when inputs are unchanged")
+    args = parser.parse_args()
+    unknown = [name for name in args.targets if name not in TARGETS]
+    if unknown:
+        parser.error("unknown target(s): " + ", ".join(unknown))
+
+    start = time.perf_counter()
+    for name, status in run(args.targets, force=args.force).items():
+        print(f"{name}: {status}")
+    print(f"Pipeline finished in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import math
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from ingest import MISSING, Column, Table, load_table
+from pipeline import is_multi_team
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+REPORT_DIR = BASE_DIR / "reports"
+
+# The first source drives the join: its rows decide which player-seasons exist.
+JOIN_SOURCES = ("Player Season Info.csv", "Per 100 Poss.csv", "Player Shooting.csv", "Player Play By Play.csv")
+COMBINED = "TOT"
+
+JoinKey = Tuple[int, str, str]
+
+
+def join_key(season: int, player_id: str, team: str) -> JoinKey:
+    """(season, player_id, team) with every combined row (``TOT``, ``2TM``, ``3TM``...) keyed as ``TOT``.
+
+    Sources label a traded player's combined row differently, so the label is
+    normalised before hashing.
+    """
+    return season, player_id, COMBINED if is_multi_team(team) else team
+
+
+class JoinIndex:
+    """One pass over a player-season table: a hash map from join key to row.
+
+    Also records which player-seasons have a combined row and how many team
+    stints each player-season has.
+    """
+
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        self.rows: Dict[JoinKey, int] = {}
+        self.traded: Set[Tuple[int, str]] = set()
+        self.stints: Counter = Counter()
+        for row, (season, player_id, team) in enumerate(zip(table["season"], table["player_id"], table["team"])):
+            key = join_key(season, player_id, team)
+            self.rows[key] = row
+            if key[2] == COMBINED:
+                self.traded.add((season, player_id))
+            else:
+                self.stints[season, player_id] += 1
+
+    def get(self, key: JoinKey) -> Optional[int]:
+        return self.rows.get(key)
+
+    def driver_rows(self, stints: bool = False, since: int = 0) -> List[Tuple[JoinKey, int]]:
+        """The rows that define the output, in table order.
+
+        With ``stints`` a traded player gets one row per team and the combined
+        row is dropped; otherwise every player-season appears once, using the
+        combined row where there is one.
+        """
+        chosen = []
+        for key, row in self.rows.items():
+            season, player_id, team = key
+            if season < since:
+                continue
+            if stints:
+                keep = team != COMBINED
+            else:
+                keep = team == COMBINED or (season, player_id) not in self.traded
+            if keep:
+                chosen.append((key, row))
+        chosen.sort(key=lambda item: item[1])
+        return chosen
+
+
+def _output_kind(columns: Sequence[Column]) -> str:
+    kinds = {column.kind for column in columns}
+    if "str" in kinds:
+        return "str"
+    return "int" if kinds == {"int"} else "float"
+
+
+def _missing(value) -> bool:
+    if isinstance(value, str):
+        return value in MISSING
+    return isinstance(value, float) and math.isnan(value)
+
+
+def join_player_seasons(
+    tables: Sequence[Table],
+    stints: bool = False,
+    since: int = 0,
+    inner: bool = False,
+) -> Tuple[Table, Dict[str, int]]:
+    """Merge player-season tables on (season, player_id, team) into one wide table.
+
+    The first table drives; each later table is indexed once and probed once
+    per output row, so the whole join is linear in the total row count.
+    Columns carried by several sources (``g``, ``mp``, ``fg_percent``...) are
+    coalesced: the first matched source with a value wins. ``stints`` counts
+    the team rows behind each output row (1 for a single-team season). With
+    ``inner`` only rows matched in every source are kept. Returns the table
+    and the number of output rows each source matched.
+    """
+    indexes = [JoinIndex(table) for table in tables]
+    driver = indexes[0]
+    plan = driver.driver_rows(stints=stints, since=since)
+
+    matches: List[List[Optional[int]]] = []
+    stint_counts = array("q")
+    for key, row in plan:
+        found = [row] + [index.get(key) for index in indexes[1:]]
+        if inner and None in found:
+            continue
+        matches.append(found)
+        stint_counts.append(driver.stints[key[:2]] if key[2] == COMBINED else 1)
+
+    providers: Dict[str, List[Tuple[int, Column]]] = {}
+    for source, table in enumerate(tables):
+        for name, column in table.columns.items():
+            providers.setdefault(name, []).append((source, column))
+
+    columns: List[Column] = []
+    for name, sources in providers.items():
+        kind = _output_kind([column for _, column in sources])
+        values = []
+        for found in matches:
+            value = None
+            for source, column in sources:
+                row = found[source]
+                if row is not None:
+                    candidate = column[row]
+                    if not _missing(candidate):
+                        value = candidate
+                        break
+            values.append(value)
+        if kind == "int" and None in values:
+            kind = "float"
+        if kind == "str":
+            dictionary: List[str] = []
+            lookup: Dict[str, int] = {}
+            codes = array("i")
+            for value in values:
+                text = "" if value is None else str(value)
+                code = lookup.get(text)
+                if code is None:
+                    code = lookup[text] = len(dictionary)
+                    dictionary.append(text)
+                codes.append(code)
+            columns.append(Column(name, "str", codes, dictionary))
+        elif kind == "int":
+            columns.append(Column(name, "int", array("q", values)))
+        else:
+            columns.append(Column(name, "float", array("d", [math.nan if v is None else v for v in values])))
+
+    after_team = [column.name for column in columns].index("team") + 1
+    columns.insert(after_team, Column("stints", "int", stint_counts))
+
+    matched = {
+        table.name: sum(found[source] is not None for found in matches) for source, table in enumerate(tables)
+    }
+    return Table("player_seasons_wide", columns), matched
+
+
+def write_csv(table: Table, path: Path, fields: Optional[Sequence[str]] = None) -> None:
+    names = list(fields or table.column_names)
+    columns = [table[name] for name in names]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(names)
+        for values in zip(*columns):
+            writer.writerow(["" if isinstance(v, float) and math.isnan(v) else v for v in values])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Join the player-season tables into one wide table.")
+    parser.add_argument(
+        "--stints",
+        action="store_true",
+        help="one row per team stint for traded players instead of their combined (TOT/2TM) row",
+    )
+    parser.add_argument("--since", type=int, default=0, help="first season to keep (1997 covers every source)")
+    parser.add_argument("--inner", action="store_true", help="keep only rows found in every source")
+    parser.add_argument("--fields", help="comma-separated columns to write (default: all)")
+    parser.add_argument("--output", type=Path, default=REPORT_DIR / "player_seasons_wide.csv")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    tables = [load_table(name) for name in JOIN_SOURCES]
+    wide, matched = join_player_seasons(tables, stints=args.stints, since=args.since, inner=args.inner)
+    elapsed = time.perf_counter() - start
+    fields = [name.strip() for name in args.fields.split(",")] if args.fields else None
+    unknown = [name for name in fields or () if name not in wide]
+    if unknown:
+        parser.error("unknown column(s): " + ", ".join(unknown))
+    write_csv(wide, args.output, fields)
+
+    print(f"Joined {len(wide)} rows x {len(wide.column_names)} columns in {elapsed * 1000:.0f} ms")
+    for name, count in matched.items():
+        print(f"  {name:<26} matched {count}")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+REPORT_DIR = BASE_DIR / "reports" / "profile"
+
+PROFILE_ENV = "VIZ_PROFILE"
+STAGES = ("load", "aggregate", "layout", "serialize", "write")
+
+
+class _Frame:
+    __slots__ = ("name", "wall", "cpu", "base", "peak")
+
+    def __init__(self, name: str, base: int) -> None:
+        self.name = name
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.base = base
+        self.peak = base
+
+
+class StageProfiler:
+    """Wall time, CPU time and tracemalloc peak per named build stage.
+
+    Stages may repeat (times add up, peaks take the max) and nest (an outer
+    stage's numbers include its inner stages). Peaks are measured above the
+    traced memory in use when the stage began. While disabled, ``stage``
+    returns a no-op context.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.records: Dict[str, dict] = {}
+        self._stack: List[_Frame] = []
+        self._started = 0.0
+        self._started_cpu = 0.0
+        self._started_at = ""
+        self._owns_tracemalloc = False
+        self._peak = 0
+
+    def start(self) -> None:
+        self.enabled = True
+        self.records.clear()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._peak = 0
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+        self._started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    def stop(self) -> None:
+        self.enabled = False
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    @contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        current, peak = tracemalloc.get_traced_memory()
+        self._peak = max(self._peak, peak)
+        if self._stack:
+            self._stack[-1].peak = max(self._stack[-1].peak, peak)
+        tracemalloc.reset_peak()
+        frame = _Frame(name, current)
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - frame.wall
+            cpu = time.process_time() - frame.cpu
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            self._peak = max(self._peak, frame.peak)
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, frame.peak)
+            tracemalloc.reset_peak()
+            record = self.records.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_bytes": 0})
+            record["calls"] += 1
+            record["wall_s"] += wall
+            record["cpu_s"] += cpu
+            record["peak_bytes"] = max(record["peak_bytes"], frame.peak - frame.base)
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return self._measure(name) if self.enabled else nullcontext()
+
+    def report(self, script: str) -> dict:
+        order = {name: i for i, name in enumerate(STAGES)}
+        names = sorted(self.records, key=lambda name: (order.get(name, len(order)), name))
+        return {
+            "script": script,
+            "started": self._started_at,
+            "python": platform.python_version(),
+            "wall_s": round(time.perf_counter() - self._started, 6),
+            "cpu_s": round(time.process_time() - self._started_cpu, 6),
+            "peak_bytes": max(self._peak, tracemalloc.get_traced_memory()[1]) if tracemalloc.is_tracing() else None,
+            "stages": [
+                {
+                    "stage": name,
+                    "calls": self.records[name]["calls"],
+                    "wall_s": round(self.records[name]["wall_s"], 6),
+                    "cpu_s": round(self.records[name]["cpu_s"], 6),
+                    "peak_bytes": self.records[name]["peak_bytes"],
+                }
+                for name in names
+            ],
+        }
+
+    def finish(self, script: str, path: Path) -> dict:
+        """Write the JSON report to ``path``, print a summary table and stop profiling."""
+        report = self.report(script)
+        self.stop()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Profile ({script}; wall times include tracemalloc overhead):")
+        for row in report["stages"]:
+            print(
+                f"  {row['stage']:<10} {row['calls']:>4}x {row['wall_s'] * 1000:9.1f} ms wall "
+                f"{row['cpu_s'] * 1000:9.1f} ms cpu {row['peak_bytes'] / 1024:10.1f} KiB peak"
+            )
+        print(f"  {'total':<10}       {report['wall_s'] * 1000:9.1f} ms wall {report['cpu_s'] * 1000:9.1f} ms cpu")
+        print(f"Wrote {path}")
+        return report
+
+
+PROFILER = StageProfiler()
+
+
+def stage(name: str) -> ContextManager[None]:
+    """``with stage("layout"):`` records into the shared profiler when it is running."""
+    return PROFILER.stage(name)
+
+
+def profile_path(option: Optional[str], script: str) -> Optional[Path]:
+    """Resolve ``--profile [PATH]`` or $VIZ_PROFILE to a report path; None when profiling is off.
+
+    An empty option or an environment value of ``1`` selects the default
+    ``reports/profile/<script>.json``.
+    """
+    if option is None:
+        option = os.environ.get(PROFILE_ENV) or None
+        if option in ("0", "false", "no"):
+            option = None
+    if option is None:
+        return None
+    if option in ("", "1", "true", "yes"):
+        return REPORT_DIR / f"{script}.json"
+    return Path(option)
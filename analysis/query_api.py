@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import math
+import re
+import time
+import traceback
+from collections import defaultdict, deque
+from functools import lru_cache
+from http import HTTPStatus
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from aggregate import REDUCTIONS, Agg, group_by
+from ingest import Table, load_table, source_csvs
+from pipeline import optional, preferred_rows
+from serve import BadRequest, read_request, send_head, wants_keep_alive
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+CACHE_SIZE = 1024
+LATENCY_SAMPLES = 2048
+
+Params = Tuple[Tuple[str, str], ...]
+
+ROUTES = [
+    ("tables", re.compile(r"/api/tables")),
+    ("player", re.compile(r"/api/players/(?P<player_id>[^/]+)")),
+    ("season_teams", re.compile(r"/api/seasons/(?P<season>\d+)/teams")),
+    ("league", re.compile(r"/api/league/(?P<column>[^/]+)")),
+    ("metrics", re.compile(r"/api/metrics")),
+]
+
+
+class QueryError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class InvalidParameter(QueryError):
+    """A query parameter the route does not take, or one that does not parse (400)."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(400, message)
+
+
+def int_param(name: str, value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidParameter(f"{name} must be an integer, not {value!r}") from None
+
+
+def table_slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def clean(values: Sequence) -> list:
+    return [optional(value) if isinstance(value, float) else value for value in values]
+
+
+class QueryEngine:
+    """Targeted queries over the columnar CSV tables.
+
+    Tables are addressed by slug (``Per 100 Poss.csv`` -> ``per-100-poss``).
+    Row indexes per key column are built on first use. Encoded responses
+    are kept in an LRU keyed by route, path arguments and sorted query
+    parameters.
+    """
+
+    def __init__(self, cache_size: int = CACHE_SIZE) -> None:
+        self.sources = {table_slug(path.stem): path for path in source_csvs()}
+        self._indexes: Dict[Tuple[str, str], Dict[object, List[int]]] = {}
+        self._preferred: Dict[str, frozenset] = {}
+        self.execute = lru_cache(maxsize=cache_size)(self._execute)
+
+    def table(self, slug: str) -> Table:
+        if slug not in self.sources:
+            raise QueryError(404, f"unknown table {slug!r}; see /api/tables")
+        return load_table(self.sources[slug])
+
+    def preload(self) -> int:
+        return sum(len(self.table(slug)) for slug in self.sources)
+
+    def index(self, slug: str, key: str) -> Dict[object, List[int]]:
+        """Row numbers per value of ``key``, each list in season order."""
+        if (slug, key) not in self._indexes:
+            table = self.table(slug)
+            if key not in table:
+                raise QueryError(400, f"table {slug!r} has no {key!r} column")
+            groups: Dict[object, List[int]] = defaultdict(list)
+            for row, value in enumerate(table[key]):
+                groups[value].append(row)
+            if "season" in table:
+                seasons = table["season"]
+                for rows in groups.values():
+                    rows.sort(key=lambda i: seasons[i])
+            self._indexes[slug, key] = dict(groups)
+        return self._indexes[slug, key]
+
+    def require(self, slug: str, columns: Sequence[str], purpose: str) -> Table:
+        """The table, or a 400 when it lacks a column the query needs."""
+        table = self.table(slug)
+        missing = [name for name in columns if name not in table]
+        if missing:
+            raise QueryError(400, f"table {slug!r} has no {', '.join(map(repr, missing))} column for {purpose}")
+        return table
+
+    def preferred(self, slug: str) -> frozenset:
+        if slug not in self._preferred:
+            self._preferred[slug] = frozenset(preferred_rows(self.table(slug)))
+        return self._preferred[slug]
+
+    def fields(self, table: Table, requested: Optional[str], default: Sequence[str]) -> List[str]:
+        if not requested:
+            return list(default)
+        fields = [name.strip() for name in requested.split(",") if name.strip()]
+        unknown = [name for name in fields if name not in table]
+        if unknown:
+            raise QueryError(400, "unknown column(s): " + ", ".join(unknown))
+        return fields
+
+    def _execute(self, route: str, args: Params, params: Params) -> bytes:
+        handler = getattr(self, f"query_{route}")
+        accepted = set(inspect.signature(handler).parameters) - {name for name, _ in args}
+        unknown = sorted({name for name, _ in params} - accepted)
+        if unknown:
+            expected = ", ".join(sorted(accepted)) or "none"
+            raise InvalidParameter(f"unknown parameter(s) {', '.join(unknown)}; {route} takes: {expected}")
+        result = handler(**dict(args), **dict(params))
+        return json.dumps(result, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+    def query_tables(self) -> List[dict]:
+        return [
+            {"table": slug, "source": path.name, "rows": len(self.table(slug)), "columns": self.table(slug).column_names}
+            for slug, path in self.sources.items()
+        ]
+
+    def query_player(self, player_id: str, table: str = "per-100-poss", fields: str = "", stints: str = "0") -> dict:
+        """One player's season series; traded seasons collapse to the combined row unless ``stints=1``."""
+        key_columns = ("season", "player_id") if stints == "1" else ("season", "player_id", "team")
+        data = self.require(table, key_columns, "per-season player rows")
+        rows = self.index(table, "player_id").get(player_id)
+        if not rows:
+            raise QueryError(404, f"no rows for player {player_id!r} in {table!r}")
+        if stints != "1":
+            keep = self.preferred(table)
+            rows = [row for row in rows if row in keep]
+        skip = {"season", "player_id", "player", "team", "seas_id", "lg"}
+        numeric = [name for name, column in data.columns.items() if column.kind != "str" and name not in skip]
+        return {
+            "table": table,
+            "player_id": player_id,
+            "player": data["player"][rows[0]] if "player" in data else None,
+            "season": [data["season"][row] for row in rows],
+            "team": [data["team"][row] for row in rows] if "team" in data else None,
+            "columns": {
+                name: clean([data[name][row] for row in rows]) for name in self.fields(data, fields, numeric)
+            },
+        }
+
+    def query_season_teams(self, season: str, table: str = "team-summaries", fields: str = "") -> dict:
+        """Every row of a team table for one season (including its League Average row, if any)."""
+        year = int_param("season", season)
+        data = self.require(table, ("season",), "season rows")
+        rows = self.index(table, "season").get(year)
+        if not rows:
+            raise QueryError(404, f"no rows for season {season} in {table!r}")
+        rows = sorted(rows, key=lambda row: data["team"][row]) if "team" in data else rows
+        default = [name for name in data.column_names if name not in ("season", "team")]
+        return {
+            "table": table,
+            "season": year,
+            "team": [data["team"][row] for row in rows] if "team" in data else None,
+            "columns": {name: clean([data[name][row] for row in rows]) for name in self.fields(data, fields, default)},
+        }
+
+    def query_league(
+        self,
+        column: str,
+        table: str = "team-stats-per-game",
+        since: str = "0",
+        how: str = "mean",
+        weight: str = "",
+    ) -> dict:
+        """Per-season reduction of any numeric column (``how``: mean, sum, count, share or weighted_mean).
+
+        Naming a ``weight`` column (``fga_per_game``, ``mp``...) turns the default
+        mean into a weighted mean.
+        """
+        first = int_param("since", since)
+        data = self.table(table)
+        for name in filter(None, ("season", column, weight)):
+            if name not in data:
+                raise QueryError(400, f"table {table!r} has no {name!r} column")
+            if data[name].kind == "str":
+                raise QueryError(400, f"column {name!r} is not numeric")
+        if weight and how == "mean":
+            how = "weighted_mean"
+        if how not in REDUCTIONS:
+            raise QueryError(400, f"unknown reduction {how!r}; expected one of {', '.join(REDUCTIONS)}")
+        if (how == "weighted_mean") != bool(weight):
+            raise QueryError(400, "weighted_mean needs a weight column, and only it takes one")
+        seasons = data["season"]
+        rows = [row for row, season in enumerate(seasons) if season >= first]
+        grouped = group_by(data, "season", {how: Agg(column, how, weight or None)}, rows=rows)
+        records = grouped.records()
+        return {
+            "table": table,
+            "column": column,
+            "weight": weight or None,
+            "season": [rec["season"] for rec in records],
+            how: [rec[how] for rec in records],
+        }
+
+
+class LatencyStats:
+    """Request count, error count and a sliding window of latencies for one route."""
+
+    def __init__(self, samples: int = LATENCY_SAMPLES) -> None:
+        self.count = 0
+        self.errors = 0
+        self.window: Deque[float] = deque(maxlen=samples)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.count += 1
+        self.errors += not ok
+        self.window.append(seconds)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.window)
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, math.ceil(p * len(ordered)) - 1)] * 1000, 3)
+
+        summary = {"count": self.count, "errors": self.errors}
+        if ordered:
+            summary.update(p50_ms=percentile(0.50), p95_ms=percentile(0.95), p99_ms=percentile(0.99), max_ms=percentile(1.0))
+        return summary
+
+
+class QueryServer:
+    """Asyncio HTTP front end for QueryEngine with per-route latency metrics."""
+
+    def __init__(self, engine: QueryEngine, quiet: bool = False) -> None:
+        self.engine = engine
+        self.quiet = quiet
+        self.stats: Dict[str, LatencyStats] = defaultdict(LatencyStats)
+
+    def metrics(self) -> dict:
+        info = self.engine.execute.cache_info()
+        return {
+            "routes": {route: stats.summary() for route, stats in sorted(self.stats.items())},
+            "cache": {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize},
+        }
+
+    def dispatch(self, target: str) -> Tuple[str, int, bytes, str]:
+        """(route, status, body, cache state) for one GET."""
+        url = urlsplit(target)
+        path = unquote(url.path).rstrip("/")
+        for route, pattern in ROUTES:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            if route == "metrics":
+                return route, 200, json.dumps(self.metrics()).encode("utf-8"), "BYPASS"
+            params = tuple(sorted(parse_qsl(url.query)))
+            hits = self.engine.execute.cache_info().hits
+            try:
+                body = self.engine.execute(route, tuple(sorted(match.groupdict().items())), params)
+            except QueryError as exc:
+                return route, exc.status, json.dumps({"error": str(exc)}).encode("utf-8"), "MISS"
+            except Exception as exc:
+                if not self.quiet:
+                    traceback.print_exc()
+                return route, 500, json.dumps({"error": f"internal error ({type(exc).__name__})"}).encode("utf-8"), "MISS"
+            state = "HIT" if self.engine.execute.cache_info().hits > hits else "MISS"
+            return route, 200, body, state
+        return "unmatched", 404, json.dumps({"error": f"no route for {path!r}"}).encode("utf-8"), "MISS"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except (BadRequest, ValueError, asyncio.LimitOverrunError):
+                    self.stats["bad_request"].record(0.0, False)
+                    await self.respond(writer, 400, b'{"error":"malformed request"}', "MISS", 0.0, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                keep_alive = wants_keep_alive(version, headers)
+                start = time.perf_counter()
+                if method in ("GET", "HEAD"):
+                    route, status, body, state = self.dispatch(target)
+                else:
+                    route, status, body, state = "unmatched", 405, b'{"error":"GET only"}', "MISS"
+                elapsed = time.perf_counter() - start
+                self.stats[route].record(elapsed, status < 400)
+                await self.respond(writer, status, body, state, elapsed, keep_alive, head=method == "HEAD")
+                if not self.quiet:
+                    print(f'"{method} {target}" {status} {state} {elapsed * 1000:.2f} ms')
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        state: str,
+        elapsed: float,
+        keep_alive: bool,
+        head: bool = False,
+    ) -> None:
+        await send_head(
+            writer,
+            status,
+            HTTPStatus(status).phrase,
+            [
+                ("Content-Type", "application/json"),
+                ("Content-Length", str(len(body))),
+                ("Access-Control-Allow-Origin", "*"),
+                ("Cache-Control", "no-cache"),
+                ("X-Cache", state),
+                ("Server-Timing", f"app;dur={elapsed * 1000:.3f}"),
+            ],
+            keep_alive,
+        )
+        if not head:
+            writer.write(body)
+            await writer.drain()
+
+
+async def serve(host: str, port: int, server: QueryServer) -> None:
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"Query API on http://{host}:{port}/api/ (tables, players/<id>, seasons/<year>/teams, league/<column>, metrics)")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve JSON queries over the in-memory stat tables.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="LRU entries for encoded results")
+    parser.add_argument("--lazy", action="store_true", help="load tables on first use instead of at startup")
+    parser.add_argument("--quiet", action="store_true", help="no per-request log lines")
+    args = parser.parse_args(argv)
+
+    engine = QueryEngine(cache_size=args.cache_size)
+    if not args.lazy:
+        start = time.perf_counter()
+        rows = engine.preload()
+        print(f"Loaded {len(engine.sources)} tables ({rows} rows) in {time.perf_counter() - start:.2f}s")
+    try:
+        asyncio.run(serve(args.host, args.port, QueryServer(engine, quiet=args.quiet)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
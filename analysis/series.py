@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class SeasonSeries:
+    """Season-indexed column store built once from a list of per-season records.
+
+    Lookups by season are O(1) through ``index``; each field is held as a list
+    aligned with ``seasons`` (``None`` where a record lacks the field).
+    """
+
+    def __init__(self, seasons: List[int], columns: Dict[str, List[Any]]) -> None:
+        self.seasons = seasons
+        self.columns = columns
+        self.index = {season: i for i, season in enumerate(seasons)}
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], key: str = "season") -> "SeasonSeries":
+        """Pivot records into columns, keeping record order and the first row per season."""
+        seasons: List[int] = []
+        rows: List[dict] = []
+        seen = set()
+        fields: Dict[str, None] = {}
+        for rec in records:
+            season = rec[key]
+            if season in seen:
+                continue
+            seen.add(season)
+            seasons.append(season)
+            rows.append(rec)
+            for field in rec:
+                if field != key:
+                    fields.setdefault(field)
+        columns = {field: [rec.get(field) for rec in rows] for field in fields}
+        return cls(seasons, columns)
+
+    def __len__(self) -> int:
+        return len(self.seasons)
+
+    def __contains__(self, season: int) -> bool:
+        return season in self.index
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self.columns)
+
+    def column(self, field: str) -> List[Any]:
+        return self.columns.get(field, [None] * len(self.seasons))
+
+    def get(self, season: int, field: str, default: Any = None) -> Any:
+        i = self.index.get(season)
+        column = self.columns.get(field)
+        if i is None or column is None or column[i] is None:
+            return default
+        return column[i]
+
+    def pairs(self, field: str) -> List[Tuple[int, Any]]:
+        """(season, value) pairs for seasons where ``field`` is present."""
+        return [(season, value) for season, value in zip(self.seasons, self.column(field)) if value is not None]
+
+    def since(self, first_season: int) -> "SeasonSeries":
+        return self.where(lambda season: season >= first_season)
+
+    def where(self, predicate) -> "SeasonSeries":
+        keep = [i for i, season in enumerate(self.seasons) if predicate(season)]
+        return SeasonSeries(
+            [self.seasons[i] for i in keep],
+            {field: [values[i] for i in keep] for field, values in self.columns.items()},
+        )
+
+    def with_column(self, field: str, values: List[Any]) -> "SeasonSeries":
+        """Return a copy with ``field`` added or replaced (inputs are never mutated)."""
+        if len(values) != len(self.seasons):
+            raise ValueError(f"Column {field!r} has {len(values)} values for {len(self.seasons)} seasons")
+        return SeasonSeries(self.seasons, {**self.columns, field: values})
+
+    def scaled(self, field: str, factor: float, into: Optional[str] = None) -> "SeasonSeries":
+        values = [None if value is None else value * factor for value in self.column(field)]
+        return self.with_column(into or field, values)
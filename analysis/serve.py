@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import mimetypes
+import os
+import re
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
+
+from ingest import CACHE_DIR, file_digest
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+GZIP_DIR = CACHE_DIR / "gzip"
+
+COMPRESSIBLE = {".csv", ".css", ".html", ".js", ".json", ".md", ".svg", ".txt", ".twb"}
+MIN_COMPRESS_BYTES = 1024
+KEEPALIVE_SECONDS = 15.0
+MAX_HEADER_LINES = 100
+RANGE_SPEC = re.compile(r"(\d*)-(\d*)")
+
+for _type, _suffix in (("text/csv", ".csv"), ("application/json", ".json"), ("image/svg+xml", ".svg"), ("text/javascript", ".js")):
+    mimetypes.add_type(_type, _suffix)
+
+Headers = List[Tuple[str, str]]
+
+
+class BadRequest(Exception):
+    pass
+
+
+def gzip_path(path: Path, root: Path = BASE_DIR) -> Path:
+    return GZIP_DIR / (str(path.relative_to(root)) + ".gz")
+
+
+def is_hidden(path: Path, root: Path) -> bool:
+    return any(part.startswith(".") for part in path.relative_to(root).parts)
+
+
+def precompress(root: Path = BASE_DIR, level: int = 9) -> Tuple[int, int]:
+    """Write gzip variants of the text assets under ``root`` into GZIP_DIR.
+
+    Only files whose variant is missing or older than the source are
+    recompressed. The gzip header carries no timestamp, so a variant's bytes
+    depend only on its source. Returns (written, up to date).
+    """
+    written = fresh = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not name.startswith(".") and name != "__pycache__"]
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            if path.suffix.lower() not in COMPRESSIBLE or filename.startswith("."):
+                continue
+            stat = path.stat()
+            if stat.st_size < MIN_COMPRESS_BYTES:
+                continue
+            target = gzip_path(path, root)
+            if target.exists() and target.stat().st_mtime_ns >= stat.st_mtime_ns:
+                fresh += 1
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(target.name + ".tmp")
+            tmp.write_bytes(gzip.compress(path.read_bytes(), compresslevel=level, mtime=0))
+            tmp.replace(target)
+            written += 1
+    return written, fresh
+
+
+def accepts_gzip(header: str) -> bool:
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            q = params.strip()
+            try:
+                return not (q.startswith("q=") and float(q[2:]) == 0)
+            except ValueError:
+                return True
+    return False
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match comparison (weak comparison, as RFC 9110 requires for this header)."""
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) for a single ``bytes=`` range, or None to send the whole file.
+
+    Raises ValueError when the range cannot be satisfied (answered with 416).
+    Multi-range requests fall back to a full 200 response.
+    """
+    unit, _, spec = header.partition("=")
+    match = RANGE_SPEC.fullmatch(spec.strip())
+    if unit.strip().lower() != "bytes" or match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0 or size == 0:
+            raise ValueError(f"unsatisfiable suffix range {header!r}")
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(f"range {header!r} outside 0-{size - 1}")
+    return start, end
+
+
+class StaticServer:
+    """Asyncio static file server: one coroutine per connection, no threads per client.
+
+    Responses carry strong ETags (SHA-256 of the bytes sent) and Cache-Control.
+    Clients that accept gzip get the precompressed variant from GZIP_DIR.
+    Conditional requests get 304, and single byte ranges get 206.
+    """
+
+    def __init__(self, root: Path = BASE_DIR, max_age: int = 0, quiet: bool = False) -> None:
+        self.root = root.resolve()
+        self.max_age = max_age
+        self.quiet = quiet
+        self._etags: Dict[Path, Tuple[int, int, str]] = {}
+
+    async def etag(self, path: Path, stat: os.stat_result) -> str:
+        cached = self._etags.get(path)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        digest = await asyncio.get_running_loop().run_in_executor(None, file_digest, path)
+        tag = f'"{digest[:32]}"'
+        self._etags[path] = (stat.st_size, stat.st_mtime_ns, tag)
+        return tag
+
+    def resolve(self, target: str) -> Tuple[Optional[Path], Optional[str]]:
+        """(file, None) for a servable file, (None, location) for a redirect, or (None, None)."""
+        raw = unquote(urlsplit(target).path)
+        parts = [part for part in raw.split("/") if part]
+        if any(part.startswith(".") or "\\" in part for part in parts):
+            return None, None
+        path = self.root.joinpath(*parts).resolve()
+        if path != self.root and self.root not in path.parents:
+            return None, None
+        if path.is_dir():
+            if not raw.endswith("/"):
+                # Rebuilt from the checked parts: the raw path may start with "//"
+                # (e.g. /%2f%2fviz), which a browser reads as another host.
+                return None, quote("/" + "".join(part + "/" for part in parts))
+            if not (path / "index.html").is_file():
+                return (None, "/viz/") if path == self.root else (None, None)
+            path = path / "index.html"
+        return (path, None) if path.is_file() and not is_hidden(path, self.root) else (None, None)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except (BadRequest, ValueError, asyncio.LimitOverrunError):
+                    await self.send_error(writer, 400, "Bad Request", head=False, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                keep_alive = wants_keep_alive(version, headers)
+                status = await self.respond(writer, method, target, headers, keep_alive)
+                if not self.quiet:
+                    print(f'{peer[0] if peer else "-"} "{method} {target}" {status}')
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def respond(
+        self, writer: asyncio.StreamWriter, method: str, target: str, headers: Dict[str, str], keep_alive: bool
+    ) -> int:
+        if method not in ("GET", "HEAD"):
+            return await self.send_error(writer, 405, "Method Not Allowed", keep_alive=keep_alive, extra=[("Allow", "GET, HEAD")])
+        head = method == "HEAD"
+        path, location = self.resolve(target)
+        if location is not None:
+            return await self.send_error(writer, 301, "Moved Permanently", head, keep_alive, [("Location", location)])
+        if path is None:
+            return await self.send_error(writer, 404, "Not Found", head, keep_alive)
+
+        # Ranges are served from the identity encoding only.
+        body_path, encoding = path, None
+        compressed = gzip_path(path, self.root)
+        stat = path.stat()
+        if "range" not in headers and accepts_gzip(headers.get("accept-encoding", "")):
+            try:
+                gz_stat = compressed.stat()
+            except OSError:
+                gz_stat = None
+            if gz_stat is not None and gz_stat.st_mtime_ns >= stat.st_mtime_ns:
+                body_path, encoding, stat = compressed, "gzip", gz_stat
+
+        etag = await self.etag(body_path, stat)
+        last_modified = formatdate(path.stat().st_mtime, usegmt=True)
+        common: Headers = [
+            ("ETag", etag),
+            ("Last-Modified", last_modified),
+            ("Cache-Control", f"public, max-age={self.max_age}" if self.max_age else "no-cache"),
+            ("Vary", "Accept-Encoding"),
+        ]
+        if not_modified(headers, etag, path.stat().st_mtime):
+            await send_head(writer, 304, "Not Modified", common, keep_alive)
+            return 304
+
+        size = stat.st_size
+        start, end, status, reason = 0, size - 1, 200, "OK"
+        range_header = headers.get("range")
+        if range_header and headers.get("if-range", etag) in (etag, last_modified):
+            try:
+                requested = parse_range(range_header, size)
+            except ValueError:
+                return await self.send_error(
+                    writer, 416, "Range Not Satisfiable", head, keep_alive, [("Content-Range", f"bytes */{size}")]
+                )
+            if requested is not None:
+                (start, end), status, reason = requested, 206, "Partial Content"
+                common.append(("Content-Range", f"bytes {start}-{end}/{size}"))
+
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/json", "image/svg+xml"):
+            content_type += "; charset=utf-8"
+        common += [("Content-Type", content_type), ("Accept-Ranges", "bytes")]
+        if encoding:
+            common.append(("Content-Encoding", encoding))
+        common.append(("Content-Length", str(end - start + 1)))
+        await send_head(writer, status, reason, common, keep_alive)
+        if not head and end >= start:
+            with body_path.open("rb") as fh:
+                await asyncio.get_running_loop().sendfile(writer.transport, fh, start, end - start + 1)
+        return status
+
+    async def send_error(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        reason: str,
+        head: bool = False,
+        keep_alive: bool = True,
+        extra: Optional[Headers] = None,
+    ) -> int:
+        body = f"{status} {reason}\n".encode("utf-8")
+        headers = (extra or []) + [("Content-Type", "text/plain; charset=utf-8"), ("Content-Length", str(len(body)))]
+        await send_head(writer, status, reason, headers, keep_alive)
+        if not head:
+            writer.write(body)
+            await writer.drain()
+        return status
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str]]]:
+    """Read one request head; None on a cleanly closed connection."""
+    line = await asyncio.wait_for(reader.readline(), KEEPALIVE_SECONDS)
+    if not line.strip():
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise BadRequest(line)
+    headers: Dict[str, str] = {}
+    for _ in range(MAX_HEADER_LINES):
+        raw = await asyncio.wait_for(reader.readline(), KEEPALIVE_SECONDS)
+        if raw in (b"\r\n", b"\n", b""):
+            return parts[0], parts[1], parts[2], headers
+        name, sep, value = raw.decode("latin-1").partition(":")
+        if not sep:
+            raise BadRequest(raw)
+        headers[name.strip().lower()] = value.strip()
+    raise BadRequest("too many header lines")
+
+
+def wants_keep_alive(version: str, headers: Dict[str, str]) -> bool:
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def not_modified(headers: Dict[str, str], etag: str, mtime: float) -> bool:
+    if "if-none-match" in headers:
+        return etag_matches(headers["if-none-match"], etag)
+    since = headers.get("if-modified-since")
+    if since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def send_head(writer: asyncio.StreamWriter, status: int, reason: str, headers: Headers, keep_alive: bool) -> None:
+    lines = [f"HTTP/1.1 {status} {reason}", f"Date: {formatdate(usegmt=True)}", "Server: vizwizards-serve"]
+    lines += [f"{name}: {value}" for name, value in headers]
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+
+
+async def serve(host: str, port: int, server: StaticServer) -> None:
+    listener = await asyncio.start_server(server.handle, host, port)
+    addresses = ", ".join(f"http://{sock.getsockname()[0]}:{sock.getsockname()[1]}/" for sock in listener.sockets)
+    print(f"Serving {server.root} at {addresses} (Ctrl+C to stop)")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the project (viz/, analysis/, CSVs) with caching headers.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-age", type=int, default=0, help="Cache-Control max-age in seconds (0 = always revalidate)")
+    parser.add_argument("--no-precompress", action="store_true", help="skip refreshing the gzip variants at startup")
+    parser.add_argument("--precompress-only", action="store_true", help="refresh the gzip variants and exit")
+    parser.add_argument("--quiet", action="store_true", help="no per-request log lines")
+    args = parser.parse_args(argv)
+
+    if not args.no_precompress:
+        start = time.perf_counter()
+        written, fresh = precompress(BASE_DIR)
+        print(f"Precompressed {written} file(s), {fresh} up to date ({time.perf_counter() - start:.2f}s)")
+    if args.precompress_only:
+        return
+    try:
+        asyncio.run(serve(args.host, args.port, StaticServer(BASE_DIR, max_age=args.max_age, quiet=args.quiet)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
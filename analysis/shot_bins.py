@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import re
+import shutil
+import time
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ingest import CACHE_DIR
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+ANALYSIS_DIR = BASE_DIR / "analysis"
+TILE_DIR = ANALYSIS_DIR / "shot_tiles"
+WORK_DIR = CACHE_DIR / "shot_bins"
+
+# Half court in feet, origin at the centre of the rim: the baseline is 5.25 ft
+# behind it and the half-court line 41.75 ft in front.
+COURT_X = (-25.0, 25.0)
+COURT_Y = (-5.25, 41.75)
+
+COLUMNS = {"season": "season", "team": "team", "player": "player_id", "x": "loc_x", "y": "loc_y", "made": "shot_made_flag"}
+MADE_VALUES = frozenset({"1", "true", "True", "TRUE", "made", "Made"})
+LEVELS = ("season", "team", "player")
+
+CHUNK_ROWS = 50_000
+MAX_CELLS = 250_000
+PARTITIONS = 64
+
+Cells = Dict[str, Dict[int, List[int]]]
+
+
+class GridBinner:
+    """Square bins of ``size`` feet over the half court, numbered row-major from the baseline corner."""
+
+    def __init__(self, size: float = 1.0) -> None:
+        self.size = size
+        self.cols = math.ceil((COURT_X[1] - COURT_X[0]) / size)
+        self.rows = math.ceil((COURT_Y[1] - COURT_Y[0]) / size)
+
+    def __call__(self, x: float, y: float) -> Optional[int]:
+        if not (COURT_X[0] <= x <= COURT_X[1] and COURT_Y[0] <= y <= COURT_Y[1]):
+            return None
+        col = min(int((x - COURT_X[0]) / self.size), self.cols - 1)
+        row = min(int((y - COURT_Y[0]) / self.size), self.rows - 1)
+        return row * self.cols + col
+
+    def spec(self) -> dict:
+        return {"kind": "grid", "size": self.size, "x0": COURT_X[0], "y0": COURT_Y[0], "cols": self.cols, "rows": self.rows}
+
+
+class HexBinner:
+    """Pointy-top hexagons with circumradius ``size`` feet centred on the rim.
+
+    Bin ``b`` is axial cell ``(q, r) = (b % q_span + q_min, b // q_span + r_min)``;
+    its centre is ``(size * sqrt(3) * (q + r / 2), size * 1.5 * r)``.
+    """
+
+    def __init__(self, size: float = 1.0) -> None:
+        self.size = size
+        corners = [self.axial(x, y) for x in COURT_X for y in COURT_Y]
+        self.q_min = min(q for q, _ in corners) - 1
+        self.r_min = min(r for _, r in corners) - 1
+        self.q_span = max(q for q, _ in corners) + 2 - self.q_min
+
+    def axial(self, x: float, y: float) -> Tuple[int, int]:
+        fq = (math.sqrt(3) / 3 * x - y / 3) / self.size
+        fr = (2 / 3 * y) / self.size
+        fs = -fq - fr
+        q, r, s = round(fq), round(fr), round(fs)
+        dq, dr, ds = abs(q - fq), abs(r - fr), abs(s - fs)
+        if dq > dr and dq > ds:
+            q = -r - s
+        elif dr > ds:
+            r = -q - s
+        return q, r
+
+    def __call__(self, x: float, y: float) -> Optional[int]:
+        if not (COURT_X[0] <= x <= COURT_X[1] and COURT_Y[0] <= y <= COURT_Y[1]):
+            return None
+        q, r = self.axial(x, y)
+        return (r - self.r_min) * self.q_span + (q - self.q_min)
+
+    def spec(self) -> dict:
+        return {"kind": "hex", "size": self.size, "q_min": self.q_min, "r_min": self.r_min, "q_span": self.q_span}
+
+
+def make_binner(kind: str, size: float):
+    return HexBinner(size) if kind == "hex" else GridBinner(size)
+
+
+def partition_of(group: str, partitions: int) -> int:
+    return zlib.crc32(group.encode("utf-8")) % partitions
+
+
+class BinAccumulator:
+    """Per-group bin counts held under a cell budget.
+
+    Once ``max_cells`` (group, bin) cells are in memory they are appended to
+    per-partition spill files in ``spill_dir`` as ``group\\tbin\\tfga\\tfgm``
+    lines and the table starts over, so memory does not grow with the input.
+    Every spill of a group lands in the same partition, which is what lets
+    ``merge_partition`` finish one partition at a time.
+    """
+
+    def __init__(self, spill_dir: Path, tag: str, partitions: int = PARTITIONS, max_cells: int = MAX_CELLS) -> None:
+        self.spill_dir = spill_dir
+        self.tag = tag
+        self.partitions = partitions
+        self.max_cells = max_cells
+        self.groups: Cells = defaultdict(dict)
+        self.cells = 0
+        self.spills = 0
+
+    def add(self, group: str, bin_id: int, made: bool) -> None:
+        bins = self.groups[group]
+        cell = bins.get(bin_id)
+        if cell is None:
+            bins[bin_id] = [1, int(made)]
+            self.cells += 1
+            if self.cells >= self.max_cells:
+                self.spill()
+        else:
+            cell[0] += 1
+            cell[1] += made
+
+    def spill(self) -> None:
+        if not self.cells:
+            return
+        lines: Dict[int, List[str]] = defaultdict(list)
+        for group, bins in self.groups.items():
+            out = lines[partition_of(group, self.partitions)]
+            out.extend(f"{group}\t{bin_id}\t{fga}\t{fgm}\n" for bin_id, (fga, fgm) in bins.items())
+        for partition, chunk in lines.items():
+            with (self.spill_dir / f"{self.tag}-{partition:03d}.tsv").open("a", encoding="utf-8") as fh:
+                fh.writelines(chunk)
+        self.groups = defaultdict(dict)
+        self.cells = 0
+        self.spills += 1
+
+
+def split_ranges(path: Path, parts: int) -> List[Tuple[int, int]]:
+    """Byte ranges covering the data rows; each worker starts at the first line beginning in its range."""
+    with path.open("rb") as fh:
+        header_end = len(fh.readline())
+    size = path.stat().st_size
+    step = max(1, math.ceil((size - header_end) / parts))
+    return [(start, min(start + step, size)) for start in range(header_end, size, step)]
+
+
+def read_chunks(path: Path, start: int, end: int, chunk_rows: int = CHUNK_ROWS) -> Iterator[List[List[str]]]:
+    """Parsed CSV rows for lines starting in ``[start, end)``, ``chunk_rows`` at a time."""
+    with path.open("rb") as fh:
+        fh.seek(start - 1)
+        position = start - 1 + len(fh.readline())  # finish the line straddling ``start``
+        lines: List[str] = []
+        for raw in fh:
+            if position >= end:
+                break
+            position += len(raw)
+            lines.append(raw.decode("utf-8"))
+            if len(lines) >= chunk_rows:
+                yield list(csv.reader(lines))
+                lines = []
+        if lines:
+            yield list(csv.reader(lines))
+
+
+def read_header(path: Path) -> List[str]:
+    with path.open(newline="", encoding="utf-8") as fh:
+        return next(csv.reader(fh))
+
+
+def bin_range(job: Tuple[Path, int, int, str, dict, dict]) -> dict:
+    """Worker: bin the rows in one byte range, spilling partials into the work directory."""
+    path, start, end, tag, options, columns = job
+    binner = make_binner(options["kind"], options["size"])
+    header = read_header(path)
+    try:
+        season_i, team_i, player_i, x_i, y_i, made_i = (header.index(columns[name]) for name in COLUMNS)
+    except ValueError as exc:
+        raise SystemExit(f"{path.name}: missing column ({exc})")
+    scale = options["scale"]
+    accumulator = BinAccumulator(Path(options["work_dir"]), tag, options["partitions"], options["max_cells"])
+    add = accumulator.add
+    rows = skipped = 0
+    for chunk in read_chunks(path, start, end, options["chunk_rows"]):
+        for row in chunk:
+            rows += 1
+            try:
+                bin_id = binner(float(row[x_i]) * scale, float(row[y_i]) * scale)
+            except (ValueError, IndexError):
+                bin_id = None
+            if bin_id is None:
+                skipped += 1
+                continue
+            season, made = row[season_i], row[made_i] in MADE_VALUES
+            add(f"season/{season}", bin_id, made)
+            add(f"team/{season}/{row[team_i]}", bin_id, made)
+            add(f"player/{season}/{row[player_i]}", bin_id, made)
+    accumulator.spill()
+    return {"rows": rows, "skipped": skipped, "spills": accumulator.spills}
+
+
+def tile_name(group: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_/-]", "_", group) + ".json"
+
+
+def merge_partition(job: Tuple[Path, int, Path]) -> Dict[str, int]:
+    """Worker: sum every spill of one partition and write its tiles; returns attempts per group."""
+    work_dir, partition, output = job
+    groups: Cells = defaultdict(dict)
+    for spill in sorted(work_dir.glob(f"*-{partition:03d}.tsv")):
+        with spill.open(encoding="utf-8") as fh:
+            for line in fh:
+                group, bin_id, fga, fgm = line.rstrip("\n").split("\t")
+                cell = groups[group].setdefault(int(bin_id), [0, 0])
+                cell[0] += int(fga)
+                cell[1] += int(fgm)
+    totals = {}
+    for group, bins in groups.items():
+        ordered = sorted(bins.items())
+        path = output / tile_name(group)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tile = {
+            "bin": [bin_id for bin_id, _ in ordered],
+            "fga": [fga for _, (fga, _) in ordered],
+            "fgm": [fgm for _, (_, fgm) in ordered],
+        }
+        path.write_text(json.dumps(tile, separators=(",", ":")))
+        totals[group] = sum(tile["fga"])
+    return totals
+
+
+def build_tiles(
+    source: Path,
+    output: Path = TILE_DIR,
+    kind: str = "hex",
+    size: float = 1.5,
+    scale: float = 1.0,
+    jobs: int = 1,
+    chunk_rows: int = CHUNK_ROWS,
+    max_cells: int = MAX_CELLS,
+    partitions: int = PARTITIONS,
+    columns: Optional[Dict[str, str]] = None,
+) -> dict:
+    """Bin ``source`` into per-season, per-team and per-player tiles under ``output``.
+
+    Workers bin byte ranges of the CSV independently; their partial counts
+    meet only in the spill files, which are then merged one partition per
+    task. The new tile set is built beside ``output`` and swapped in at the end.
+    """
+    if output.exists() and any(output.iterdir()) and not (output / "index.json").exists():
+        raise SystemExit(f"{output} exists and is not a tile directory; refusing to replace it")
+    work_dir = WORK_DIR / f"{source.stem}-{os.getpid()}"
+    staging = output.with_name(output.name + ".tmp")
+    shutil.rmtree(work_dir, ignore_errors=True)
+    shutil.rmtree(staging, ignore_errors=True)
+    work_dir.mkdir(parents=True)
+    staging.mkdir(parents=True)
+
+    options = {
+        "kind": kind,
+        "size": size,
+        "scale": scale,
+        "chunk_rows": chunk_rows,
+        "max_cells": max_cells,
+        "partitions": partitions,
+        "work_dir": str(work_dir),
+    }
+    columns = {**COLUMNS, **(columns or {})}
+    bin_jobs = [
+        (source, start, end, f"w{i:03d}", options, columns) for i, (start, end) in enumerate(split_ranges(source, jobs))
+    ]
+    merge_jobs = [(work_dir, partition, staging) for partition in range(partitions)]
+    try:
+        if jobs <= 1:
+            stats = [bin_range(job) for job in bin_jobs]
+            merged = [merge_partition(job) for job in merge_jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                stats = list(pool.map(bin_range, bin_jobs))
+                merged = list(pool.map(merge_partition, merge_jobs))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    tiles: Dict[str, Dict[str, dict]] = {level: {} for level in LEVELS}
+    for totals in merged:
+        for group, fga in totals.items():
+            level, key = group.split("/", 1)
+            tiles[level][key] = {"file": tile_name(group), "fga": fga}
+    index = {
+        "bins": make_binner(kind, size).spec(),
+        "rows": sum(stat["rows"] for stat in stats),
+        "skipped": sum(stat["skipped"] for stat in stats),
+        "spills": sum(stat["spills"] for stat in stats),
+        "tiles": {level: dict(sorted(entries.items())) for level, entries in tiles.items()},
+    }
+    (staging / "index.json").write_text(json.dumps(index, separators=(",", ":")))
+    shutil.rmtree(output, ignore_errors=True)
+    staging.rename(output)
+    return index
+
+
+def synthesize(path: Path, rows: int, seed: int = 7, seasons: Tuple[int, int] = (2016, 2025)) -> None:
+    """Write ``rows`` plausible shots (rim, mid-range, corner and above-the-break threes, heaves)."""
+    rng = random.Random(seed)
+    teams = [f"T{n:02d}" for n in range(1, 31)]
+    zones = [  # (weight, make probability)
+        (0.34, 0.63),  # at the rim
+        (0.16, 0.41),  # mid-range
+        (0.10, 0.39),  # corner three
+        (0.36, 0.36),  # above the break
+        (0.04, 0.12),  # long range / heaves, some past half court
+    ]
+    cumulative = []
+    total = 0.0
+    for weight, _ in zones:
+        total += weight
+        cumulative.append(total)
+
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow([COLUMNS[name] for name in COLUMNS])
+        for _ in range(rows):
+            season = rng.randint(*seasons)
+            team = rng.choice(teams)
+            player = f"synth{team[1:]}{rng.randint(1, 15):02d}"
+            pick = rng.random()
+            zone = next(i for i, edge in enumerate(cumulative) if pick <= edge)
+            if zone == 0:
+                radius, angle = abs(rng.gauss(0.0, 2.5)), rng.uniform(-0.2, math.pi + 0.2)
+            elif zone == 1:
+                radius, angle = rng.uniform(8.0, 22.0), rng.uniform(0.1, math.pi - 0.1)
+            elif zone == 2:
+                radius, angle = None, None
+            elif zone == 3:
+                radius, angle = rng.uniform(23.75, 27.0), rng.uniform(0.4, math.pi - 0.4)
+            else:
+                radius, angle = rng.uniform(27.0, 50.0), rng.uniform(0.3, math.pi - 0.3)
+            if radius is None:
+                x, y = rng.choice((-1, 1)) * rng.uniform(22.0, 23.5), rng.uniform(-4.5, 8.5)
+            else:
+                x, y = radius * math.cos(angle), radius * math.sin(angle)
+            made = int(rng.random() < zones[zone][1])
+            writer.writerow([season, team, player, f"{x:.1f}", f"{y:.1f}", made])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bin shot coordinates into court heatmap tiles.")
+    parser.add_argument("source", type=Path, help="shot CSV (season, team, player_id, loc_x, loc_y, shot_made_flag)")
+    parser.add_argument("--output", type=Path, default=TILE_DIR, help="tile directory (replaced on success)")
+    parser.add_argument("--bins", choices=("hex", "grid"), default="hex")
+    parser.add_argument("--size", type=float, default=1.5, help="hex radius or grid cell edge in feet")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply coordinates into feet (0.1 for tenths)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes (0 = one per CPU)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows parsed per chunk")
+    parser.add_argument("--max-cells", type=int, default=MAX_CELLS, help="bin cells a worker holds before spilling")
+    parser.add_argument("--partitions", type=int, default=PARTITIONS, help="spill partitions (merge tasks)")
+    parser.add_argument(
+        "--synthesize",
+        type=int,
+        metavar="ROWS",
+        help="first write ROWS synthetic shots to SOURCE (for testing the engine at scale)",
+    )
+    parser.add_argument("--seed", type=int, default=7, help="random seed for --synthesize")
+    args = parser.parse_args(argv)
+
+    if args.synthesize:
+        start = time.perf_counter()
+        synthesize(args.source, args.synthesize, seed=args.seed)
+        print(f"Wrote {args.synthesize} synthetic shots to {args.source} in {time.perf_counter() - start:.1f}s")
+    if not args.source.exists():
+        parser.error(f"{args.source} does not exist")
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    index = build_tiles(
+        args.source,
+        output=args.output,
+        kind=args.bins,
+        size=args.size,
+        scale=args.scale,
+        jobs=jobs,
+        chunk_rows=args.chunk_rows,
+        max_cells=args.max_cells,
+        partitions=args.partitions,
+    )
+    counts = ", ".join(f"{len(index['tiles'][level])} {level}" for level in LEVELS)
+    binned = index["rows"] - index["skipped"]
+    print(
+        f"Binned {binned} of {index['rows']} shots ({index['skipped']} off the half court) into {counts} tiles "
+        f"in {time.perf_counter() - start:.1f}s ({jobs} job(s), {index['spills']} spill(s)) -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+
+# Helvetica is used with its built-in StandardEncoding. ASCII maps to itself
+# (with ' and ` drawn as the curly single quotes); these are the other
+# characters the documents use and their StandardEncoding codes.
+STANDARD_ENCODING: Dict[str, int] = {
+    "‘": 0o140, "’": 0o047, "“": 0o252, "”": 0o272, "‚": 0o270, "„": 0o271,
+    "–": 0o261, "—": 0o320, "•": 0o267, "…": 0o274, "·": 0o264, "†": 0o262,
+    "‡": 0o263, "¶": 0o266, "§": 0o247, "¡": 0o241, "¿": 0o277, "«": 0o253,
+    "»": 0o273, "‰": 0o275, "¢": 0o242, "£": 0o243, "¥": 0o245, "Æ": 0o341,
+    "æ": 0o361, "Ø": 0o351, "ø": 0o371, "Œ": 0o352, "œ": 0o372, "ß": 0o373,
+    "Ł": 0o350, "ł": 0o370,
+}
+
+# Advance widths (1/1000 em) for Helvetica from the Adobe core-14 AFM, keyed by
+# StandardEncoding code, i.e. by the bytes ``encode_standard`` writes.
+HELVETICA_WIDTHS: Dict[int, int] = {
+    **{ord(ch): width for ch, width in zip(
+        " !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~",
+        [
+            278, 278, 355, 556, 556, 889, 667, 222, 333, 333, 389, 584, 278, 333, 278, 278,
+            556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+            1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+            667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+            222, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+            556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+        ],
+    )},
+    0o252: 333, 0o272: 333, 0o270: 222, 0o271: 333, 0o261: 556, 0o320: 1000,
+    0o267: 350, 0o274: 1000, 0o264: 278, 0o262: 556, 0o263: 556, 0o266: 537,
+    0o247: 556, 0o241: 333, 0o277: 611, 0o253: 556, 0o273: 556, 0o275: 1000,
+    0o242: 556, 0o243: 556, 0o245: 556, 0o341: 1000, 0o361: 889, 0o351: 778,
+    0o371: 611, 0o352: 1000, 0o372: 944, 0o373: 611, 0o350: 556, 0o370: 222,
+}
+DEFAULT_WIDTH = 556
+SPACE_WIDTH = HELVETICA_WIDTHS[ord(" ")]
+
+
+@lru_cache(maxsize=None)
+def _standard_char(ch: str) -> bytes:
+    if ch in STANDARD_ENCODING:
+        return bytes([STANDARD_ENCODING[ch]])
+    if ch.isascii():
+        return ch.encode("ascii")
+    # Accented letters fall back to their base letter (Jokić -> Jokic).
+    return unicodedata.normalize("NFKD", ch).encode("ascii", "ignore") or b"?"
+
+
+def encode_standard(text: str) -> bytes:
+    """``text`` as StandardEncoding bytes, the string a Helvetica ``Tj`` shows."""
+    if text.isascii():
+        return text.encode("ascii")
+    return b"".join(_standard_char(ch) for ch in text)
+
+
+@lru_cache(maxsize=65536)
+def word_units(word: str) -> int:
+    """Width of ``word`` in 1/1000 em; memoized across the whole document."""
+    widths = HELVETICA_WIDTHS
+    return sum(widths.get(code, DEFAULT_WIDTH) for code in encode_standard(word))
+
+
+def string_width(text: str, size: float) -> float:
+    """Rendered width of ``text`` in points at ``size``."""
+    words = text.split(" ")
+    units = sum(word_units(word) for word in words) + SPACE_WIDTH * (len(words) - 1)
+    return units * size / 1000.0
+
+
+@lru_cache(maxsize=4096)
+def _layout(text: str, max_width: float, size: float) -> Tuple[str, ...]:
+    limit = max_width * 1000.0 / size
+    lines: List[str] = []
+    current: List[str] = []
+    width = 0
+    for word in text.split():
+        units = word_units(word)
+        if current and width + SPACE_WIDTH + units > limit:
+            lines.append(" ".join(current))
+            current = [word]
+            width = units
+        else:
+            width += units + (SPACE_WIDTH if current else 0)
+            current.append(word)
+    if current:
+        lines.append(" ".join(current))
+    return tuple(lines)
+
+
+def layout_paragraph(text: str, max_width: float, size: float = 12) -> List[str]:
+    """Greedy single-pass line breaking against Helvetica metrics.
+
+    A word wider than ``max_width`` gets a line of its own. Results are cached
+    per (text, width, size) so repeated boilerplate is laid out once.
+    """
+    return list(_layout(text, float(max_width), float(size)))
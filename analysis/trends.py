@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import argparse
+import math
+import statistics
+from collections import deque
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from series import SeasonSeries
+
+
+# Changepoint penalty in units of sigma^2 * log(n), sigma being the noise level
+# estimated from the series' own second differences. Lower finds more breaks.
+PENALTY = 8.0
+MIN_SEGMENT = 3
+
+
+class RollingMean:
+    """Trailing mean over the last ``window`` values, updated in O(1) per push."""
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.values: Deque[float] = deque()
+        self.total = 0.0
+
+    def push(self, value: float) -> float:
+        self.values.append(value)
+        self.total += value
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        return self.total / len(self.values)
+
+
+def rolling_stats(series: SeasonSeries, field: str, window: int = 3) -> SeasonSeries:
+    """Add ``<field>_rolling``, ``<field>_delta`` and ``<field>_accel`` columns in one pass.
+
+    The delta is the change per season since the previous season with a value
+    (so a gap in the data is spread over the seasons it spans) and the
+    acceleration is the change in that delta. Seasons without a value get None.
+    """
+    rolling = RollingMean(window)
+    means: List[Optional[float]] = []
+    deltas: List[Optional[float]] = []
+    accels: List[Optional[float]] = []
+    previous: Optional[Tuple[int, float]] = None
+    previous_delta: Optional[float] = None
+    for season, value in zip(series.seasons, series.column(field)):
+        if value is None:
+            means.append(None)
+            deltas.append(None)
+            accels.append(None)
+            continue
+        means.append(rolling.push(value))
+        delta = None if previous is None else (value - previous[1]) / (season - previous[0])
+        deltas.append(delta)
+        accels.append(None if delta is None or previous_delta is None else delta - previous_delta)
+        previous, previous_delta = (season, value), delta
+    return (
+        series.with_column(f"{field}_rolling", means)
+        .with_column(f"{field}_delta", deltas)
+        .with_column(f"{field}_accel", accels)
+    )
+
+
+class Breakpoint:
+    """Start of a new linear regime: fitted slopes either side and the step at ``season``."""
+
+    __slots__ = ("season", "slope_before", "slope_after", "step")
+
+    def __init__(self, season: int, slope_before: float, slope_after: float, step: float) -> None:
+        self.season = season
+        self.slope_before = slope_before
+        self.slope_after = slope_after
+        self.step = step
+
+    @property
+    def label(self) -> str:
+        """Short chart annotation: the season and the dominant change."""
+        if abs(self.step) > 2 * max(abs(self.slope_before), abs(self.slope_after)):
+            return f"{self.season}: step {self.step:+.1f}"
+        return f"{self.season}: {self.slope_after:+.1f}/season"
+
+    def describe(self) -> str:
+        return (
+            f"{self.season}: trend {self.slope_before:+.2f} -> {self.slope_after:+.2f} per season, "
+            f"step {self.step:+.2f}"
+        )
+
+    def __repr__(self) -> str:
+        return f"Breakpoint({self.describe()})"
+
+
+class _LinearCost:
+    """Least-squares line residual for any slice of the series in O(1), from prefix sums."""
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float]) -> None:
+        self.sums = [(0.0, 0.0, 0.0, 0.0, 0.0)]
+        sx = sy = sxx = sxy = syy = 0.0
+        for x, y in zip(xs, ys):
+            sx, sy, sxx, sxy, syy = sx + x, sy + y, sxx + x * x, sxy + x * y, syy + y * y
+            self.sums.append((sx, sy, sxx, sxy, syy))
+
+    def fit(self, start: int, end: int) -> Tuple[float, float, float]:
+        """(slope, intercept, residual sum of squares) of rows ``start:end``."""
+        n = end - start
+        sx, sy, sxx, sxy, syy = (b - a for a, b in zip(self.sums[start], self.sums[end]))
+        var_x = sxx - sx * sx / n
+        cov = sxy - sx * sy / n
+        var_y = syy - sy * sy / n
+        slope = cov / var_x if var_x > 0 else 0.0
+        return slope, (sy - slope * sx) / n, max(var_y - slope * cov, 0.0)
+
+    def __call__(self, start: int, end: int) -> float:
+        n = end - start
+        sx0, sy0, sxx0, sxy0, syy0 = self.sums[start]
+        sx, sy, sxx, sxy, syy = self.sums[end]
+        sx, sy = sx - sx0, sy - sy0
+        var_x = sxx - sxx0 - sx * sx / n
+        cov = sxy - sxy0 - sx * sy / n
+        residual = syy - syy0 - sy * sy / n - (cov * cov / var_x if var_x > 0 else 0.0)
+        return residual if residual > 0.0 else 0.0
+
+
+def noise_level(values: Sequence[float]) -> float:
+    """Robust noise estimate: the MAD of second differences, scaled to a standard deviation."""
+    accels = [values[i + 1] - 2 * values[i] + values[i - 1] for i in range(1, len(values) - 1)]
+    if not accels:
+        return 0.0
+    return statistics.median(abs(value) for value in accels) / 0.6745 / math.sqrt(6)
+
+
+def changepoints(
+    seasons: Sequence[int],
+    values: Sequence[float],
+    penalty: float = PENALTY,
+    min_segment: int = MIN_SEGMENT,
+) -> List[Breakpoint]:
+    """Breaks in a season series modelled as straight-line segments (PELT).
+
+    Minimises total residual plus ``penalty * sigma^2 * log(n)`` per break,
+    exactly, with segments of at least ``min_segment`` seasons. Segment costs
+    come from prefix sums, and PELT prunes candidates that can no longer win,
+    so a run is close to linear in the series length.
+    """
+    n = len(values)
+    if n < 2 * min_segment:
+        return []
+    origin = seasons[0]
+    xs = [season - origin for season in seasons]
+    cost = _LinearCost(xs, values)
+    sigma = noise_level(values) or (statistics.pstdev(values) / 10 or 1.0)
+    beta = penalty * sigma * sigma * math.log(n)
+
+    best = [math.inf] * (n + 1)
+    best[0] = -beta
+    previous = [0] * (n + 1)
+    candidates = [0]
+    for end in range(min_segment, n + 1):
+        usable = [start for start in candidates if end - start >= min_segment]
+        totals = [best[start] + cost(start, end) for start in usable]
+        best[end], previous[end] = min(zip((total + beta for total in totals), usable))
+        # PELT pruning: a start that already loses without paying the penalty never wins later.
+        pruned = {start for start, total in zip(usable, totals) if total > best[end]}
+        candidates = [start for start in candidates if start not in pruned]
+        candidates.append(end)
+
+    bounds = [n]
+    while bounds[-1] > 0:
+        bounds.append(previous[bounds[-1]])
+    bounds.reverse()
+
+    fits = [cost.fit(start, end) for start, end in zip(bounds, bounds[1:])]
+    breaks = []
+    for index, start in enumerate(bounds[1:-1]):
+        (slope_a, intercept_a, _), (slope_b, intercept_b, _) = fits[index], fits[index + 1]
+        x = xs[start]
+        breaks.append(Breakpoint(seasons[start], slope_a, slope_b, (intercept_b + slope_b * x) - (intercept_a + slope_a * x)))
+    return breaks
+
+
+def series_changepoints(series: SeasonSeries, field: str, **options) -> List[Breakpoint]:
+    """``changepoints`` over the seasons where ``field`` has a value."""
+    pairs = series.pairs(field)
+    return changepoints([season for season, _ in pairs], [value for _, value in pairs], **options)
+
+
+def load_series(source: str, column: str, team: Optional[str], player: Optional[str]) -> SeasonSeries:
+    """Per-season mean of ``column`` in ``source``, optionally for one team or one player.
+
+    A traded player's seasons use the combined row, as in the pipeline outputs.
+    """
+    from aggregate import Agg, group_by
+    from ingest import load_table
+    from pipeline import preferred_rows
+
+    table = load_table(source)
+    for key, value in (("team", team), ("player_id", player)):
+        if value is not None and key not in table:
+            raise SystemExit(f"{source} has no {key} column")
+    rows = preferred_rows(table) if player else range(len(table))
+    if team is not None:
+        teams = table["abbreviation"] if "abbreviation" in table else table["team"]
+        rows = [row for row in rows if team in (teams[row], table["team"][row])]
+    if player is not None:
+        rows = [row for row in rows if table["player_id"][row] == player]
+    grouped = group_by(table, "season", {column: Agg(column)}, rows=rows)
+    return SeasonSeries.from_records(grouped.records())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rolling statistics and changepoints for a season series.")
+    parser.add_argument("column", nargs="?", default="x3pa_per_game", help="numeric column to follow")
+    parser.add_argument("--source", default="Team Stats Per Game.csv", help="CSV to read (league mean by default)")
+    parser.add_argument("--team", help="one team's rows only, by abbreviation or name (e.g. GSW)")
+    parser.add_argument("--player", help="one player_id's rows only (e.g. curryst01)")
+    parser.add_argument("--window", type=int, default=3, help="rolling-mean window in seasons")
+    parser.add_argument("--penalty", type=float, default=PENALTY, help="higher finds fewer breaks")
+    parser.add_argument("--min-segment", type=int, default=MIN_SEGMENT, help="shortest regime in seasons")
+    args = parser.parse_args(argv)
+
+    from ingest import load_table
+
+    try:
+        table = load_table(args.source)
+    except FileNotFoundError:
+        parser.error(f"no such CSV: {args.source}")
+    if args.column not in table:
+        parser.error(f"{args.source} has no column {args.column!r}")
+    if table[args.column].kind == "str":
+        parser.error(f"column {args.column!r} is not numeric")
+
+    series = load_series(args.source, args.column, args.team, args.player)
+    if not series.pairs(args.column):
+        raise SystemExit("no values for that selection")
+    breaks = series_changepoints(series, args.column, penalty=args.penalty, min_segment=args.min_segment)
+    starts = {point.season for point in breaks}
+    stats = rolling_stats(series, args.column, args.window)
+
+    def cell(value: Optional[float]) -> str:
+        return f"{value:9.2f}" if value is not None else f"{'':9}"
+
+    print(f"{'season':>6} {'value':>9} {'rolling':>9} {'delta':>9} {'accel':>9}")
+    for season in stats.seasons:
+        row = [stats.get(season, args.column + suffix) for suffix in ("", "_rolling", "_delta", "_accel")]
+        if row[0] is not None:
+            marker = "  <- break" if season in starts else ""
+            print(f"{season:>6} " + " ".join(cell(value) for value in row) + marker)
+    print()
+    for point in breaks:
+        print(point.describe())
+
+
+if __name__ == "__main__":
+    main()
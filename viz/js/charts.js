@@ -40,6 +40,80 @@ async function loadJSON(name) {
   return response.json();
 }
 
+// Mirrors pipeline.fold_name: player_search.json postings are keyed on these folds.
+const NAME_FOLDS = { ß: "ss", ð: "d", đ: "d", ı: "i", ł: "l", ø: "o", æ: "ae", œ: "oe" };
+
+function foldName(name) {
+  return name
+    .normalize("NFKD")
+    .replace(/\p{M}/gu, "")
+    .toLowerCase()
+    .replace(/[ßðđıłøæœ]/g, (ch) => NAME_FOLDS[ch])
+    .replace(/['.]/g, "")
+    .replace(/[^a-z0-9]+/g, " ")
+    .trim();
+}
+
+// Autocomplete over player_search.json: players are ranked most recent first
+// and each posting list holds the rank gaps of players with a name token
+// starting with that prefix. Lists are decoded on first use.
+function createPlayerSearch(index) {
+  const decoded = new Map();
+  const nameTokens = new Array(index.player.length);
+  const prefixes = Object.keys(index.postings);
+
+  function postings(prefix) {
+    if (!decoded.has(prefix)) {
+      const gaps = index.postings[prefix] || [];
+      const ranks = new Int32Array(gaps.length);
+      let rank = 0;
+      gaps.forEach((gap, i) => {
+        rank += gap;
+        ranks[i] = rank;
+      });
+      decoded.set(prefix, ranks);
+    }
+    return decoded.get(prefix);
+  }
+
+  function tokensOf(rank) {
+    if (nameTokens[rank] === undefined) {
+      nameTokens[rank] = foldName(index.player[rank]).split(" ");
+    }
+    return nameTokens[rank];
+  }
+
+  function candidates(token) {
+    if (token.length >= index.prefix) return postings(token.slice(0, index.prefix));
+    const merged = new Set();
+    prefixes
+      .filter((prefix) => prefix.startsWith(token))
+      .forEach((prefix) => postings(prefix).forEach((rank) => merged.add(rank)));
+    return Array.from(merged).sort((a, b) => a - b);
+  }
+
+  return function search(query, limit = 8, accept = () => true) {
+    const tokens = foldName(query).split(" ").filter(Boolean);
+    if (!tokens.length) return [];
+    const anchor = tokens.reduce((a, b) => (b.length > a.length ? b : a));
+    const results = [];
+    for (const rank of candidates(anchor)) {
+      const names = tokensOf(rank);
+      if (!tokens.every((token) => names.some((name) => name.startsWith(token)))) continue;
+      const entry = {
+        playerId: index.player_id[rank],
+        player: index.player[rank],
+        from: index.from[rank],
+        to: index.to[rank],
+      };
+      if (!accept(entry)) continue;
+      results.push(entry);
+      if (results.length >= limit) break;
+    }
+    return results;
+  };
+}
+
 function createTooltip(container) {
   const tip = container.append("div").attr("class", "tooltip");
   return {
@@ -181,7 +255,17 @@ async function renderLeagueTrend() {
 }
 
 async function renderVolumeEfficiency() {
-  const raw = await loadJSON("volume_vs_efficiency.json");
+  const encoded = await loadJSON("volume_vs_efficiency.json");
+  const raw = {};
+  Object.entries(encoded.snapshots).forEach(([season, panel]) => {
+    raw[season] = panel.team.map((code, i) => ({
+      team: encoded.teams.name[code],
+      season: +season,
+      x3pa_per_game: panel.x3pa_per_game[i],
+      x3p_percent: panel.x3p_percent[i],
+      pts_per_game: panel.pts_per_game[i],
+    }));
+  });
   const seasons = ["2000", "2010", "2020", "2025"].filter((year) => raw[year]);
   const container = d3.select('[data-chart="volumeEfficiency"]');
   container.selectAll("*").remove();
@@ -260,9 +344,12 @@ async function renderVolumeEfficiency() {
 }
 
 async function renderCurryComparison() {
-  const [summary, perGameRows] = await Promise.all([
+  // player_3pa_seasons.json needs Player Per Game.csv, which is not always
+  // present; without it the chart keeps the league average and says so.
+  const [summary, seasonTable, searchIndex] = await Promise.all([
     loadJSON("curry_vs_league.json"),
-    d3.csv("../Player%20Per%20Game.csv", d3.autoType),
+    loadJSON("player_3pa_seasons.json").catch(() => null),
+    loadJSON("player_search.json"),
   ]);
 
   const leagueSeries = summary.league_avg_player_3pa_per_game
@@ -272,57 +359,37 @@ async function renderCurryComparison() {
       attempts: +d.avg_player_3pa_per_game,
     }));
 
-  const playerSeasonGroup = d3.group(
-    perGameRows.filter((row) => row.season >= 2010 && row.x3pa_per_game != null),
-    (row) => row.player,
-    (row) => row.season
-  );
-
+  // player_3pa_seasons.json is columnar and already has one row per
+  // player-season (TOT preferred); player k owns rows offsets[k]..offsets[k+1].
+  // Series are keyed by player_id; names repeat, so shared names get their
+  // season span as a label.
   const playerSeries = new Map();
-  const playerCatalog = [];
+  const playerLabels = new Map();
+  const { offsets = [], player: players = [], player_id: playerIds = [] } = seasonTable ?? {};
+  const nameCounts = d3.rollup(players, (group) => group.length, (name) => name);
 
-  playerSeasonGroup.forEach((seasonMap, player) => {
+  players.forEach((player, k) => {
     const records = [];
-    seasonMap.forEach((entries, season) => {
-      const preferred =
-        entries.find((entry) => entry.team === "TOT") ?? entries[0];
-      if (
-        preferred == null ||
-        preferred.x3pa_per_game == null ||
-        preferred.x3p_percent == null
-      ) {
-        return;
-      }
+    for (let i = offsets[k]; i < offsets[k + 1]; i += 1) {
+      if (seasonTable.season[i] < 2010) continue;
       records.push({
-        season: +season,
-        attempts: +preferred.x3pa_per_game,
-        pct: +preferred.x3p_percent,
-      });
-    });
-
-    records.sort((a, b) => a.season - b.season);
-    if (records.length) {
-      playerSeries.set(player, records);
-      playerCatalog.push({
-        player,
-        averageAttempts: d3.mean(records, (d) => d.attempts) ?? 0,
+        season: seasonTable.season[i],
+        attempts: seasonTable.x3pa_per_game[i],
+        pct: seasonTable.x3p_percent[i],
       });
     }
+    if (!records.length) return;
+    const span = `${seasonTable.season[offsets[k]]}–${seasonTable.season[offsets[k + 1] - 1]}`;
+    playerSeries.set(playerIds[k], records);
+    playerLabels.set(playerIds[k], nameCounts.get(player) > 1 ? `${player} (${span})` : player);
   });
 
-  const currySeries = playerSeries.get("Stephen Curry") ?? [];
-
-  const playersSorted = playerCatalog
-    .filter((d) => d.player !== "Stephen Curry")
-    .sort((a, b) => d3.descending(a.averageAttempts, b.averageAttempts));
+  const curryId = "curryst01";
+  const currySeries = playerSeries.get(curryId) ?? [];
+  const searchPlayers = createPlayerSearch(searchIndex);
 
   const controls = d3.select('[data-controls="curryComparison"]');
-  const datalist = controls.select("datalist#player-options");
-  datalist
-    .selectAll("option")
-    .data(playersSorted, (d) => d.player)
-    .join("option")
-    .attr("value", (d) => d.player);
+  const suggestionList = controls.select("[data-suggestions]");
 
   const state = {
     extraPlayers: [],
@@ -366,6 +433,18 @@ async function renderCurryComparison() {
   const linesGroup = g.append("g").attr("class", "player-lines");
   const dotsGroup = g.append("g").attr("class", "player-dots");
 
+  if (!seasonTable) {
+    g.append("text")
+      .attr("class", "empty-state")
+      .attr("x", innerWidth / 2)
+      .attr("y", innerHeight / 2)
+      .attr("text-anchor", "middle")
+      .attr("fill", "#64748b")
+      .text("Player seasons unavailable: player_3pa_seasons.json has not been built.");
+    input.property("disabled", true);
+    addButton.property("disabled", true);
+  }
+
   const legendGroup = svg
     .append("g")
     .attr("class", "legend")
@@ -389,23 +468,26 @@ async function renderCurryComparison() {
   function updateChart() {
     const activeSeries = [
       {
+        id: "league",
         name: "League avg player 3PA",
         type: "league",
         color: leagueFill,
         values: leagueSeries,
       },
       {
+        id: curryId,
         name: "Stephen Curry",
         type: "player",
         color: curryColor,
         values: currySeries,
       },
       ...state.extraPlayers
-        .map((player) => ({
-          name: player,
+        .map((id) => ({
+          id,
+          name: playerLabels.get(id),
           type: "player",
-          color: palette(player),
-          values: playerSeries.get(player) ?? [],
+          color: palette(id),
+          values: playerSeries.get(id) ?? [],
         }))
         .filter((series) => series.values.length),
     ];
@@ -433,7 +515,7 @@ async function renderCurryComparison() {
       .selectAll("path.player-line")
       .data(
         activeSeries.filter((s) => s.type === "player"),
-        (d) => d.name
+        (d) => d.id
       );
 
     playerLines
@@ -454,7 +536,7 @@ async function renderCurryComparison() {
       .selectAll("g.player-dots")
       .data(
         activeSeries.filter((s) => s.type === "player"),
-        (d) => d.name
+        (d) => d.id
       );
 
     const dotsEnter = playerDots.enter().append("g").attr("class", "player-dots");
@@ -489,7 +571,7 @@ async function renderCurryComparison() {
 
     const legendItems = legendGroup
       .selectAll("g.legend-item")
-      .data(activeSeries, (d) => d.name);
+      .data(activeSeries, (d) => d.id);
 
     const legendEnter = legendItems
       .enter()
@@ -548,8 +630,8 @@ async function renderCurryComparison() {
       .attr("type", "button")
       .attr("aria-label", "Remove player")
       .text("✕")
-      .on("click", (_, player) => {
-        state.extraPlayers = state.extraPlayers.filter((p) => p !== player);
+      .on("click", (_, removed) => {
+        state.extraPlayers = state.extraPlayers.filter((id) => id !== removed);
         renderChips();
         updateChart();
       });
@@ -557,37 +639,73 @@ async function renderCurryComparison() {
     chips
       .merge(chipsEnter)
       .select(".chip-label")
-      .text((d) => d);
+      .text((d) => playerLabels.get(d));
 
     chips.exit().remove();
     chipContainer.classed("empty", state.extraPlayers.length === 0);
   }
 
-  function addPlayer(name) {
-    const trimmed = name.trim();
+  function addPlayer(id) {
     if (
-      !trimmed ||
-      trimmed === "Stephen Curry" ||
-      !playerSeries.has(trimmed) ||
-      state.extraPlayers.includes(trimmed)
+      !id ||
+      id === curryId ||
+      !playerSeries.has(id) ||
+      state.extraPlayers.includes(id)
     ) {
       return;
     }
-    state.extraPlayers.push(trimmed);
+    state.extraPlayers.push(id);
     renderChips();
     updateChart();
   }
 
-  addButton.on("click", () => {
-    addPlayer(input.property("value"));
+  function suggestions(query) {
+    return searchPlayers(
+      query,
+      8,
+      (d) =>
+        d.playerId !== curryId &&
+        playerSeries.has(d.playerId) &&
+        !state.extraPlayers.includes(d.playerId)
+    );
+  }
+
+  function renderSuggestions() {
+    const matches = suggestions(input.property("value"));
+    suggestionList
+      .selectAll("button")
+      .data(matches, (d) => d.playerId)
+      .join("button")
+      .attr("type", "button")
+      .attr("class", "suggestion")
+      .text((d) => `${d.player} (${d.from}–${d.to})`)
+      .on("click", (event, d) => {
+        addPlayer(d.playerId);
+        input.property("value", "");
+        renderSuggestions();
+      });
+    suggestionList.classed("empty", matches.length === 0);
+  }
+
+  // The top suggestion wins, so "jokic" + Enter adds Nikola Jokić; suggestions
+  // are ranked most recent first, and the list shows each player's seasons.
+  function submit(query) {
+    const id = suggestions(query)[0]?.playerId;
+    if (id) addPlayer(id);
     input.property("value", "");
+    renderSuggestions();
+  }
+
+  addButton.on("click", () => {
+    submit(input.property("value"));
   });
 
+  input.on("input", renderSuggestions);
+
   input.on("keydown", (event) => {
     if (event.key === "Enter") {
       event.preventDefault();
-      addPlayer(input.property("value"));
-      input.property("value", "");
+      submit(input.property("value"));
     }
   });
 
@@ -602,9 +720,9 @@ async function renderCurryComparison() {
 }
 
 async function renderPositionShare() {
-  const [positionData, playerShare] = await Promise.all([
+  const [positionData, playerIndex] = await Promise.all([
     loadJSON("position_3pa_shares.json"),
-    loadJSON("player_league_share.json"),
+    loadJSON("player_share/index.json"),
   ]);
 
   const data = positionData
@@ -627,51 +745,66 @@ async function renderPositionShare() {
     C: "#8c564b",
   };
 
+  // Per-season shares live in hashed bucket files (player_share/NN.json) and
+  // are fetched only when a player is added; the index is enough for the picker.
+  // Everything is keyed by player_id: names repeat (two Eddie Johnsons).
   const playerSeries = new Map();
   const playerMeta = new Map();
+  const bucketRequests = new Map();
   const availablePlayers = [];
   const featuredPlayers = [
-    "Stephen Curry",
-    "Damian Lillard",
-    "James Harden",
-    "Klay Thompson",
-    "Paul George",
-    "LeBron James",
-    "Kevin Durant",
-    "Giannis Antetokounmpo",
-    "Dirk Nowitzki",
-    "Karl-Anthony Towns",
-    "Nikola Jokic",
-    "Joel Embiid",
-    "Kristaps Porzingis",
+    "curryst01",
+    "lillada01",
+    "hardeja01",
+    "thompkl01",
+    "georgpa01",
+    "jamesle01",
+    "duranke01",
+    "antetgi01",
+    "nowitdi01",
+    "townska01",
+    "jokicni01",
+    "embiijo01",
+    "porzikr01",
   ];
 
-  playerShare.forEach((record) => {
-    const values = (record.seasons || [])
-      .filter((entry) => entry.season >= 1997)
-      .map((entry) => ({
-        season: +entry.season,
-        share: +entry.share,
-      }))
-      .sort((a, b) => a.season - b.season);
-    if (!values.length) return;
-    const position = record.position || "UNK";
-    const avgShare = +record.avg_share || 0;
-    playerSeries.set(record.player, values);
-    playerMeta.set(record.player, {
-      player: record.player,
-      position,
-      avgShare,
-    });
-    availablePlayers.push({
-      player: record.player,
-      position,
-      avgShare,
-    });
+  playerIndex.player_id.forEach((id, i) => {
+    if (playerIndex.last_season[i] < 1997) return;
+    const meta = {
+      id,
+      player: playerIndex.player[i],
+      position: playerIndex.positions[playerIndex.position[i]] || "UNK",
+      avgShare: +playerIndex.avg_share[i] || 0,
+      bucket: playerIndex.bucket[i],
+    };
+    playerMeta.set(id, meta);
+    availablePlayers.push(meta);
   });
 
+  function loadBucket(bucket) {
+    if (!bucketRequests.has(bucket)) {
+      const file = `player_share/${String(bucket).padStart(2, "0")}.json`;
+      bucketRequests.set(bucket, loadJSON(file));
+    }
+    return bucketRequests.get(bucket);
+  }
+
+  async function loadPlayerSeries(id) {
+    if (!playerSeries.has(id)) {
+      const shard = await loadBucket(playerMeta.get(id).bucket);
+      const record = shard[id] || { season: [], share: [] };
+      playerSeries.set(
+        id,
+        record.season
+          .map((season, i) => ({ season: +season, share: +record.share[i] }))
+          .filter((entry) => entry.season >= 1997)
+      );
+    }
+    return playerSeries.get(id);
+  }
+
   const featuredSet = new Set(
-    featuredPlayers.filter((name) => playerSeries.has(name))
+    featuredPlayers.filter((id) => playerMeta.has(id))
   );
 
   const positionOrder = ["PG", "SG", "SF", "PF", "C", "UNK"];
@@ -779,19 +912,19 @@ async function renderPositionShare() {
   if (featuredSet.size) {
     const group = select.append("optgroup").attr("label", "Featured Players");
     featuredPlayers
-      .filter((name) => featuredSet.has(name))
-      .forEach((name) => {
-        const meta = playerMeta.get(name);
+      .filter((id) => featuredSet.has(id))
+      .forEach((id) => {
+        const meta = playerMeta.get(id);
         if (!meta) return;
         group
           .append("option")
-          .attr("value", name)
-          .text(`${name} (${meta.position || "NA"})`);
+          .attr("value", id)
+          .text(`${meta.player} (${meta.position || "NA"})`);
       });
   }
 
   const groupedByPosition = d3.group(
-    availablePlayers.filter((d) => !featuredSet.has(d.player)),
+    availablePlayers.filter((d) => !featuredSet.has(d.id)),
     (d) => d.position || "UNK"
   );
 
@@ -807,7 +940,7 @@ async function renderPositionShare() {
       .forEach((entry) => {
         group
           .append("option")
-          .attr("value", entry.player)
+          .attr("value", entry.id)
           .text(`${entry.player} (${pos})`);
       });
   });
@@ -818,19 +951,19 @@ async function renderPositionShare() {
     colorMap: new Map(),
   };
 
-  function getColor(player) {
-    if (!state.colorMap.has(player)) {
-      state.colorMap.set(player, colorScale(player));
+  function getColor(id) {
+    if (!state.colorMap.has(id)) {
+      state.colorMap.set(id, colorScale(id));
     }
-    return state.colorMap.get(player);
+    return state.colorMap.get(id);
   }
 
   function updatePlayers() {
     const active = state.players
-      .map((player) => ({
-        player,
-        color: getColor(player),
-        values: playerSeries.get(player) || [],
+      .map((id) => ({
+        id,
+        color: getColor(id),
+        values: playerSeries.get(id) || [],
       }))
       .filter((entry) => entry.values.length);
 
@@ -843,7 +976,7 @@ async function renderPositionShare() {
 
     const lines = playerLinesGroup
       .selectAll("path.player-overlay")
-      .data(active, (d) => d.player);
+      .data(active, (d) => d.id);
 
     lines
       .enter()
@@ -861,7 +994,7 @@ async function renderPositionShare() {
 
     const dots = playerDotsGroup
       .selectAll("g.player-overlay-dots")
-      .data(active, (d) => d.player);
+      .data(active, (d) => d.id);
 
     const dotsEnter = dots.enter().append("g").attr("class", "player-overlay-dots");
 
@@ -911,8 +1044,8 @@ async function renderPositionShare() {
       .attr("type", "button")
       .attr("aria-label", "Remove player")
       .text("✕")
-      .on("click", (_, player) => {
-        state.players = state.players.filter((name) => name !== player);
+      .on("click", (_, removed) => {
+        state.players = state.players.filter((id) => id !== removed);
         renderChips();
         updatePlayers();
       });
@@ -922,22 +1055,24 @@ async function renderPositionShare() {
       .style("background", (d) => getColor(d))
       .style("color", "#f8fafc")
       .select(".chip-label")
-      .text((d) => d);
+      .text((d) => playerMeta.get(d).player);
 
     chips.exit().remove();
   }
 
-  function addPlayer(name) {
-    const player = name && name.trim();
+  async function addPlayer(value) {
+    const id = value && value.trim();
     if (
-      !player ||
-      !playerSeries.has(player) ||
-      state.players.includes(player) ||
+      !id ||
+      !playerMeta.has(id) ||
+      state.players.includes(id) ||
       state.players.length >= 5
     ) {
       return;
     }
-    state.players.push(player);
+    await loadPlayerSeries(id);
+    if (state.players.includes(id) || state.players.length >= 5) return;
+    state.players.push(id);
     renderChips();
     updatePlayers();
   }